@@ -1,7 +1,13 @@
 """財務データ可視化アプリケーション"""
+from datetime import datetime
+import plotly.graph_objects as go
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from data.columnar_store import get_default_store
 from data.data_fetcher import DataFetcher
 from data.data_processor import DataProcessor
+from data.result_cache import get_result_cache
+from data.statement_cache import StatementCache
 from plots.plot_manager import PlotManager
 from utils.constants import (
     PERIOD_QUARTERLY, PERIOD_ANNUAL,
@@ -9,6 +15,158 @@ from utils.constants import (
     ERROR_DATA_FETCH
 )
 from utils.formatting import format_financial_value
+from utils.telemetry import configure_logging, get_registry, get_session_tracker, start_metrics_server
+from utils.tracing import STATUS_ERROR, Trace, trace
+
+# グラフのセクション定義（セクション名, 行ごとのグラフ作成メソッド名）
+CHART_SECTIONS = [
+    ("業績確認グラフ", [["create_performance_chart"]]),
+    ("1株当たりの価値グラフ", [["create_per_share_chart", "create_dividend_chart"]]),
+    ("稼ぐ力グラフ", [
+        ["create_earning_power_profit_chart", "create_earning_power_per_share_chart"],
+        ["create_earning_power_margin_chart", "create_roic_chart"],
+    ]),
+]
+SECTION_ALL = "すべて"
+
+# ページ描画の監視用メトリクス
+RENDER_SECONDS = get_registry().histogram("render_seconds", "ページ描画時間", ("section",))
+
+
+def load_financial_data(ticker: str, period: str):
+    """
+    財務データを読み込む
+    事前計算ストアを優先し、ストアにない銘柄のみyfinanceから取得して処理する
+    Args:
+        ticker (str): 銘柄コード
+        period (str): "quarterly"（四半期）または"annual"（年次）
+    Returns:
+        Optional[FinancialDataModel]: 財務データ（取得できない場合はNone）
+    """
+    store = get_default_store()
+    financial_data = store.load(ticker, period)
+    if financial_data is not None:
+        created_at = datetime.fromtimestamp(store.created_at).strftime("%Y/%m/%d %H:%M")
+        st.sidebar.caption(f"事前計算データ（{created_at}時点）を表示しています")
+        return financial_data
+
+    # データ取得と処理（処理済みの結果があれば再利用）
+    # 四半期・年次をまとめて処理するため、期間の切り替えでは再取得しない
+    # 有効期限切れの結果があれば前回の処理結果として渡し、元データが変わった期のみ再計算する
+    data_fetcher = DataFetcher(ticker, cache=StatementCache())
+    data_processor = DataProcessor(data_fetcher)
+    # 処理結果は元データ（財務諸表キャッシュ）の有効期限まで再利用し、元データが変わっていれば作り直す
+    financial_data = get_result_cache().get_or_process_all(
+        ticker, period, data_processor.process_all_periods,
+        expires_at=lambda: data_fetcher.statements_expire_at,
+        changed=lambda: data_fetcher.statements_changed
+    )
+
+    # このページ描画で発生した上流（yfinance）呼び出し回数
+    st.sidebar.caption(f"yfinance呼び出し回数: {data_fetcher.upstream_call_count}")
+    return financial_data
+
+
+def render_charts(financial_data, section: str):
+    """
+    選択されたセクションのグラフを描画
+    選択されていないセクションのグラフは作成・送信しない
+    作成済みのグラフはPlotManagerのキャッシュから再利用する
+    Args:
+        financial_data (FinancialDataModel): 財務データ
+        section (str): 表示するセクション名（SECTION_ALLの場合はすべて）
+    """
+    for title, rows in CHART_SECTIONS:
+        if section not in (SECTION_ALL, title):
+            continue
+        st.subheader(title)
+        for charts in rows:
+            cols = st.columns(len(charts)) if len(charts) > 1 else [st.container()]
+            for col, chart in zip(cols, charts):
+                with col:
+                    st.plotly_chart(
+                        PlotManager.get_figure(financial_data, chart),
+                        use_container_width=True
+                    )
+
+
+def render_page(ticker: str, period: str, section: str):
+    """
+    財務データを読み込み、グラフと最新の財務指標を描画
+    Args:
+        ticker (str): 銘柄コード
+        period (str): "quarterly"（四半期）または"annual"（年次）
+        section (str): 表示するセクション名
+    """
+    try:
+        # ローディング表示
+        with st.spinner(f"'{ticker}'の財務データを取得中..."):
+            financial_data = load_financial_data(ticker, period)
+
+        if financial_data is None:
+            st.error(ERROR_DATA_FETCH)
+            return
+
+        # 選択されたセクションのグラフのみ作成
+        render_charts(financial_data, section)
+
+        # 最新の財務指標
+        st.subheader("最新の財務指標")
+        latest_metrics = {
+            "売上高": financial_data.revenue[-1],
+            "営業利益": financial_data.operating_income[-1],
+            "純利益": financial_data.net_income[-1],
+            "EPS": financial_data.eps[-1],
+            "BPS": financial_data.bps[-1],
+        }
+
+        cols = st.columns(len(latest_metrics))
+        for col, (metric, value) in zip(cols, latest_metrics.items()):
+            col.metric(metric, format_financial_value(value))
+
+    except Exception as e:
+        st.error(f"エラーが発生しました: {str(e)}")
+
+
+def render_trace_panel(current: Trace):
+    """
+    この描画で記録したスパンをウォーターフォール形式で表示
+    Args:
+        current (Trace): 描画全体のトレース
+    """
+    spans = current.finished_spans()
+    if not spans:
+        return
+
+    # 親子関係から階層の深さを求め、ラベルを字下げする
+    parents = {s.span_id: s.parent_id for s in spans}
+    depths = {}
+    for s in spans:
+        depth, parent = 0, s.parent_id
+        while parent is not None and parent in parents:
+            depth, parent = depth + 1, parents[parent]
+        depths[s.span_id] = depth
+
+    origin = current.root.start_ns
+    labels = [f"{'　' * depths[s.span_id]}{s.name}" for s in spans]
+    fig = go.Figure(go.Bar(
+        y=list(range(len(spans))),
+        x=[s.duration_ns / 1e6 for s in spans],
+        base=[(s.start_ns - origin) / 1e6 for s in spans],
+        orientation="h",
+        marker_color=["#d62728" if s.status == STATUS_ERROR else "#1f77b4" for s in spans],
+        customdata=[[s.thread, ", ".join(f"{k}={v}" for k, v in s.attributes.items())] for s in spans],
+        hovertemplate="%{x:.1f}ms<br>%{customdata[0]}<br>%{customdata[1]}<extra></extra>",
+    ))
+    fig.update_layout(
+        height=max(240, 22 * len(spans) + 80),
+        margin=dict(l=10, r=10, t=30, b=30),
+        xaxis_title="ms",
+        yaxis=dict(tickvals=list(range(len(spans))), ticktext=labels, autorange="reversed"),
+    )
+
+    with st.expander(f"処理時間の内訳（合計 {current.root.duration_ns / 1e6:.0f}ms）", expanded=True):
+        st.plotly_chart(fig, use_container_width=True)
 
 
 def main():
@@ -19,6 +177,13 @@ def main():
         layout="wide"
     )
 
+    # 運用監視（プロセス内で1回だけ設定され、再描画では何もしない）
+    configure_logging()
+    start_metrics_server()
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        get_session_tracker().touch(ctx.session_id)
+
     st.title(APP_TITLE)
     st.write(APP_DESCRIPTION)
 
@@ -31,86 +196,26 @@ def main():
             [PERIOD_QUARTERLY, PERIOD_ANNUAL],
             format_func=lambda x: "四半期" if x == PERIOD_QUARTERLY else "年次"
         )
+        # 既定ではこれまでどおりすべてのグラフを表示する
+        section = st.radio(
+            "表示するグラフ",
+            [SECTION_ALL] + [title for title, _ in CHART_SECTIONS]
+        )
+        show_trace = st.checkbox("処理時間の内訳を表示", value=False)
+
+    if not ticker:
+        return
+
+    if not show_trace:
+        with RENDER_SECONDS.time(section=section):
+            render_page(ticker, period, section)
+        return
 
-    if ticker:
-        try:
-            # ローディング表示
-            with st.spinner(f"'{ticker}'の財務データを取得中..."):
-                # データ取得と処理
-                data_fetcher = DataFetcher(ticker)
-                data_processor = DataProcessor(data_fetcher)
-                financial_data = data_processor.process_financial_data(period)
-
-            if financial_data is None:
-                st.error(ERROR_DATA_FETCH)
-                return
-
-            # プロット管理クラスを使用してチャートを作成
-            plot_manager = PlotManager()
-
-            # 業績確認グラフ
-            st.subheader("業績確認グラフ")
-            st.plotly_chart(
-                plot_manager.create_performance_chart(financial_data),
-                use_container_width=True
-            )
-
-            # 1株当たりの価値グラフ
-            st.subheader("1株当たりの価値グラフ")
-            cols = st.columns(2)
-            with cols[0]:
-                st.plotly_chart(
-                    plot_manager.create_per_share_chart(financial_data),
-                    use_container_width=True
-                )
-            with cols[1]:
-                st.plotly_chart(
-                    plot_manager.create_dividend_chart(financial_data),
-                    use_container_width=True
-                )
-
-            # 稼ぐ力グラフ
-            st.subheader("稼ぐ力グラフ")
-            cols = st.columns(2)
-            with cols[0]:
-                st.plotly_chart(
-                    plot_manager.create_earning_power_profit_chart(financial_data),
-                    use_container_width=True
-                )
-            with cols[1]:
-                st.plotly_chart(
-                    plot_manager.create_earning_power_per_share_chart(financial_data),
-                    use_container_width=True
-                )
-
-            cols = st.columns(2)
-            with cols[0]:
-                st.plotly_chart(
-                    plot_manager.create_earning_power_margin_chart(financial_data),
-                    use_container_width=True
-                )
-            with cols[1]:
-                st.plotly_chart(
-                    plot_manager.create_roic_chart(financial_data),
-                    use_container_width=True
-                )
-
-            # 最新の財務指標
-            st.subheader("最新の財務指標")
-            latest_metrics = {
-                "売上高": financial_data.revenue[-1],
-                "営業利益": financial_data.operating_income[-1],
-                "純利益": financial_data.net_income[-1],
-                "EPS": financial_data.eps[-1],
-                "BPS": financial_data.bps[-1],
-            }
-
-            cols = st.columns(len(latest_metrics))
-            for col, (metric, value) in zip(cols, latest_metrics.items()):
-                col.metric(metric, format_financial_value(value))
-
-        except Exception as e:
-            st.error(f"エラーが発生しました: {str(e)}")
+    # 描画全体をトレースし、終了後に処理時間の内訳を表示する
+    with RENDER_SECONDS.time(section=section), \
+            trace("app.render", ticker=ticker, period=period, section=section) as current:
+        render_page(ticker, period, section)
+    render_trace_panel(current)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,83 @@
+"""DataProcessorのマイクロベンチマーク
+
+派生指標の計算を含む1銘柄あたりの処理時間を計測する。
+実行方法（srcディレクトリで）: python -m benchmarks.bench_data_processor
+"""
+import argparse
+import timeit
+from unittest.mock import MagicMock
+import numpy as np
+import pandas as pd
+from data.data_processor import DataProcessor
+from utils.models import StatementBundle
+from utils.constants import (
+    PERIOD_QUARTERLY,
+    YF_REVENUE, YF_OPERATING_INCOME, YF_NET_INCOME, YF_OPERATING_CASH_FLOW,
+    YF_STOCKHOLDER_EQUITY, YF_TOTAL_DEBT, YF_TAX_RATE, YF_DILUTED_SHARES
+)
+
+
+def make_bundle(periods: int, seed: int = 0) -> StatementBundle:
+    """
+    ベンチマーク用の財務諸表一式を作成
+    Args:
+        periods (int): 期数
+        seed (int): 乱数シード
+    Returns:
+        StatementBundle: 財務諸表一式
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end="2024-12-31", periods=periods, freq="QE")[::-1]
+
+    def frame(rows):
+        return pd.DataFrame(
+            {row: rng.uniform(low, high, periods) for row, (low, high) in rows.items()},
+            index=dates
+        ).T
+
+    income = frame({
+        YF_REVENUE: (1e9, 2e9),
+        YF_OPERATING_INCOME: (1e8, 3e8),
+        YF_NET_INCOME: (5e7, 2e8),
+        YF_TAX_RATE: (0.15, 0.25),
+        YF_DILUTED_SHARES: (1e8, 1.1e8),
+    })
+    balance = frame({
+        YF_STOCKHOLDER_EQUITY: (1e9, 3e9),
+        YF_TOTAL_DEBT: (0, 1e9),
+    })
+    cash_flow = frame({YF_OPERATING_CASH_FLOW: (1e8, 4e8)})
+    dividends = pd.Series(0.25, index=pd.date_range(end="2024-12-15", periods=periods, freq="QS"))
+
+    return StatementBundle(
+        income=income,
+        balance=balance,
+        cash_flow=cash_flow,
+        shares=income.loc[YF_DILUTED_SHARES],
+        dividends=dividends
+    )
+
+
+def main():
+    """ベンチマークを実行して結果を表示"""
+    parser = argparse.ArgumentParser(description="DataProcessorのマイクロベンチマーク")
+    parser.add_argument("--periods", type=int, default=20, help="1銘柄あたりの期数")
+    parser.add_argument("--repeat", type=int, default=200, help="計測回数")
+    args = parser.parse_args()
+
+    processor = DataProcessor(MagicMock())
+    bundle = make_bundle(args.periods)
+
+    timings = timeit.repeat(
+        lambda: processor._build_model(bundle, PERIOD_QUARTERLY),
+        number=1,
+        repeat=args.repeat
+    )
+    timings_ms = np.array(timings) * 1000
+    print(f"期数: {args.periods}、計測回数: {args.repeat}")
+    print(f"1銘柄あたりの処理時間: 中央値 {np.median(timings_ms):.3f}ms、"
+          f"p95 {np.percentile(timings_ms, 95):.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""取得 → 処理 → グラフ作成のエンドツーエンドベンチマーク
+
+記録済みの財務諸表（FixtureBackend 形式）を銘柄数の異なる合成ユニバースに割り当てて再生し、
+処理段階ごとのレイテンシ（パーセンタイル）、メモリ割り当て量、最大メモリ使用量を計測する。
+記録済みファイルを指定しない場合は、合成した財務諸表を一時ディレクトリに記録して使う。
+
+実行方法（srcディレクトリで）:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --universes 1 100 --output current.json
+    python -m benchmarks.bench_pipeline --fixtures ../fixtures --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from benchmarks.bench_data_processor import make_bundle
+from data.backends import DataBackend, FixtureBackend
+from data.data_fetcher import DataFetcher
+from data.data_processor import DataProcessor
+from data.request_scheduler import RequestScheduler
+from data.single_flight import SingleFlight
+from plots.plot_manager import PlotManager
+from utils.models import StatementBundle
+from utils.constants import (
+    PERIOD_QUARTERLY, PERIOD_ANNUAL,
+    STATEMENT_INCOME, STATEMENT_BALANCE, STATEMENT_CASH_FLOW, STATEMENT_DIVIDENDS
+)
+
+# 計測するグラフ作成メソッド
+CHARTS = sorted(
+    name for name in vars(PlotManager)
+    if name.startswith("create_") and name.endswith("_chart") and name != "create_financial_chart"
+)
+# 計測する処理段階（表示順）
+STAGES = [
+    "fetch", "process_financial_data",
+    "_build_base_frame", "_dividends_per_period", "_compute_metrics", "_normalize_data"
+] + CHARTS
+DEFAULT_UNIVERSES = [1, 100, 5000]
+
+
+class ReplayBackend(DataBackend):
+    """記録済みの銘柄を合成ユニバースの銘柄に割り当てて再生するバックエンド"""
+
+    name = "replay"
+
+    def __init__(self, fixtures: FixtureBackend, templates: List[str]):
+        """
+        初期化
+        Args:
+            fixtures (FixtureBackend): 記録済みファイル
+            templates (List[str]): 記録済みの銘柄コード（合成銘柄に順に割り当てる）
+        """
+        self.fixtures = fixtures
+        self.templates = templates
+
+    def get_statement(self, ticker: str, statement: str, period: Optional[str]):
+        """
+        割り当てた記録済み銘柄の財務諸表を取得
+        Args:
+            ticker (str): 合成銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表
+        """
+        return self.fixtures.get_statement(self._template(ticker), statement, period)
+
+    def get_calendar(self, ticker: str):
+        """
+        割り当てた記録済み銘柄の決算予定を取得
+        Args:
+            ticker (str): 合成銘柄コード
+        Returns:
+            Optional[Dict]: 決算予定
+        """
+        return self.fixtures.get_calendar(self._template(ticker))
+
+    def _template(self, ticker: str) -> str:
+        """
+        合成銘柄に割り当てる記録済み銘柄
+        Args:
+            ticker (str): 合成銘柄コード（例: "T000042"）
+        Returns:
+            str: 記録済みの銘柄コード
+        """
+        return self.templates[int(ticker[1:]) % len(self.templates)]
+
+
+def write_synthetic_fixtures(root: str, count: int, periods: int) -> List[str]:
+    """
+    合成した財務諸表を記録済みファイルとして保存
+    Args:
+        root (str): 保存先ディレクトリ
+        count (int): 銘柄数
+        periods (int): 四半期の期数
+    Returns:
+        List[str]: 保存した銘柄コード
+    """
+    fixtures = FixtureBackend(root)
+    tickers = [f"SYN{i:03d}" for i in range(count)]
+    for seed, ticker in enumerate(tickers):
+        quarterly = make_bundle(periods, seed)
+        annual = make_bundle(max(periods // 4, 1), seed + count)
+        for period, bundle in ((PERIOD_QUARTERLY, quarterly), (PERIOD_ANNUAL, annual)):
+            fixtures.save_statement(ticker, STATEMENT_INCOME, period, bundle.income)
+            fixtures.save_statement(ticker, STATEMENT_BALANCE, period, bundle.balance)
+            fixtures.save_statement(ticker, STATEMENT_CASH_FLOW, period, bundle.cash_flow)
+        fixtures.save_statement(ticker, STATEMENT_DIVIDENDS, None, quarterly.dividends)
+    return tickers
+
+
+class StageRecorder:
+    """処理段階ごとの計測結果の記録クラス"""
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        初期化
+        Args:
+            trace_memory (bool): メモリ割り当て量を計測する場合はTrue（tracemallocを使うため処理は遅くなる）
+        """
+        self.trace_memory = trace_memory
+        self.timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.allocations: Dict[str, List[int]] = {stage: [] for stage in STAGES}
+
+    def measure(self, stage: str, func: Callable, *args):
+        """
+        処理を実行して計測
+        Args:
+            stage (str): 処理段階名
+            func (Callable): 実行する関数
+            *args: 関数の引数
+        Returns:
+            関数の戻り値
+        """
+        if self.trace_memory:
+            # 処理中に増えたメモリの最大値を割り当て量とする
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            self.allocations[stage].append(peak - before)
+            return result
+
+        started = time.perf_counter()
+        result = func(*args)
+        self.timings[stage].append(time.perf_counter() - started)
+        return result
+
+
+def run_ticker(
+    ticker: str,
+    backend: DataBackend,
+    scheduler: RequestScheduler,
+    recorder: StageRecorder,
+    detail: bool
+) -> None:
+    """
+    1銘柄分の全処理段階を計測
+    Args:
+        ticker (str): 銘柄コード
+        backend (DataBackend): データ取得元
+        scheduler (RequestScheduler): リクエスト制御
+        recorder (StageRecorder): 計測結果の記録先
+        detail (bool): 派生指標の計算・正規化・グラフ作成も段階ごとに計測する場合はTrue
+    """
+    def new_fetcher():
+        return DataFetcher(ticker, scheduler=scheduler, single_flight=SingleFlight(), backend=backend)
+
+    def fetch(fetcher):
+        return StatementBundle(
+            income=fetcher.get_income_statement(PERIOD_QUARTERLY),
+            balance=fetcher.get_balance_sheet(PERIOD_QUARTERLY),
+            cash_flow=fetcher.get_cash_flow(PERIOD_QUARTERLY),
+            shares=fetcher.get_shares_outstanding(PERIOD_QUARTERLY),
+            dividends=fetcher.get_dividends()
+        )
+
+    fetcher = new_fetcher()
+    bundle = recorder.measure("fetch", fetch, fetcher)
+    model = recorder.measure(
+        "process_financial_data", DataProcessor(new_fetcher()).process_financial_data, PERIOD_QUARTERLY
+    )
+    if not detail or model is None:
+        return
+
+    processor = DataProcessor(fetcher)
+    base = recorder.measure("_build_base_frame", processor._build_base_frame, bundle, PERIOD_QUARTERLY)
+    recorder.measure(
+        "_dividends_per_period", processor._dividends_per_period, bundle.dividends,
+        pd.to_datetime(base.index).tz_localize(None), PERIOD_QUARTERLY
+    )
+    df = recorder.measure("_compute_metrics", processor._compute_metrics, base)
+    recorder.measure("_normalize_data", processor._normalize_data, df)
+    for chart in CHARTS:
+        recorder.measure(chart, getattr(PlotManager, chart), model)
+
+
+def run_universe(
+    size: int,
+    backend: ReplayBackend,
+    sample: int,
+    memory_sample: int,
+    min_samples: int
+) -> Dict:
+    """
+    合成ユニバースの全銘柄を処理して計測
+    取得・処理は全銘柄、処理の各段階・グラフ作成は先頭の sample 銘柄で計測する
+    Args:
+        size (int): 銘柄数
+        backend (ReplayBackend): データ取得元
+        sample (int): 詳細に計測する銘柄数
+        memory_sample (int): メモリ割り当て量を計測する銘柄数
+        min_samples (int): 処理段階ごとの最小計測回数（銘柄数が少ない場合は繰り返す）
+    Returns:
+        Dict: 処理段階ごとの集計結果と全体の統計
+    """
+    scheduler = RequestScheduler(rate_per_second=1e9, burst=10 ** 9, max_retries=0)
+    tickers = [f"T{i:06d}" for i in range(size)]
+
+    # 初回のみ発生する読み込み（モジュールの遅延インポート、記録済みファイルの読み込み）を計測から除く
+    warmup = StageRecorder()
+    run_ticker(tickers[0], backend, scheduler, warmup, detail=True)
+    for i in range(1, min(size, len(backend.templates))):
+        run_ticker(tickers[i], backend, scheduler, warmup, detail=False)
+
+    # 銘柄数が少ない場合は、パーセンタイルを求められるよう繰り返し計測する
+    rounds = -(-min_samples // size)
+    recorder = StageRecorder()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for i, ticker in enumerate(tickers):
+            run_ticker(ticker, backend, scheduler, recorder, detail=i < sample)
+    elapsed = time.perf_counter() - started
+
+    memory_recorder = StageRecorder(trace_memory=True)
+    tracemalloc.start()
+    try:
+        for ticker in tickers[:memory_sample]:
+            run_ticker(ticker, backend, scheduler, memory_recorder, detail=True)
+    finally:
+        tracemalloc.stop()
+
+    processing = sum(recorder.timings["process_financial_data"])
+    stages = {}
+    for stage in STAGES:
+        timings_ms = np.array(recorder.timings[stage]) * 1000
+        if timings_ms.size == 0:
+            continue
+        allocations = memory_recorder.allocations[stage]
+        stages[stage] = {
+            "count": int(timings_ms.size),
+            "p50_ms": float(np.percentile(timings_ms, 50)),
+            "p95_ms": float(np.percentile(timings_ms, 95)),
+            "p99_ms": float(np.percentile(timings_ms, 99)),
+            "max_ms": float(timings_ms.max()),
+            "alloc_kb": float(np.mean(allocations)) / 1024 if allocations else None,
+        }
+    return {
+        "tickers": size,
+        "rounds": rounds,
+        "elapsed_s": elapsed,
+        # 取得から財務データモデル作成までのスループット
+        "tickers_per_s": size * rounds / processing if processing > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    ベースラインと比較して表示
+    Args:
+        results (Dict): 今回の計測結果
+        baseline (Dict): ベースラインの計測結果
+        threshold (float): 劣化とみなす p50・p95 の増加率（例: 0.1 は10%）
+    Returns:
+        List[str]: 劣化した「ユニバース/処理段階」の一覧
+    """
+    regressions = []
+    for size, universe in results["universes"].items():
+        base_universe = baseline.get("universes", {}).get(size)
+        if base_universe is None:
+            print(f"\n[{size}銘柄] ベースラインに結果がありません")
+            continue
+        print(f"\n[{size}銘柄] ベースラインとの比較（p50 / p95）")
+        for stage, stats in universe["stages"].items():
+            base = base_universe["stages"].get(stage)
+            if base is None:
+                continue
+            deltas = [
+                (stats[key] - base[key]) / base[key] if base[key] > 0 else 0.0
+                for key in ("p50_ms", "p95_ms")
+            ]
+            regressed = max(deltas) > threshold
+            if regressed:
+                regressions.append(f"{size}/{stage}")
+            print(
+                f"  {stage:<40} {base['p50_ms']:9.3f} → {stats['p50_ms']:9.3f}ms ({deltas[0]:+7.1%})"
+                f"  {base['p95_ms']:9.3f} → {stats['p95_ms']:9.3f}ms ({deltas[1]:+7.1%})"
+                f"{'  ← 劣化' if regressed else ''}"
+            )
+    return regressions
+
+
+def print_universe(universe: Dict) -> None:
+    """
+    ユニバースの計測結果を表示
+    Args:
+        universe (Dict): run_universe の戻り値
+    """
+    print(
+        f"\n[{universe['tickers']}銘柄] {universe['elapsed_s']:.1f}秒"
+        f"（処理 {universe['tickers_per_s']:.1f}銘柄/秒）、最大メモリ使用量 {universe['peak_rss_mb']:.0f}MB"
+    )
+    print(f"  {'処理段階':<38} {'件数':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'割り当て':>10}")
+    for stage, stats in universe["stages"].items():
+        alloc = f"{stats['alloc_kb']:8.1f}KB" if stats["alloc_kb"] is not None else f"{'-':>10}"
+        print(
+            f"  {stage:<40} {stats['count']:6d} {stats['p50_ms']:7.3f}ms {stats['p95_ms']:7.3f}ms"
+            f" {stats['p99_ms']:7.3f}ms {stats['max_ms']:7.3f}ms {alloc}"
+        )
+
+
+def _peak_rss_mb() -> float:
+    """
+    プロセスの最大メモリ使用量
+    Returns:
+        float: 最大常駐メモリ（MB）
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOSはバイト、Linuxはキロバイト単位
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    ベンチマークを実行して結果を表示
+    Args:
+        argv (Optional[List[str]]): コマンドライン引数
+    Returns:
+        int: 終了コード（ベースラインから劣化した処理段階がある場合は1）
+    """
+    parser = argparse.ArgumentParser(description="取得 → 処理 → グラフ作成のエンドツーエンドベンチマーク")
+    parser.add_argument("--universes", type=int, nargs="+", default=DEFAULT_UNIVERSES, help="計測する銘柄数")
+    parser.add_argument("--fixtures", help="記録済みファイルのディレクトリ（省略時は合成データ）")
+    parser.add_argument("--templates", type=int, default=20, help="合成データの銘柄数（--fixtures 省略時）")
+    parser.add_argument("--periods", type=int, default=20, help="合成データの四半期の期数（--fixtures 省略時）")
+    parser.add_argument("--sample", type=int, default=500, help="処理の各段階・グラフ作成を計測する銘柄数")
+    parser.add_argument("--min-samples", type=int, default=30, help="処理段階ごとの最小計測回数")
+    parser.add_argument("--memory-sample", type=int, default=20, help="メモリ割り当て量を計測する銘柄数")
+    parser.add_argument("--output", help="計測結果の保存先（JSON）")
+    parser.add_argument("--baseline", help="比較するベースラインの計測結果（JSON）")
+    parser.add_argument("--threshold", type=float, default=0.1, help="劣化とみなす p50・p95 の増加率")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.fixtures:
+            root = args.fixtures
+            templates = _recorded_tickers(root)
+        else:
+            root = tmp_dir
+            templates = write_synthetic_fixtures(root, args.templates, args.periods)
+        if not templates:
+            parser.error(f"記録済みファイルがありません: {root}")
+        backend = ReplayBackend(FixtureBackend(root), templates)
+
+        print(f"記録済み銘柄: {len(templates)}（{root if args.fixtures else '合成データ'}）")
+        results = {
+            "environment": {
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+            },
+            "universes": {},
+        }
+        for size in args.universes:
+            universe = run_universe(size, backend, args.sample, args.memory_sample, args.min_samples)
+            results["universes"][str(size)] = universe
+            print_universe(universe)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n計測結果を保存しました: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}件の処理段階が{args.threshold:.0%}以上劣化しました: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+def _recorded_tickers(root: str) -> List[str]:
+    """
+    記録済みファイルの銘柄一覧
+    Args:
+        root (str): 記録済みファイルのディレクトリ
+    Returns:
+        List[str]: 銘柄コード（昇順）
+    """
+    return sorted(name for name in os.listdir(root) if os.path.isdir(os.path.join(root, name)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
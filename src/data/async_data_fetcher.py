@@ -0,0 +1,164 @@
+"""非同期財務データ取得モジュール"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import pandas as pd
+from data.data_fetcher import DataFetcher, extract_row
+from data.request_scheduler import RequestScheduler
+from data.single_flight import get_default_single_flight
+from data.statement_cache import StatementCache
+from utils.constants import (
+    YF_DILUTED_SHARES, YF_TAX_RATE, YF_TOTAL_DEBT,
+    PERIOD_QUARTERLY, ASYNC_FETCH_MAX_WORKERS,
+    STATEMENT_INCOME, STATEMENT_BALANCE, STATEMENT_CASH_FLOW, STATEMENT_DIVIDENDS
+)
+
+# 取得処理を実行するスレッドプール（結果を待つ側はスレッドを占有しない）
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    取得処理を実行するスレッドプールを取得
+    Returns:
+        ThreadPoolExecutor: プロセス内で共有するスレッドプール
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=ASYNC_FETCH_MAX_WORKERS, thread_name_prefix="async-fetch"
+            )
+        return _executor
+
+
+class AsyncDataFetcher:
+    """非同期財務データ取得クラス
+
+    DataFetcher と同じ取得メソッドをコルーチンとして提供する。
+    ネットワーク待ちは共有スレッドプールで行うため、呼び出し側のスレッドを占有しない。
+    同じ銘柄・財務諸表の取得が実行中の場合は、新たに取得せずその結果を待つ。
+    """
+
+    def __init__(
+        self,
+        ticker: str,
+        cache: Optional[StatementCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        fetcher: Optional[DataFetcher] = None
+    ):
+        """
+        初期化
+        Args:
+            ticker (str): 銘柄コード（例: "AAPL"）
+            cache (Optional[StatementCache]): 財務諸表キャッシュ（Noneの場合はキャッシュしない）
+            scheduler (Optional[RequestScheduler]): リクエスト制御（Noneの場合はプロセス共通のもの）
+            fetcher (Optional[DataFetcher]): 利用する同期版の取得クラス（省略時は新たに作成）
+        Raises:
+            ValueError: 銘柄コードが指定されていない場合
+        """
+        if not ticker:
+            raise ValueError("銘柄コードが指定されていません")
+        self.ticker = ticker
+        self.fetcher = fetcher if fetcher is not None else DataFetcher(ticker, cache=cache, scheduler=scheduler)
+
+    async def get_income_statement(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.DataFrame]:
+        """
+        損益計算書を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.DataFrame]: 損益計算書
+        """
+        return await self._shared(STATEMENT_INCOME, period, self.fetcher.get_income_statement, period)
+
+    async def get_balance_sheet(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.DataFrame]:
+        """
+        貸借対照表を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.DataFrame]: 貸借対照表
+        """
+        return await self._shared(STATEMENT_BALANCE, period, self.fetcher.get_balance_sheet, period)
+
+    async def get_cash_flow(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.DataFrame]:
+        """
+        キャッシュフロー計算書を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.DataFrame]: キャッシュフロー計算書
+        """
+        return await self._shared(STATEMENT_CASH_FLOW, period, self.fetcher.get_cash_flow, period)
+
+    async def get_shares_outstanding(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.Series]:
+        """
+        希薄化後発行済株式数を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.Series]: 希薄化後発行済株式数
+        """
+        income = await self.get_income_statement(period)
+        return extract_row(income, YF_DILUTED_SHARES, "希薄化後発行済株式数", self.ticker)
+
+    async def get_tax_rate(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.Series]:
+        """
+        実効税率を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.Series]: 実効税率
+        """
+        income = await self.get_income_statement(period)
+        return extract_row(income, YF_TAX_RATE, "実効税率", self.ticker)
+
+    async def get_total_debt(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.Series]:
+        """
+        有利子負債を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.Series]: 有利子負債
+        """
+        balance = await self.get_balance_sheet(period)
+        return extract_row(balance, YF_TOTAL_DEBT, "有利子負債", self.ticker)
+
+    async def get_dividends(self) -> Optional[pd.Series]:
+        """
+        配当データを取得
+        Returns:
+            Optional[pd.Series]: 配当データ
+        """
+        return await self._shared(STATEMENT_DIVIDENDS, None, self.fetcher.get_dividends)
+
+    async def _shared(
+        self,
+        statement: str,
+        period: Optional[str],
+        getter: Callable,
+        *args
+    ):
+        """
+        取得処理を実行（同じ取得が実行中の場合はその結果を待つ）
+        Args:
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+            getter (Callable): 同期版の取得メソッド
+            *args: 取得メソッドの引数
+        Returns:
+            取得メソッドの戻り値
+        """
+        # DataFetcher と同じ集約を使う。キーを DataFetcher の (バックエンド, 銘柄, 種類, 期間) と
+        # 分けておかないと、取得メソッド内の集約が自身の完了を待ち続けてしまう
+        # 取得元が異なる結果を共有しないよう、キーにはバックエンド名も含める
+        # イベントループをまたいで共有できるよう concurrent.futures.Future で結果を受け渡す
+        key = ("async", self.fetcher.backend.name, self.ticker.upper(), statement, period)
+        future = get_default_single_flight().submit(key, _get_executor(), getter, *args)
+
+        # 呼び出し側がキャンセル・タイムアウトしても、結果を待つ他の呼び出しに影響させない
+        return await asyncio.shield(asyncio.wrap_future(future))
+
@@ -0,0 +1,421 @@
+"""財務データ取得元（バックエンド）モジュール
+
+記録済みファイルの作成例（srcディレクトリで）:
+    python -m data.backends --tickers AAPL MSFT --output fixtures/
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import pandas as pd
+import yfinance as yf
+from data.request_scheduler import get_default_scheduler
+from utils.telemetry import configure_logging, log_event
+from utils.constants import (
+    PERIOD_QUARTERLY, PERIOD_ANNUAL, DATA_BACKEND, FIXTURE_DIR, BACKEND_YFINANCE, BACKEND_FIXTURE,
+    STATEMENT_INCOME, STATEMENT_BALANCE, STATEMENT_CASH_FLOW, STATEMENT_DIVIDENDS
+)
+
+# 財務諸表の種類ごとのyfinance属性名（年次, 四半期）
+STATEMENT_ATTRIBUTES = {
+    STATEMENT_INCOME: ("income_stmt", "quarterly_income_stmt"),
+    STATEMENT_BALANCE: ("balance_sheet", "quarterly_balance_sheet"),
+    STATEMENT_CASH_FLOW: ("cashflow", "quarterly_cashflow"),
+    STATEMENT_DIVIDENDS: ("dividends", "dividends"),
+}
+
+
+class DataBackend(ABC):
+    """財務データ取得元の基底クラス
+
+    DataFetcher はこのインターフェースを通じて財務諸表を取得する。
+    財務諸表は yfinance と同じ形式（行 = 項目、列 = 決算日の DataFrame。配当は日付を索引とする Series）で返し、
+    データがない場合は空の DataFrame / Series を返す。
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get_statement(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str]
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        財務諸表を取得
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表
+        """
+
+    @abstractmethod
+    def get_calendar(self, ticker: str) -> Optional[Dict]:
+        """
+        決算予定を取得
+        Args:
+            ticker (str): 銘柄コード
+        Returns:
+            Optional[Dict]: yfinance の Ticker.calendar と同じ形式の辞書（不明な場合はNone）
+        """
+
+
+class YFinanceBackend(DataBackend):
+    """yfinance から取得するバックエンド"""
+
+    name = BACKEND_YFINANCE
+
+    def __init__(self):
+        """
+        初期化
+        """
+        self._tickers: Dict[str, yf.Ticker] = {}
+        self._lock = threading.Lock()
+
+    def get_statement(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str]
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        財務諸表を取得
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表
+        """
+        annual_attr, quarterly_attr = STATEMENT_ATTRIBUTES[statement]
+        return getattr(self._ticker(ticker), annual_attr if period == PERIOD_ANNUAL else quarterly_attr)
+
+    def get_calendar(self, ticker: str) -> Optional[Dict]:
+        """
+        決算予定を取得
+        Args:
+            ticker (str): 銘柄コード
+        Returns:
+            Optional[Dict]: 決算予定（取得できない場合はNone）
+        """
+        calendar = self._ticker(ticker).calendar
+        return calendar if isinstance(calendar, dict) else None
+
+    def _ticker(self, ticker: str) -> yf.Ticker:
+        """
+        銘柄ごとの yf.Ticker を取得（同じ銘柄では使い回す）
+        Args:
+            ticker (str): 銘柄コード
+        Returns:
+            yf.Ticker: yfinance の銘柄オブジェクト
+        """
+        with self._lock:
+            if ticker not in self._tickers:
+                self._tickers[ticker] = yf.Ticker(ticker)
+            return self._tickers[ticker]
+
+
+class FixtureBackend(DataBackend):
+    """記録済みのファイルから取得するバックエンド
+
+    銘柄ごとのディレクトリに、財務諸表を1ファイルずつ Parquet 形式で保存したものを読み込む。
+    ネットワークに接続せずに同じデータを繰り返し取得できるため、ベンチマークや負荷試験に用いる。
+
+    ディレクトリ構成:
+        <root>/<銘柄コード>/<種類>_<期間>.parquet（配当は dividends.parquet）
+        <root>/<銘柄コード>/calendar.json（決算予定。任意）
+    """
+
+    name = BACKEND_FIXTURE
+
+    def __init__(self, root: str = FIXTURE_DIR):
+        """
+        初期化
+        Args:
+            root (str): 記録の保存先ディレクトリ
+        """
+        self.root = root
+        self._frames: Dict[Tuple[str, str, Optional[str]], Union[pd.DataFrame, pd.Series]] = {}
+        self._lock = threading.Lock()
+
+    def get_statement(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str]
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        財務諸表を取得（一度読み込んだファイルはメモリに保持する）
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表（記録がない場合は空）
+        """
+        key = (ticker.upper(), statement, period)
+        with self._lock:
+            if key in self._frames:
+                return self._frames[key]
+
+        data = self._read(ticker, statement, period)
+        with self._lock:
+            return self._frames.setdefault(key, data)
+
+    def get_calendar(self, ticker: str) -> Optional[Dict]:
+        """
+        決算予定を取得
+        Args:
+            ticker (str): 銘柄コード
+        Returns:
+            Optional[Dict]: 決算予定（記録がない場合は空の辞書）
+        """
+        path = os.path.join(self._ticker_dir(ticker), "calendar.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_statement(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str],
+        data: Union[pd.DataFrame, pd.Series]
+    ) -> None:
+        """
+        財務諸表を記録
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+            data (Union[pd.DataFrame, pd.Series]): 財務諸表
+        """
+        if statement == STATEMENT_DIVIDENDS:
+            frame = data.rename(STATEMENT_DIVIDENDS).to_frame()
+        else:
+            # 決算日を行にして保存する（Parquetの列名は文字列である必要があるため）
+            frame = data.T.apply(pd.to_numeric, errors="coerce")
+        _write_atomic(self._path(ticker, statement, period), frame.to_parquet)
+        with self._lock:
+            self._frames.pop((ticker.upper(), statement, period), None)
+
+    def save_calendar(self, ticker: str, calendar: Optional[Dict]) -> None:
+        """
+        決算予定を記録
+        Args:
+            ticker (str): 銘柄コード
+            calendar (Optional[Dict]): 決算予定
+        """
+        serializable = {
+            key: [str(value) for value in values] if isinstance(values, list) else str(values)
+            for key, values in (calendar or {}).items()
+        }
+
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(serializable, f, ensure_ascii=False)
+
+        _write_atomic(os.path.join(self._ticker_dir(ticker), "calendar.json"), write)
+
+    def _read(self, ticker: str, statement: str, period: Optional[str]) -> Union[pd.DataFrame, pd.Series]:
+        """
+        記録を読み込み、yfinance と同じ形式に戻す
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表（記録がない場合は空）
+        """
+        path = self._path(ticker, statement, period)
+        if statement == STATEMENT_DIVIDENDS:
+            if not os.path.exists(path):
+                return pd.Series(dtype="float64")
+            return pd.read_parquet(path)[STATEMENT_DIVIDENDS].rename(None)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return pd.read_parquet(path).T
+
+    def _ticker_dir(self, ticker: str) -> str:
+        """
+        銘柄ごとの保存先ディレクトリ
+        Args:
+            ticker (str): 銘柄コード
+        Returns:
+            str: ディレクトリのパス
+        """
+        return os.path.join(self.root, ticker.upper())
+
+    def _path(self, ticker: str, statement: str, period: Optional[str]) -> str:
+        """
+        財務諸表のファイルパス
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+        Returns:
+            str: ファイルパス
+        """
+        filename = statement if period is None else f"{statement}_{period}"
+        return os.path.join(self._ticker_dir(ticker), f"{filename}.parquet")
+
+
+class RecordingBackend(DataBackend):
+    """取得したデータを記録するバックエンド
+
+    別のバックエンド（通常は yfinance）から取得した財務諸表と決算予定を
+    FixtureBackend の形式で保存する。
+    """
+
+    def __init__(self, inner: DataBackend, fixtures: FixtureBackend):
+        """
+        初期化
+        Args:
+            inner (DataBackend): 実際に取得するバックエンド
+            fixtures (FixtureBackend): 記録先
+        """
+        self.inner = inner
+        self.fixtures = fixtures
+        self.name = f"recording:{inner.name}"
+
+    def get_statement(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str]
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        財務諸表を取得して記録
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）（配当はNone）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表
+        """
+        data = self.inner.get_statement(ticker, statement, period)
+        if not data.empty:
+            self.fixtures.save_statement(ticker, statement, period, data)
+        return data
+
+    def get_calendar(self, ticker: str) -> Optional[Dict]:
+        """
+        決算予定を取得して記録
+        Args:
+            ticker (str): 銘柄コード
+        Returns:
+            Optional[Dict]: 決算予定
+        """
+        calendar = self.inner.get_calendar(ticker)
+        self.fixtures.save_calendar(ticker, calendar)
+        return calendar
+
+
+_fixture_backends: Dict[str, FixtureBackend] = {}
+_fixture_backends_lock = threading.Lock()
+
+
+def create_backend(name: str = DATA_BACKEND) -> DataBackend:
+    """
+    名前からバックエンドを作成
+    記録済みファイルのバックエンドは読み込んだデータを保持するため、保存先ごとにプロセス内で共有する
+    Args:
+        name (str): "yfinance" または "fixture"
+    Returns:
+        DataBackend: バックエンド
+    Raises:
+        ValueError: 未知の名前の場合
+    """
+    if name == BACKEND_YFINANCE:
+        return YFinanceBackend()
+    if name == BACKEND_FIXTURE:
+        with _fixture_backends_lock:
+            if FIXTURE_DIR not in _fixture_backends:
+                _fixture_backends[FIXTURE_DIR] = FixtureBackend(FIXTURE_DIR)
+            return _fixture_backends[FIXTURE_DIR]
+    raise ValueError(f"未知のデータ取得元です: {name}")
+
+
+def record_fixtures(
+    tickers: Iterable[str],
+    fixtures: FixtureBackend,
+    source: Optional[DataBackend] = None
+) -> int:
+    """
+    複数銘柄の財務諸表一式と決算予定を記録
+    Args:
+        tickers (Iterable[str]): 銘柄コードの一覧
+        fixtures (FixtureBackend): 記録先
+        source (Optional[DataBackend]): 取得元（Noneの場合はyfinance）
+    Returns:
+        int: 記録できた銘柄数
+    """
+    recorder = RecordingBackend(source if source is not None else YFinanceBackend(), fixtures)
+    scheduler = get_default_scheduler()
+    requests = [(STATEMENT_DIVIDENDS, None)] + [
+        (statement, period)
+        for statement in (STATEMENT_INCOME, STATEMENT_BALANCE, STATEMENT_CASH_FLOW)
+        for period in (PERIOD_QUARTERLY, PERIOD_ANNUAL)
+    ]
+
+    recorded = 0
+    for ticker in tickers:
+        try:
+            for statement, period in requests:
+                scheduler.call(recorder.get_statement, ticker, statement, period)
+            scheduler.call(recorder.get_calendar, ticker)
+            recorded += 1
+        except Exception as e:
+            log_event("record_failed", f"{ticker}の記録に失敗しました: {str(e)}", level=logging.ERROR, ticker=ticker)
+    return recorded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    yfinance から取得したデータを記録済みファイルとして保存
+    Args:
+        argv (Optional[List[str]]): コマンドライン引数
+    Returns:
+        int: 終了コード（1銘柄も記録できなかった場合は1）
+    """
+    parser = argparse.ArgumentParser(description="財務データを記録済みファイルとして保存します")
+    parser.add_argument("--tickers", nargs="+", required=True, help="記録する銘柄コード")
+    parser.add_argument("--output", default=FIXTURE_DIR, help="保存先ディレクトリ")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    recorded = record_fixtures(args.tickers, FixtureBackend(args.output))
+    print(f"{len(args.tickers)}銘柄中{recorded}銘柄を記録しました: {args.output}")
+    return 0 if recorded else 1
+
+
+def _write_atomic(path: str, write) -> None:
+    """
+    一時ファイル経由でファイルを書き込む
+    Args:
+        path (str): 保存先のパス
+        write: 一時ファイルのパスを受け取って書き込む関数
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,107 @@
 """財務データ取得モジュール"""
-from typing import Dict, List, Optional, Union
-import yfinance as yf
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Union
 import pandas as pd
+from data.backends import DataBackend, create_backend
+from data.request_scheduler import RequestScheduler, get_default_scheduler
+from data.single_flight import SingleFlight, get_default_single_flight
+from data.statement_cache import StatementCache, is_unchanged
+from utils.telemetry import get_registry, log_event
+from utils.tracing import span, traced
 from utils.constants import (
     YF_REVENUE, YF_OPERATING_INCOME, YF_NET_INCOME, YF_OPERATING_CASH_FLOW,
     YF_STOCKHOLDER_EQUITY, YF_TOTAL_ASSETS, YF_TOTAL_LIABILITIES,
-    PERIOD_ANNUAL, PERIOD_QUARTERLY
+    YF_TOTAL_DEBT, YF_TAX_RATE, YF_DILUTED_SHARES, YF_EARNINGS_DATE,
+    PERIOD_QUARTERLY,
+    STATEMENT_INCOME, STATEMENT_BALANCE, STATEMENT_CASH_FLOW, STATEMENT_DIVIDENDS
 )
 
+# 上流（データ取得元）への呼び出しとキャッシュ参照の監視用メトリクス
+UPSTREAM_REQUESTS = get_registry().counter(
+    "upstream_requests_total", "上流（データ取得元）への呼び出し回数", ("backend", "statement", "period")
+)
+UPSTREAM_ERRORS = get_registry().counter(
+    "upstream_errors_total", "上流（データ取得元）への呼び出しの失敗回数", ("backend", "statement", "period")
+)
+UPSTREAM_LATENCY = get_registry().histogram(
+    "upstream_request_seconds", "上流（データ取得元）への呼び出し時間（再試行を含む）", ("backend", "statement")
+)
+STATEMENT_CACHE_LOOKUPS = get_registry().counter(
+    "statement_cache_lookups_total", "財務諸表キャッシュの参照結果（hit, revalidated, miss）", ("result",)
+)
+
+
+def extract_row(
+    statement: Optional[pd.DataFrame],
+    row: str,
+    label: str,
+    ticker: str
+) -> Optional[pd.Series]:
+    """
+    財務諸表から指定項目を切り出す
+    Args:
+        statement (Optional[pd.DataFrame]): 財務諸表
+        row (str): 項目名（yfinance）
+        label (str): メッセージ表示用の名称
+        ticker (str): 銘柄コード
+    Returns:
+        Optional[pd.Series]: 指定項目の時系列（財務諸表または項目がない場合はNone）
+    """
+    if statement is None:
+        return None
+    if row not in statement.index:
+        log_event("statement_row_missing", f"{label}が取得できませんでした: {ticker}", ticker=ticker, row=row)
+        return None
+    return statement.loc[row]
+
 
 class DataFetcher:
-    """財務データ取得クラス"""
+    """財務データ取得クラス
+
+    取得した財務諸表はインスタンス内に保持し、同じ諸表を二度取得しない。
+    株式数・実効税率・有利子負債などの派生項目は保持した諸表から切り出す。
+    キャッシュにない諸表は、他のインスタンス（セッション）が同じ諸表を取得中であれば
+    その結果を共有する。
+    """
 
-    def __init__(self, ticker: str):
+    def __init__(
+        self,
+        ticker: str,
+        cache: Optional[StatementCache] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        single_flight: Optional[SingleFlight] = None,
+        backend: Optional[DataBackend] = None
+    ):
         """
         初期化
         Args:
             ticker (str): 銘柄コード（例: "AAPL"）
+            cache (Optional[StatementCache]): 財務諸表キャッシュ（Noneの場合はキャッシュしない）
+            scheduler (Optional[RequestScheduler]): リクエスト制御（Noneの場合はプロセス共通のもの）
+            single_flight (Optional[SingleFlight]): 同時リクエストの集約（Noneの場合はプロセス共通のもの）
+            backend (Optional[DataBackend]): データ取得元（Noneの場合は設定 DATA_BACKEND のもの）
         """
         self.ticker = ticker
-        self.stock = yf.Ticker(ticker)
+        self.backend = backend if backend is not None else create_backend()
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else get_default_scheduler()
+        self.single_flight = single_flight if single_flight is not None else get_default_single_flight()
+        # 上流（データ取得元）への呼び出し回数（"種類:期間"ごと）
+        self.upstream_calls: Counter = Counter()
+        self._statements: Dict[Tuple[str, Optional[str]], Union[pd.DataFrame, pd.Series]] = {}
+        self._statement_locks: Dict[Tuple[str, Optional[str]], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._earnings_date_lock = threading.Lock()
+        self._next_earnings_date: Optional[pd.Timestamp] = None
+        self._next_earnings_date_loaded = False
+        # 読み込んだ財務諸表のうち最も早いキャッシュの有効期限（UNIX時刻）
+        self._statements_expire_at: Optional[float] = None
+        # キャッシュ済みの財務諸表と照合し、新しい期・修正された期が見つかったか
+        self._statements_changed = False
 
+    @traced()
     def get_income_statement(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.DataFrame]:
         """
         損益計算書を取得
@@ -29,16 +110,9 @@ class DataFetcher:
         Returns:
             Optional[pd.DataFrame]: 損益計算書
         """
-        try:
-            income = self.stock.income_stmt if period == PERIOD_ANNUAL else self.stock.quarterly_income_stmt
-            if income.empty:
-                print(f"損益計算書が取得できませんでした: {self.ticker}")
-                return None
-            return income
-        except Exception as e:
-            print(f"損益計算書の取得に失敗しました: {str(e)}")
-            return None
+        return self.get_statement(STATEMENT_INCOME, period, "損益計算書")
 
+    @traced()
     def get_balance_sheet(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.DataFrame]:
         """
         貸借対照表を取得
@@ -47,16 +121,9 @@ class DataFetcher:
         Returns:
             Optional[pd.DataFrame]: 貸借対照表
         """
-        try:
-            balance = self.stock.balance_sheet if period == PERIOD_ANNUAL else self.stock.quarterly_balance_sheet
-            if balance.empty:
-                print(f"貸借対照表が取得できませんでした: {self.ticker}")
-                return None
-            return balance
-        except Exception as e:
-            print(f"貸借対照表の取得に失敗しました: {str(e)}")
-            return None
+        return self.get_statement(STATEMENT_BALANCE, period, "貸借対照表")
 
+    @traced()
     def get_cash_flow(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.DataFrame]:
         """
         キャッシュフロー計算書を取得
@@ -65,16 +132,9 @@ class DataFetcher:
         Returns:
             Optional[pd.DataFrame]: キャッシュフロー計算書
         """
-        try:
-            cash = self.stock.cashflow if period == PERIOD_ANNUAL else self.stock.quarterly_cashflow
-            if cash.empty:
-                print(f"キャッシュフロー計算書が取得できませんでした: {self.ticker}")
-                return None
-            return cash
-        except Exception as e:
-            print(f"キャッシュフロー計算書の取得に失敗しました: {str(e)}")
-            return None
+        return self.get_statement(STATEMENT_CASH_FLOW, period, "キャッシュフロー計算書")
 
+    @traced()
     def get_shares_outstanding(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.Series]:
         """
         希薄化後発行済株式数を取得
@@ -83,36 +143,237 @@ class DataFetcher:
         Returns:
             Optional[pd.Series]: 希薄化後発行済株式数
         """
-        try:
-            # 損益計算書から希薄化後発行済株式数を取得
-            income = self.stock.income_stmt if period == PERIOD_ANNUAL else self.stock.quarterly_income_stmt
-            if income.empty:
-                print(f"損益計算書が取得できませんでした: {self.ticker}")
-                return None
+        return self._get_income_row(YF_DILUTED_SHARES, period, "希薄化後発行済株式数")
 
-            # 希薄化後発行済株式数を取得
-            if "Diluted Average Shares" in income.index:
-                shares = income.loc["Diluted Average Shares"]
-                return shares
-            else:
-                print(f"希薄化後発行済株式数が取得できませんでした: {self.ticker}")
-                return None
-        except Exception as e:
-            print(f"希薄化後発行済株式数の取得に失敗しました: {str(e)}")
-            return None
+    @traced()
+    def get_tax_rate(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.Series]:
+        """
+        実効税率を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.Series]: 実効税率
+        """
+        return self._get_income_row(YF_TAX_RATE, period, "実効税率")
+
+    @traced()
+    def get_total_debt(self, period: str = PERIOD_QUARTERLY) -> Optional[pd.Series]:
+        """
+        有利子負債を取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.Series]: 有利子負債
+        """
+        return extract_row(self.get_balance_sheet(period), YF_TOTAL_DEBT, "有利子負債", self.ticker)
 
+    @traced()
     def get_dividends(self) -> Optional[pd.Series]:
         """
         配当データを取得
         Returns:
             Optional[pd.Series]: 配当データ
         """
+        return self.get_statement(STATEMENT_DIVIDENDS, None, "配当データ")
+
+    @property
+    def upstream_call_count(self) -> int:
+        """
+        上流（データ取得元）への呼び出し回数の合計
+        Returns:
+            int: 呼び出し回数
+        """
+        with self._lock:
+            return sum(self.upstream_calls.values())
+
+    @property
+    def statements_expire_at(self) -> Optional[float]:
+        """
+        読み込んだ財務諸表の有効期限（処理結果をこの時刻まで再利用できる）
+        Returns:
+            Optional[float]: 最も早いキャッシュの有効期限（UNIX時刻。キャッシュを使わない場合はNone）
+        """
+        with self._lock:
+            return self._statements_expire_at
+
+    @property
+    def statements_changed(self) -> bool:
+        """
+        有効期限切れのキャッシュと照合した結果、財務諸表が変わっていたか
+        Returns:
+            bool: 新しい期・修正された期があった場合True（照合していない場合はFalse）
+        """
+        with self._lock:
+            return self._statements_changed
+
+    @traced()
+    def get_next_earnings_date(self) -> Optional[pd.Timestamp]:
+        """
+        次回決算日を取得
+        Returns:
+            Optional[pd.Timestamp]: 次回決算日（取得できない場合はNone）
+        """
+        with self._earnings_date_lock:
+            if self._next_earnings_date_loaded:
+                return self._next_earnings_date
+            self._next_earnings_date_loaded = True
+            with self._lock:
+                self.upstream_calls["calendar"] += 1
+            labels = {"backend": self.backend.name, "statement": "calendar", "period": "None"}
+            UPSTREAM_REQUESTS.inc(**labels)
+
+            try:
+                with UPSTREAM_LATENCY.time(backend=self.backend.name, statement="calendar"):
+                    calendar = self.scheduler.call(self.backend.get_calendar, self.ticker)
+                if not isinstance(calendar, dict):
+                    return None
+
+                today = pd.Timestamp.now().normalize()
+                dates = [pd.Timestamp(date) for date in calendar.get(YF_EARNINGS_DATE, [])]
+                upcoming = [date for date in dates if date >= today]
+                if upcoming:
+                    self._next_earnings_date = min(upcoming)
+            except Exception as e:
+                UPSTREAM_ERRORS.inc(**labels)
+                log_event("earnings_date_failed", f"決算日の取得に失敗しました: {str(e)}", ticker=self.ticker)
+
+            return self._next_earnings_date
+
+    def _get_income_row(self, row: str, period: str, label: str) -> Optional[pd.Series]:
+        """
+        損益計算書から指定項目を切り出す
+        Args:
+            row (str): 損益計算書の項目名（yfinance）
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            label (str): メッセージ表示用の名称
+        Returns:
+            Optional[pd.Series]: 指定項目の時系列
+        """
+        return extract_row(self.get_income_statement(period), row, label, self.ticker)
+
+    def get_statement(
+        self,
+        statement: str,
+        period: Optional[str],
+        label: str
+    ) -> Optional[Union[pd.DataFrame, pd.Series]]:
+        """
+        財務諸表を種類・期間を指定して取得し、空の場合や失敗時はNoneを返す
+        Args:
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+            label (str): メッセージ表示用の名称
+        Returns:
+            Optional[Union[pd.DataFrame, pd.Series]]: 財務諸表
+        """
         try:
-            dividends = self.stock.dividends
-            if dividends.empty:
-                print(f"配当データが取得できませんでした: {self.ticker}")
+            data = self._load(statement, period)
+            if data.empty:
+                log_event("statement_empty", f"{label}が取得できませんでした: {self.ticker}",
+                          ticker=self.ticker, statement=statement, period=period)
                 return None
-            return dividends
+            return data
         except Exception as e:
-            print(f"配当データの取得に失敗しました: {str(e)}")
+            log_event("statement_fetch_failed", f"{label}の取得に失敗しました: {str(e)}",
+                      level=logging.ERROR, ticker=self.ticker, statement=statement, period=period)
             return None
+
+    def _load(self, statement: str, period: Optional[str]) -> Union[pd.DataFrame, pd.Series]:
+        """
+        財務諸表を読み込む（インスタンス内で取得済みの場合はそれを返す）
+        Args:
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表
+        """
+        key = (statement, period)
+        with self._lock:
+            statement_lock = self._statement_locks.setdefault(key, threading.Lock())
+
+        # 同じ諸表を並行して要求された場合も取得は1回に限る
+        with statement_lock:
+            if key not in self._statements:
+                self._statements[key] = self._fetch(statement, period)
+            return self._statements[key]
+
+    def _fetch(self, statement: str, period: Optional[str]) -> Union[pd.DataFrame, pd.Series]:
+        """
+        財務諸表をキャッシュまたはデータ取得元から読み込む
+        Args:
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Union[pd.DataFrame, pd.Series]: 財務諸表
+        """
+        entry = None
+        if self.cache is not None:
+            entry = self.cache.get_entry(self.ticker, statement, period)
+            if entry is not None and self.cache.is_fresh(entry):
+                STATEMENT_CACHE_LOOKUPS.inc(result="hit")
+                self._track_expiry(entry)
+                return entry["data"]
+            if entry is None or entry["data"].empty:
+                STATEMENT_CACHE_LOOKUPS.inc(result="miss")
+
+        # 同じ諸表を他のセッションが取得中の場合は、その結果を待って共有する
+        key = (self.backend.name, self.ticker.upper(), statement, period)
+        # 有効期限は取得を共有したインスタンスでもそれぞれ記録する
+        data, saved, changed = self.single_flight.do(key, self._fetch_upstream, statement, period, entry)
+        if saved is not None and self.cache is not None:
+            self._track_expiry(saved)
+        if changed:
+            with self._lock:
+                self._statements_changed = True
+        return data
+
+    def _fetch_upstream(
+        self,
+        statement: str,
+        period: Optional[str],
+        entry: Optional[Dict]
+    ) -> Tuple[Union[pd.DataFrame, pd.Series], Optional[Dict], bool]:
+        """
+        財務諸表をデータ取得元から取得し、キャッシュに保存する
+        Args:
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+            entry (Optional[Dict]): 有効期限切れのキャッシュエントリ（取得結果と照合・統合する）
+        Returns:
+            Tuple[Union[pd.DataFrame, pd.Series], Optional[Dict], bool]:
+                財務諸表、保存したキャッシュエントリ（保存しない場合はNone）、
+                キャッシュ済みの財務諸表と照合して変わっていたか
+        """
+        with self._lock:
+            self.upstream_calls[f"{statement}:{period}"] += 1
+        labels = {"backend": self.backend.name, "statement": statement, "period": str(period)}
+        UPSTREAM_REQUESTS.inc(**labels)
+        try:
+            with UPSTREAM_LATENCY.time(backend=self.backend.name, statement=statement), \
+                    span("DataFetcher.upstream", ticker=self.ticker, **labels):
+                data = self.scheduler.call(self.backend.get_statement, self.ticker, statement, period)
+        except Exception:
+            UPSTREAM_ERRORS.inc(**labels)
+            raise
+
+        changed = False
+        saved = None
+        if self.cache is not None and not data.empty:
+            if entry is not None and not entry["data"].empty:
+                # 有効期限切れのエントリは取得した財務諸表と照合し、変わっていなければ再検証済みとする
+                # キャッシュは常に取得した財務諸表で置き換え、取得範囲外の過去の期は残さない
+                changed = not is_unchanged(entry["data"], data)
+                STATEMENT_CACHE_LOOKUPS.inc(result="miss" if changed else "revalidated")
+            saved = self.cache.set(self.ticker, statement, period, data, self.get_next_earnings_date())
+        return data, saved, changed
+
+    def _track_expiry(self, entry: Dict) -> None:
+        """
+        読み込んだ財務諸表のキャッシュの有効期限を記録（最も早いものを残す）
+        Args:
+            entry (Dict): キャッシュエントリ
+        """
+        expires_at = self.cache.expires_at(entry)
+        with self._lock:
+            if self._statements_expire_at is None or expires_at < self._statements_expire_at:
+                self._statements_expire_at = expires_at
@@ -1,109 +1,463 @@
 """財務データ処理モジュール"""
-from typing import Dict, List, Optional, Union
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import time
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from data.async_data_fetcher import AsyncDataFetcher
 from data.data_fetcher import DataFetcher
-from utils.models import FinancialDataModel
+from data.metrics import DEFAULT_REGISTRY, MetricRegistry
+from data.statement_cache import StatementCache
+from data.statement_synthesis import synthesize_annual_bundle
+from utils.models import FinancialDataModel, StatementBundle
+from utils.telemetry import get_registry, log_event
+from utils.tracing import bind, traced
 from utils.constants import (
-    PERIOD_QUARTERLY, PERIOD_ANNUAL,
+    PERIOD_QUARTERLY, PERIOD_ANNUAL, FETCH_TIMEOUT_SECONDS, BATCH_MAX_WORKERS,
     YF_REVENUE, YF_OPERATING_INCOME, YF_NET_INCOME, YF_OPERATING_CASH_FLOW,
     YF_STOCKHOLDER_EQUITY, YF_TOTAL_ASSETS, YF_TOTAL_LIABILITIES,
-    YF_TOTAL_DEBT, YF_TAX_RATE
+    YF_TOTAL_DEBT, YF_TAX_RATE,
+    KEY_REVENUE, KEY_OPERATING_INCOME, KEY_NET_INCOME, KEY_OPERATING_CASH_FLOW,
+    KEY_SHARES, KEY_DPS, KEY_TAX_RATE, KEY_TOTAL_DEBT, KEY_STOCKHOLDER_EQUITY
+)
+
+
+# 元データのうちFinancialDataModelに格納する項目（属性名と列名）
+BASE_FIELDS = {
+    "revenue": KEY_REVENUE,
+    "operating_income": KEY_OPERATING_INCOME,
+    "net_income": KEY_NET_INCOME,
+    "operating_cash_flow": KEY_OPERATING_CASH_FLOW,
+    "shares": KEY_SHARES,
+    "dps": KEY_DPS,
+    "tax_rate": KEY_TAX_RATE,
+    "total_debt": KEY_TOTAL_DEBT,
+    "stockholder_equity": KEY_STOCKHOLDER_EQUITY,
+}
+
+# 1銘柄あたりの処理時間（取得を含む）の監視用メトリクス
+PROCESSING_SECONDS = get_registry().histogram(
+    "processing_seconds", "1銘柄の財務データの取得・処理時間", ("operation",)
 )
 
 
 class DataProcessor:
     """財務データ処理クラス"""
 
-    def __init__(self, data_fetcher: DataFetcher):
+    def __init__(self, data_fetcher: DataFetcher, registry: MetricRegistry = DEFAULT_REGISTRY):
         """
         初期化
         Args:
             data_fetcher (DataFetcher): データ取得クラスのインスタンス
+            registry (MetricRegistry): 計算する派生指標のレジストリ
         """
         self.data_fetcher = data_fetcher
+        self.registry = registry
+        # イベントの記録用（記録処理自体が例外を出さないよう、取得できない場合はNone）
+        self.ticker = getattr(data_fetcher, "ticker", None)
 
-    def process_financial_data(self, period: str = PERIOD_QUARTERLY) -> Optional[FinancialDataModel]:
+    @traced()
+    def process_financial_data(
+        self,
+        period: str = PERIOD_QUARTERLY,
+        previous: Optional[FinancialDataModel] = None
+    ) -> Optional[FinancialDataModel]:
         """
         財務データを処理
         Args:
             period (str): "quarterly"（四半期）または"annual"（年次）
+            previous (Optional[FinancialDataModel]): 前回の処理結果（元データが変わった期のみ再計算する）
         Returns:
             Optional[FinancialDataModel]: 処理済み財務データモデル
         """
         try:
-            # 財務諸表の取得
-            income = self.data_fetcher.get_income_statement(period)
-            balance = self.data_fetcher.get_balance_sheet(period)
-            cash = self.data_fetcher.get_cash_flow(period)
-            shares = self.data_fetcher.get_shares_outstanding(period)
-
-            # データの検証
-            if income is None or balance is None or cash is None or shares is None:
-                print("財務データが不完全です")
-                return None
+            with PROCESSING_SECONDS.time(operation="process_financial_data"):
+                # 財務諸表の取得（並列）
+                bundle = self.fetch_statements(period)
+                return self._build_model(bundle, period, previous)
+
+        except Exception as e:
+            self._log_failure(e, period)
+            return None
+
+    async def process_financial_data_async(
+        self,
+        period: str = PERIOD_QUARTERLY,
+        previous: Optional[FinancialDataModel] = None
+    ) -> Optional[FinancialDataModel]:
+        """
+        財務データを非同期に処理
+        同じ銘柄を処理中の他のセッションとは取得を共有する
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            previous (Optional[FinancialDataModel]): 前回の処理結果（元データが変わった期のみ再計算する）
+        Returns:
+            Optional[FinancialDataModel]: 処理済み財務データモデル
+        """
+        try:
+            with PROCESSING_SECONDS.time(operation="process_financial_data_async"):
+                bundle = await self.fetch_statements_async(period)
+                return self._build_model(bundle, period, previous)
+
+        except Exception as e:
+            self._log_failure(e, period)
+            return None
+
+    @traced()
+    def process_all_periods(
+        self,
+        previous: Optional[Dict[str, Optional[FinancialDataModel]]] = None
+    ) -> Dict[str, Optional[FinancialDataModel]]:
+        """
+        四半期・年次の財務データを一度の取得でまとめて処理
+        年次データが不完全な場合は、直近から4四半期ずつ集計した値で代替する
+        Args:
+            previous (Optional[Dict[str, Optional[FinancialDataModel]]]): 期間ごとの前回の処理結果
+        Returns:
+            Dict[str, Optional[FinancialDataModel]]: 期間ごとの処理済み財務データモデル
+        """
+        with PROCESSING_SECONDS.time(operation="process_all_periods"):
+            bundles = self.fetch_all_statements((PERIOD_QUARTERLY, PERIOD_ANNUAL))
+
+            if not bundles[PERIOD_ANNUAL].is_complete() and bundles[PERIOD_QUARTERLY].is_complete():
+                log_event(
+                    "annual_synthesized",
+                    f"年次データが不完全なため、四半期データから算出します: {self.ticker}",
+                    level=logging.INFO, ticker=self.ticker
+                )
+                bundles[PERIOD_ANNUAL] = synthesize_annual_bundle(bundles[PERIOD_QUARTERLY])
+
+            results = {}
+            for period, bundle in bundles.items():
+                try:
+                    results[period] = self._build_model(bundle, period, (previous or {}).get(period))
+                except Exception as e:
+                    self._log_failure(e, period)
+                    results[period] = None
+            return results
+
+    @staticmethod
+    def process_many(
+        tickers: Iterable[str],
+        period: str = PERIOD_QUARTERLY,
+        max_workers: int = BATCH_MAX_WORKERS,
+        cache: Optional[StatementCache] = None
+    ) -> Iterator[Tuple[str, Optional[FinancialDataModel]]]:
+        """
+        複数銘柄の財務データを並列に処理し、完了した順に返す
+        Args:
+            tickers (Iterable[str]): 銘柄コードの一覧
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            max_workers (int): 同時に処理する銘柄数の上限
+            cache (Optional[StatementCache]): 財務諸表キャッシュ
+        Yields:
+            Tuple[str, Optional[FinancialDataModel]]: 銘柄コードと処理結果（失敗時はNone）
+        """
+        tickers = list(dict.fromkeys(tickers))
+        started = time.monotonic()
+        succeeded = 0
 
-            # 必要なデータを抽出
-            data = {
-                "売上高": income.loc[YF_REVENUE] if YF_REVENUE in income.index else None,
-                "営業利益": income.loc[YF_OPERATING_INCOME] if YF_OPERATING_INCOME in income.index else None,
-                "純利益": income.loc[YF_NET_INCOME] if YF_NET_INCOME in income.index else None,
-                "営業キャッシュフロー": cash.loc[YF_OPERATING_CASH_FLOW] if YF_OPERATING_CASH_FLOW in cash.index else None,
-                "実効税率": income.loc[YF_TAX_RATE] if YF_TAX_RATE in income.index else None,
-                "有利子負債": balance.loc[YF_TOTAL_DEBT] if YF_TOTAL_DEBT in balance.index else None,
-                "株主資本": balance.loc[YF_STOCKHOLDER_EQUITY] if YF_STOCKHOLDER_EQUITY in balance.index else None,
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(bind(DataProcessor._process_ticker), ticker, period, cache): ticker
+                for ticker in tickers
             }
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    succeeded += 1
+                yield futures[future], result
+        finally:
+            # 途中で反復を打ち切った場合は未着手の銘柄を破棄する
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            # Noneの値をチェック
-            if any(v is None for v in data.values()):
-                missing_items = [k for k, v in data.items() if v is None]
-                print(f"以下の項目が取得できませんでした: {', '.join(missing_items)}")
-                return None
+            elapsed = time.monotonic() - started
+            rate = len(tickers) / elapsed if elapsed > 0 else 0.0
+            log_event(
+                "batch_completed",
+                f"{len(tickers)}銘柄を{elapsed:.1f}秒で処理しました（成功: {succeeded}、{rate:.1f}銘柄/秒）",
+                level=logging.INFO, tickers=len(tickers), succeeded=succeeded, seconds=round(elapsed, 3)
+            )
+
+    @staticmethod
+    def _process_ticker(
+        ticker: str,
+        period: str,
+        cache: Optional[StatementCache]
+    ) -> Optional[FinancialDataModel]:
+        """
+        1銘柄の財務データを処理（例外は他の銘柄に波及させない）
+        Args:
+            ticker (str): 銘柄コード
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            cache (Optional[StatementCache]): 財務諸表キャッシュ
+        Returns:
+            Optional[FinancialDataModel]: 処理済み財務データモデル
+        """
+        try:
+            return DataProcessor(DataFetcher(ticker, cache=cache)).process_financial_data(period)
+        except Exception as e:
+            log_event("ticker_failed", f"{ticker}の処理に失敗しました: {str(e)}", level=logging.ERROR, ticker=ticker)
+            return None
 
-            # 株式数の設定
-            data["発行済株式数"] = shares
-
-            # データフレームに変換
-            df = pd.DataFrame(data)
-
-            # 一株あたり指標の計算
-            df["EPS"] = df["純利益"] / df["発行済株式数"]
-            df["営業利益率"] = df["営業利益"] / df["売上高"] * 100
-            df["1株あたり営業CF"] = df["営業キャッシュフロー"] / df["発行済株式数"]
-
-            # ROICの計算
-            # NOPAT = 営業利益 × (1 - 実効税率)
-            # 投下資本 = 有利子負債 + 株主資本
-            df["NOPAT"] = df["営業利益"] * (1 - df["実効税率"])
-            df["投下資本"] = df["有利子負債"] + df["株主資本"]
-            df["ROIC"] = df.apply(lambda row: (row["NOPAT"] / row["投下資本"]) * 100 if row["投下資本"] != 0 else None, axis=1)
-            # BPSの計算（純資産 / 発行済株式数）
-            stockholder_equity = balance.loc[YF_STOCKHOLDER_EQUITY] if YF_STOCKHOLDER_EQUITY in balance.index else None
-            if stockholder_equity is not None:
-                df["BPS"] = stockholder_equity / df["発行済株式数"]
+    def fetch_statements(
+        self,
+        period: str = PERIOD_QUARTERLY,
+        timeout: float = FETCH_TIMEOUT_SECONDS
+    ) -> StatementBundle:
+        """
+        財務諸表一式を並列に取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            timeout (float): 各リクエストのタイムアウト（秒）
+        Returns:
+            StatementBundle: 財務諸表一式（取得できなかった項目はNone）
+        """
+        return self.fetch_all_statements((period,), timeout)[period]
+
+    @traced()
+    def fetch_all_statements(
+        self,
+        periods: Tuple[str, ...] = (PERIOD_QUARTERLY, PERIOD_ANNUAL),
+        timeout: float = FETCH_TIMEOUT_SECONDS
+    ) -> Dict[str, StatementBundle]:
+        """
+        複数期間の財務諸表一式を一度に並列取得
+        Args:
+            periods (Tuple[str, ...]): 取得する期間の一覧
+            timeout (float): 各リクエストのタイムアウト（秒）
+        Returns:
+            Dict[str, StatementBundle]: 期間ごとの財務諸表一式（取得できなかった項目はNone）
+        """
+        requests = {}
+        for period in periods:
+            requests[(period, "income")] = (self.data_fetcher.get_income_statement, (period,))
+            requests[(period, "balance")] = (self.data_fetcher.get_balance_sheet, (period,))
+            requests[(period, "cash_flow")] = (self.data_fetcher.get_cash_flow, (period,))
+            requests[(period, "shares")] = (self.data_fetcher.get_shares_outstanding, (period,))
+        # 配当データは期間によらないため1回だけ取得する
+        requests[(None, "dividends")] = (self.data_fetcher.get_dividends, ())
+
+        executor = ThreadPoolExecutor(max_workers=len(requests))
+        try:
+            futures = {
+                key: executor.submit(bind(getter), *args)
+                for key, (getter, args) in requests.items()
+            }
+
+            # 全リクエストを同時に開始しているため、共通の期限で待機する
+            deadline = time.monotonic() + timeout
+            results = {}
+            for (period, name), future in futures.items():
+                try:
+                    results[(period, name)] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except TimeoutError:
+                    self._log_fetch_timeout(name, period)
+                    results[(period, name)] = None
+                except Exception as e:
+                    self._log_fetch_failure(name, period, e)
+                    results[(period, name)] = None
+        finally:
+            # タイムアウトしたリクエストの完了は待たない
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        dividends = results[(None, "dividends")]
+        return {
+            period: StatementBundle(
+                income=results[(period, "income")],
+                balance=results[(period, "balance")],
+                cash_flow=results[(period, "cash_flow")],
+                shares=results[(period, "shares")],
+                dividends=dividends
+            )
+            for period in periods
+        }
+
+    async def fetch_statements_async(
+        self,
+        period: str = PERIOD_QUARTERLY,
+        timeout: float = FETCH_TIMEOUT_SECONDS
+    ) -> StatementBundle:
+        """
+        財務諸表一式を非同期に取得
+        Args:
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            timeout (float): 全リクエスト共通のタイムアウト（秒）
+        Returns:
+            StatementBundle: 財務諸表一式（取得できなかった項目はNone）
+        Raises:
+            ValueError: 取得クラスに銘柄コードが設定されていない場合
+        """
+        fetcher = AsyncDataFetcher(self.ticker, fetcher=self.data_fetcher)
+        tasks = {
+            "income": asyncio.ensure_future(fetcher.get_income_statement(period)),
+            "balance": asyncio.ensure_future(fetcher.get_balance_sheet(period)),
+            "cash_flow": asyncio.ensure_future(fetcher.get_cash_flow(period)),
+            "shares": asyncio.ensure_future(fetcher.get_shares_outstanding(period)),
+            "dividends": asyncio.ensure_future(fetcher.get_dividends()),
+        }
+        done, _ = await asyncio.wait(tasks.values(), timeout=timeout)
+
+        results = {}
+        for name, task in tasks.items():
+            if task not in done:
+                # 取得自体は他の呼び出しと共有しているため、待機のみ打ち切る
+                task.cancel()
+                self._log_fetch_timeout(name, period)
+                results[name] = None
+            elif task.exception() is not None:
+                self._log_fetch_failure(name, period, task.exception())
+                results[name] = None
             else:
-                # 代替計算：（総資産 - 総負債）/ 発行済株式数
-                total_assets = balance.loc[YF_TOTAL_ASSETS] if YF_TOTAL_ASSETS in balance.index else None
-                total_liabilities = balance.loc[YF_TOTAL_LIABILITIES] if YF_TOTAL_LIABILITIES in balance.index else None
+                results[name] = task.result()
+        return StatementBundle(**results)
 
-                if total_assets is not None and total_liabilities is not None:
-                    df["BPS"] = (total_assets - total_liabilities) / df["発行済株式数"]
-                else:
-                    print("BPSの計算に必要なデータが取得できません")
-                    return None
+    @traced()
+    def _build_model(
+        self,
+        bundle: StatementBundle,
+        period: str,
+        previous: Optional[FinancialDataModel] = None
+    ) -> Optional[FinancialDataModel]:
+        """
+        取得済みの財務諸表一式から財務データモデルを作成
+        Args:
+            bundle (StatementBundle): 財務諸表一式
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            previous (Optional[FinancialDataModel]): 前回の処理結果（元データが変わった期のみ再計算する）
+        Returns:
+            Optional[FinancialDataModel]: 処理済み財務データモデル
+        """
+        df = self._build_base_frame(bundle, period)
+        if df is None:
+            return None
 
-            # 正規化データの作成
-            normalized_data = self._normalize_data(df)
+        # 派生指標の計算
+        if previous is not None:
+            df = self._compute_metrics_incremental(df, previous)
+        else:
+            df = self._compute_metrics(df)
 
-            # 配当データの処理
-            normalized_data = self._process_dividends(normalized_data, period)
+        # 正規化データの作成
+        normalized_data = self._normalize_data(df)
 
-            return FinancialDataModel(normalized_data)
+        return FinancialDataModel(normalized_data)
 
-        except Exception as e:
-            print(f"財務データの処理中にエラーが発生しました: {str(e)}")
+    @traced()
+    def _build_base_frame(self, bundle: StatementBundle, period: str) -> Optional[pd.DataFrame]:
+        """
+        財務諸表一式から派生指標の計算に使う元データのデータフレームを作成
+        Args:
+            bundle (StatementBundle): 財務諸表一式
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[pd.DataFrame]: 元データのデータフレーム（必要な項目が揃わない場合はNone）
+        """
+        # データの検証
+        if not bundle.is_complete():
+            log_event("incomplete_data", f"財務データが不完全です: {self.ticker}",
+                      ticker=self.ticker, period=period)
+            return None
+
+        income = bundle.income
+        balance = bundle.balance
+        cash = bundle.cash_flow
+        shares = bundle.shares
+
+        # 必要なデータを抽出
+        data = {
+            KEY_REVENUE: income.loc[YF_REVENUE] if YF_REVENUE in income.index else None,
+            KEY_OPERATING_INCOME: income.loc[YF_OPERATING_INCOME] if YF_OPERATING_INCOME in income.index else None,
+            KEY_NET_INCOME: income.loc[YF_NET_INCOME] if YF_NET_INCOME in income.index else None,
+            KEY_OPERATING_CASH_FLOW: cash.loc[YF_OPERATING_CASH_FLOW] if YF_OPERATING_CASH_FLOW in cash.index else None,
+            KEY_TAX_RATE: income.loc[YF_TAX_RATE] if YF_TAX_RATE in income.index else None,
+            KEY_TOTAL_DEBT: balance.loc[YF_TOTAL_DEBT] if YF_TOTAL_DEBT in balance.index else None,
+            KEY_STOCKHOLDER_EQUITY: balance.loc[YF_STOCKHOLDER_EQUITY] if YF_STOCKHOLDER_EQUITY in balance.index else None,
+        }
+
+        # Noneの値をチェック
+        if any(v is None for v in data.values()):
+            missing_items = [k for k, v in data.items() if v is None]
+            log_event("missing_items", f"以下の項目が取得できませんでした: {', '.join(missing_items)}",
+                      ticker=self.ticker, period=period, items=missing_items)
             return None
 
+        # 株式数の設定
+        data[KEY_SHARES] = shares
+
+        # データフレームに変換（数値型に統一）
+        df = pd.DataFrame(data).astype("float64")
+
+        # 配当データの集計（配当性向の計算に使うため、指標の計算より先に行う）
+        dps = self._dividends_per_period(
+            bundle.dividends, pd.to_datetime(df.index).tz_localize(None), period
+        )
+        if dps is not None:
+            df[KEY_DPS] = dps.to_numpy()
+
+        return df
+
+    @traced()
+    def _compute_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        登録済みの派生指標をデータセットごとに1回ずつ列単位で計算
+        分母が0または欠損の場合、その期の指標はNaNとする
+        Args:
+            df (pd.DataFrame): 財務データフレーム（元データの列を含む）
+        Returns:
+            pd.DataFrame: 派生指標の列を追加した財務データフレーム
+        """
+        return self.registry.compute(df)
+
+    @traced()
+    def _compute_metrics_incremental(
+        self,
+        df: pd.DataFrame,
+        previous: FinancialDataModel
+    ) -> pd.DataFrame:
+        """
+        元データが前回から変わった期（新しい期・修正された期）のみ派生指標を計算し、
+        それ以外の期は前回の計算結果を引き継ぐ
+        派生指標は期ごとに独立して計算できる（他の期の値を参照しない）ことを前提とする
+        Args:
+            df (pd.DataFrame): 財務データフレーム（元データの列を含む）
+            previous (FinancialDataModel): 前回の処理結果
+        Returns:
+            pd.DataFrame: 派生指標の列を追加した財務データフレーム
+        """
+        dates = pd.to_datetime(df.index).tz_localize(None)
+        inputs = {field: column for field, column in BASE_FIELDS.items() if column in df.columns}
+        outputs = {
+            metric.field: metric.name
+            for metric in self.registry.resolve_order(df.columns) if metric.field
+        }
+
+        # 前回の結果に元データや指標が欠けている場合は比較できないため全期を計算する
+        if any(previous.column(field) is None for field in {**inputs, **outputs}):
+            return self._compute_metrics(df)
+
+        def aligned(field: str) -> np.ndarray:
+            return pd.Series(previous.column(field), index=previous.dates).reindex(dates).to_numpy()
+
+        affected = ~dates.isin(previous.dates)
+        for field, column in inputs.items():
+            current, before = df[column].to_numpy(dtype="float64"), aligned(field)
+            affected |= (current != before) & ~(np.isnan(current) & np.isnan(before))
+
+        affected = np.asarray(affected)
+        computed = self._compute_metrics(df[affected].copy()) if affected.any() else None
+        for field, column in outputs.items():
+            values = aligned(field)
+            if computed is not None:
+                values[affected] = computed[column].to_numpy()
+            df[column] = values
+        return df
+
+    @traced()
     def _normalize_data(self, df: pd.DataFrame) -> Dict:
         """
         データを正規化
@@ -119,40 +473,37 @@ class DataProcessor:
         df = df.sort_index(ascending=True)
         dates = dates.sort_values()
 
-        # データを正規化
-        normalized_data = {
-            "dates": dates,
-            "revenue": df["売上高"].values,
-            "operating_income": df["営業利益"].values,
-            "net_income": df["純利益"].values,
-            "operating_cash_flow": df["営業キャッシュフロー"].values,
-            "shares": df["発行済株式数"].values,
-            "eps": df["EPS"].values,
-            "bps": df["BPS"].values,
-            "operating_margin": df["営業利益率"].values,
-            "operating_cash_flow_per_share": df["1株あたり営業CF"].values,
-            "roic": df["ROIC"].values
-        }
+        # データを正規化（計算できなかった指標は含めない）
+        columns = {**BASE_FIELDS, **self.registry.fields()}
+        normalized_data = {"dates": dates}
+        for field, column in columns.items():
+            if column in df.columns:
+                normalized_data[field] = df[column].values
 
         return normalized_data
 
-    def _process_dividends(self, normalized_data: Dict, period: str) -> Dict:
+    def _dividends_per_period(
+        self,
+        dividends: Optional[pd.Series],
+        dates: pd.DatetimeIndex,
+        period: str
+    ) -> Optional[pd.Series]:
         """
-        配当データを処理
+        配当データを期間ごとに集計し、財務データの日付に合わせる
         Args:
-            normalized_data (Dict): 正規化されたデータ
+            dividends (Optional[pd.Series]): 配当データ
+            dates (pd.DatetimeIndex): 財務データの日付
             period (str): "quarterly"（四半期）または"annual"（年次）
         Returns:
-            Dict: 配当データを含む正規化されたデータ
+            Optional[pd.Series]: 財務データの日付ごとの1株あたり配当（配当がない場合はNone）
         """
         try:
-            # 配当データを取得
-            dividends = self.data_fetcher.get_dividends()
             if dividends is None:
-                return normalized_data
+                return None
 
-            # 配当データのタイムゾーンを統一
-            dividends.index = dividends.index.tz_localize(None)
+            # 配当データのタイムゾーンを統一（取得元のデータは変更しない）
+            dividends = dividends.copy()
+            dividends.index = pd.DatetimeIndex(dividends.index).tz_localize(None)
             
             # 期間に応じて配当データを集計
             if period == PERIOD_QUARTERLY:
@@ -161,14 +512,40 @@ class DataProcessor:
                 dps = dividends.resample("YE").sum()
                 
             # インデックスを財務データに合わせる
-            dps = dps.reindex(normalized_data["dates"], method="ffill")
-            
-            # 配当データを追加
-            if not dps.empty:
-                normalized_data["dps"] = dps.values
-                
-            return normalized_data
+            return dps.reindex(dates, method="ffill")
             
         except Exception as e:
-            print(f"配当データの処理中にエラーが発生しました: {str(e)}")
-            return normalized_data
+            log_event("dividend_processing_failed", f"配当データの処理中にエラーが発生しました: {str(e)}",
+                      level=logging.ERROR, ticker=self.ticker, period=period)
+            return None
+
+    def _log_failure(self, error: Exception, period: str) -> None:
+        """
+        財務データの処理の失敗を記録
+        Args:
+            error (Exception): 発生した例外
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        """
+        log_event("processing_failed", f"財務データの処理中にエラーが発生しました: {str(error)}",
+                  level=logging.ERROR, ticker=self.ticker, period=period)
+
+    def _log_fetch_timeout(self, name: str, period: Optional[str]) -> None:
+        """
+        財務諸表の取得のタイムアウトを記録
+        Args:
+            name (str): 財務諸表の名前
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+        """
+        log_event("fetch_timeout", f"{name}の取得がタイムアウトしました: {self.ticker}",
+                  ticker=self.ticker, statement=name, period=period)
+
+    def _log_fetch_failure(self, name: str, period: Optional[str], error: BaseException) -> None:
+        """
+        財務諸表の取得の失敗を記録
+        Args:
+            name (str): 財務諸表の名前
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+            error (BaseException): 発生した例外
+        """
+        log_event("fetch_failed", f"{name}の取得に失敗しました: {str(error)}",
+                  level=logging.ERROR, ticker=self.ticker, statement=name, period=period)
@@ -0,0 +1,29 @@
+"""処理済みデータのバージョンモジュール
+
+処理結果のキャッシュ・事前計算ストア・チャートキャッシュは、このバージョンが一致する結果のみ再利用する。
+バージョンは手動で更新する処理ロジックのバージョン（DATA_PROCESSING_VERSION）と、
+派生指標の定義（列名・入力・属性名・計算式の名前）から求める。
+ソースコードの文面やバイトコードは含めないため、コメントの修正やPythonの更新ではバージョンは変わらない。
+"""
+import hashlib
+from utils.constants import DATA_PROCESSING_VERSION
+from data.metrics import DEFAULT_REGISTRY, MetricRegistry
+
+
+def compute_data_version(registry: MetricRegistry = DEFAULT_REGISTRY) -> str:
+    """
+    処理ロジックのバージョンと派生指標の定義からバージョンを求める
+    計算式の中身（lambdaの本体など）の変更は検出しないため、DATA_PROCESSING_VERSION を更新する
+    Args:
+        registry (MetricRegistry): 派生指標のレジストリ（他のモジュールで追加登録した指標も含める）
+    Returns:
+        str: バージョン（"処理ロジックのバージョン-指標定義のハッシュ"）
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for metric in registry.metrics:
+        formula = f"{getattr(metric.formula, '__module__', '')}.{getattr(metric.formula, '__qualname__', '')}"
+        digest.update(repr((metric.name, list(metric.inputs), metric.field, formula)).encode())
+    return f"{DATA_PROCESSING_VERSION}-{digest.hexdigest()}"
+
+
+DATA_VERSION = compute_data_version()
@@ -0,0 +1,215 @@
+"""派生指標の登録・計算モジュール"""
+from typing import Callable, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from utils.constants import (
+    KEY_REVENUE, KEY_OPERATING_INCOME, KEY_NET_INCOME, KEY_OPERATING_CASH_FLOW,
+    KEY_SHARES, KEY_EPS, KEY_BPS, KEY_OPERATING_MARGIN, KEY_OPERATING_CASH_FLOW_PER_SHARE,
+    KEY_DPS, KEY_ROIC, KEY_TAX_RATE, KEY_TOTAL_DEBT, KEY_STOCKHOLDER_EQUITY,
+    KEY_NOPAT, KEY_INVESTED_CAPITAL, KEY_PAYOUT_RATIO, KEY_OPERATING_CASH_FLOW_MARGIN
+)
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    配列同士の割り算（分母が0または欠損の要素はNaN）
+    Args:
+        numerator (np.ndarray): 分子
+        denominator (np.ndarray): 分母
+    Returns:
+        np.ndarray: 商
+    """
+    result = np.full(np.shape(denominator), np.nan)
+    valid = np.isfinite(denominator) & (denominator != 0)
+    np.divide(numerator, denominator, out=result, where=valid)
+    return result
+
+
+def payout_ratio(dps: np.ndarray, eps: np.ndarray) -> np.ndarray:
+    """
+    配当性向（DPS / EPS × 100）を計算
+    EPSが0の期は従来の配当チャートと同じく0とする（EPSが欠損の期はNaN）
+    Args:
+        dps (np.ndarray): 1株あたり配当
+        eps (np.ndarray): 1株あたり利益
+    Returns:
+        np.ndarray: 配当性向（%）
+    """
+    return np.where(eps == 0, 0.0, safe_divide(dps, eps) * 100)
+
+
+class Metric:
+    """派生指標の定義"""
+    name: str
+    inputs: List[str]
+    formula: Callable[..., np.ndarray]
+    field: Optional[str]
+
+    def __init__(
+        self,
+        name: str,
+        inputs: List[str],
+        formula: Callable[..., np.ndarray],
+        field: Optional[str] = None
+    ):
+        """
+        初期化
+        Args:
+            name (str): 指標の列名
+            inputs (List[str]): 計算に使う列名（formulaの引数の順）
+            formula (Callable[..., np.ndarray]): 入力列の配列を受け取り指標の配列を返す関数
+            field (Optional[str], optional): FinancialDataModelでの属性名. Defaults to None.
+        """
+        self.name = name
+        self.inputs = inputs
+        self.formula = formula
+        self.field = field
+
+
+class MetricRegistry:
+    """派生指標の登録クラス
+
+    各指標は入力列と列単位の計算式を宣言する。入力の依存関係から計算順序を
+    決め、データセットごとに全指標を1回ずつ計算する。
+    """
+
+    def __init__(self):
+        """初期化"""
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        指標を登録（同名の指標は上書き）
+        Args:
+            metric (Metric): 指標の定義
+        Returns:
+            Metric: 登録した指標
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    @property
+    def metrics(self) -> List[Metric]:
+        """
+        登録済みの指標（登録順）
+        Returns:
+            List[Metric]: 指標の一覧
+        """
+        return list(self._metrics.values())
+
+    def resolve_order(self, available: Iterable[str]) -> List[Metric]:
+        """
+        依存関係に従って計算可能な指標を並べる
+        入力が揃わない指標（配当がない銘柄の配当性向など）は除外する
+        Args:
+            available (Iterable[str]): 元データとして利用できる列名
+        Returns:
+            List[Metric]: 計算順に並べた指標
+        Raises:
+            ValueError: 指標の依存関係が循環している場合
+        """
+        # 登録済み指標同士の依存関係で並べる（入力の有無によらない）
+        ordered: List[Metric] = []
+        state: Dict[str, str] = {}
+
+        def visit(metric: Metric) -> None:
+            if state.get(metric.name) == "done":
+                return
+            if state.get(metric.name) == "visiting":
+                raise ValueError(f"指標の依存関係が循環しています: {metric.name}")
+            state[metric.name] = "visiting"
+            for name in metric.inputs:
+                if name in self._metrics:
+                    visit(self._metrics[name])
+            state[metric.name] = "done"
+            ordered.append(metric)
+
+        for metric in self._metrics.values():
+            visit(metric)
+
+        # 元データにある列は計算せず、入力が揃う指標だけを残す
+        resolved = set(available)
+        computable = []
+        for metric in ordered:
+            if metric.name in resolved:
+                continue
+            if all(name in resolved for name in metric.inputs):
+                computable.append(metric)
+                resolved.add(metric.name)
+        return computable
+
+    def compute(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        登録済みの指標をすべて計算してデータフレームに追加
+        Args:
+            df (pd.DataFrame): 元データの列を持つ財務データフレーム
+        Returns:
+            pd.DataFrame: 指標の列を追加した財務データフレーム
+        """
+        for metric in self.resolve_order(df.columns):
+            arrays = [df[name].to_numpy(dtype="float64") for name in metric.inputs]
+            df[metric.name] = metric.formula(*arrays)
+        return df
+
+    def fields(self) -> Dict[str, str]:
+        """
+        FinancialDataModelに格納する指標の対応
+        Returns:
+            Dict[str, str]: 属性名と列名の辞書
+        """
+        return {metric.field: metric.name for metric in self._metrics.values() if metric.field}
+
+
+def create_default_registry() -> MetricRegistry:
+    """
+    標準の派生指標を登録したレジストリを作成
+    Returns:
+        MetricRegistry: 標準指標を登録したレジストリ
+    """
+    registry = MetricRegistry()
+
+    # 一株あたり指標
+    registry.register(Metric(KEY_EPS, [KEY_NET_INCOME, KEY_SHARES], safe_divide, "eps"))
+    registry.register(Metric(KEY_BPS, [KEY_STOCKHOLDER_EQUITY, KEY_SHARES], safe_divide, "bps"))
+    registry.register(Metric(
+        KEY_OPERATING_CASH_FLOW_PER_SHARE, [KEY_OPERATING_CASH_FLOW, KEY_SHARES],
+        safe_divide, "operating_cash_flow_per_share"
+    ))
+
+    # 利益率
+    registry.register(Metric(
+        KEY_OPERATING_MARGIN, [KEY_OPERATING_INCOME, KEY_REVENUE],
+        lambda income, revenue: safe_divide(income, revenue) * 100, "operating_margin"
+    ))
+    registry.register(Metric(
+        KEY_OPERATING_CASH_FLOW_MARGIN, [KEY_OPERATING_CASH_FLOW, KEY_REVENUE],
+        lambda cash_flow, revenue: safe_divide(cash_flow, revenue) * 100, "operating_cash_flow_margin"
+    ))
+
+    # ROIC
+    # NOPAT = 営業利益 × (1 - 実効税率)
+    # 投下資本 = 有利子負債 + 株主資本
+    registry.register(Metric(
+        KEY_NOPAT, [KEY_OPERATING_INCOME, KEY_TAX_RATE],
+        lambda income, tax_rate: income * (1 - tax_rate)
+    ))
+    registry.register(Metric(
+        KEY_INVESTED_CAPITAL, [KEY_TOTAL_DEBT, KEY_STOCKHOLDER_EQUITY],
+        lambda debt, equity: debt + equity
+    ))
+    registry.register(Metric(
+        KEY_ROIC, [KEY_NOPAT, KEY_INVESTED_CAPITAL],
+        lambda nopat, capital: safe_divide(nopat, capital) * 100, "roic"
+    ))
+
+    # 配当性向（DPS / EPS）
+    registry.register(Metric(
+        KEY_PAYOUT_RATIO, [KEY_DPS, KEY_EPS],
+        payout_ratio, "payout_ratio"
+    ))
+
+    return registry
+
+
+# 既定のレジストリ（新しい指標はここに登録する）
+DEFAULT_REGISTRY = create_default_registry()
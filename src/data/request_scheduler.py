@@ -0,0 +1,255 @@
+"""上流リクエスト制御モジュール"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import requests
+from yfinance.exceptions import YFRateLimitError
+from utils.constants import (
+    REQUEST_RATE_PER_SECOND, REQUEST_BURST, REQUEST_MAX_RETRIES,
+    REQUEST_BACKOFF_BASE_SECONDS, REQUEST_BACKOFF_MAX_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+)
+from utils.telemetry import get_registry
+
+# サーキットブレーカーの状態
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+# 再試行する一時的なエラー（通信エラー・タイムアウト・流量制限）
+TRANSIENT_ERRORS = (
+    ConnectionError, TimeoutError,
+    requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+    YFRateLimitError,
+)
+
+
+class CircuitOpenError(Exception):
+    """サーキットブレーカーが開いているため呼び出しを拒否したことを表す例外"""
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    再試行すれば成功しうる一時的なエラーかを判定
+    存在しない銘柄やデータの欠損など、呼び出し側・データ側のエラーは一時的とみなさない
+    Args:
+        error (BaseException): 発生した例外
+    Returns:
+        bool: 通信エラー・タイムアウト・HTTP 429/5xxの場合True
+    """
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+class RequestScheduler:
+    """上流リクエストの制御クラス
+
+    トークンバケットによる流量制限、ジッター付き指数バックオフによる再試行、
+    連続失敗時に呼び出しを遮断するサーキットブレーカーを提供する。
+    再試行とサーキットブレーカーの対象は一時的なエラー（retryable）のみとし、
+    存在しない銘柄などのエラーはそのまま呼び出し側に返す。
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = REQUEST_RATE_PER_SECOND,
+        burst: int = REQUEST_BURST,
+        max_retries: int = REQUEST_MAX_RETRIES,
+        backoff_base: float = REQUEST_BACKOFF_BASE_SECONDS,
+        backoff_max: float = REQUEST_BACKOFF_MAX_SECONDS,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_SECONDS,
+        retryable: Callable[[BaseException], bool] = is_transient_error
+    ):
+        """
+        初期化
+        Args:
+            rate_per_second (float): 1秒あたりの許容リクエスト数
+            burst (int): 瞬間的に許容するリクエスト数（バケット容量）
+            max_retries (int): 失敗時の最大再試行回数
+            backoff_base (float): バックオフの基準待機時間（秒）
+            backoff_max (float): バックオフの最大待機時間（秒）
+            failure_threshold (int): サーキットを開く連続失敗回数
+            reset_timeout (float): サーキットを開いてから試行を再開するまでの時間（秒）
+            retryable (Callable[[BaseException], bool]): 再試行・失敗として数える例外かを判定する関数
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retryable = retryable
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._circuit_state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._metrics = {
+            "requests": 0,
+            "successes": 0,
+            "failures": 0,
+            "errors": 0,
+            "retries": 0,
+            "rejected": 0,
+            "throttled_seconds": 0.0,
+        }
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        流量制限・再試行・サーキットブレーカーを適用して関数を呼び出す
+        Args:
+            func (Callable[..., Any]): 上流を呼び出す関数
+            *args: 関数の位置引数
+            **kwargs: 関数のキーワード引数
+        Returns:
+            Any: 関数の戻り値
+        Raises:
+            CircuitOpenError: サーキットブレーカーが開いている場合
+            Exception: 一時的でないエラーの場合、または再試行しても失敗した場合は最後の例外
+        """
+        for attempt in range(self.max_retries + 1):
+            self._before_request()
+            self._acquire_token()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not self.retryable(e):
+                    # 上流は応答しているため、再試行せずサーキットの判定にも数えない
+                    with self._lock:
+                        self._metrics["errors"] += 1
+                    raise
+                circuit_opened = self._record_failure()
+                if attempt >= self.max_retries or circuit_opened:
+                    raise
+                with self._lock:
+                    self._metrics["retries"] += 1
+                time.sleep(self._backoff(attempt))
+                continue
+
+            self._record_success()
+            return result
+
+    @property
+    def circuit_state(self) -> str:
+        """
+        サーキットブレーカーの状態
+        Returns:
+            str: "closed"、"open"、"half_open"のいずれか
+        """
+        with self._lock:
+            return self._circuit_state
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """
+        リクエスト統計のスナップショット
+        Returns:
+            Dict[str, float]: 項目名と値の辞書
+        """
+        with self._lock:
+            return dict(self._metrics)
+
+    def _before_request(self) -> None:
+        """
+        サーキットの状態を確認し、開いている場合は呼び出しを拒否する
+        Raises:
+            CircuitOpenError: サーキットブレーカーが開いている場合
+        """
+        with self._lock:
+            self._metrics["requests"] += 1
+            if self._circuit_state != CIRCUIT_OPEN:
+                return
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # 一定時間経過後は試行を再開し、次の結果で開閉を判断する
+                self._circuit_state = CIRCUIT_HALF_OPEN
+                return
+            self._metrics["rejected"] += 1
+        raise CircuitOpenError("上流へのリクエストが一時的に停止されています")
+
+    def _acquire_token(self) -> None:
+        """
+        トークンを1つ取得する（不足している場合は補充されるまで待機）
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.burst),
+                    self._tokens + (now - self._last_refill) * self.rate_per_second
+                )
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate_per_second
+                self._metrics["throttled_seconds"] += wait
+            time.sleep(wait)
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        再試行までの待機時間を計算（フルジッター）
+        Args:
+            attempt (int): 失敗した試行の番号（0始まり）
+        Returns:
+            float: 待機時間（秒）
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _record_success(self) -> None:
+        """
+        成功を記録し、サーキットを閉じる
+        """
+        with self._lock:
+            self._metrics["successes"] += 1
+            self._consecutive_failures = 0
+            self._circuit_state = CIRCUIT_CLOSED
+
+    def _record_failure(self) -> bool:
+        """
+        失敗を記録し、必要に応じてサーキットを開く
+        Returns:
+            bool: サーキットが開いた場合はTrue
+        """
+        with self._lock:
+            self._metrics["failures"] += 1
+            self._consecutive_failures += 1
+            if (self._circuit_state == CIRCUIT_HALF_OPEN
+                    or self._consecutive_failures >= self.failure_threshold):
+                self._circuit_state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+
+_default_scheduler: Optional[RequestScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler() -> RequestScheduler:
+    """
+    プロセス内で共有する既定のリクエスト制御インスタンスを取得
+    Returns:
+        RequestScheduler: 全セッション共通のインスタンス
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+            get_registry().register_stats(
+                "scheduler", "上流リクエスト制御の統計",
+                lambda: {
+                    **_default_scheduler.metrics,
+                    "circuit_open": int(_default_scheduler.circuit_state == CIRCUIT_OPEN),
+                },
+                counters=("requests", "successes", "failures", "errors", "retries", "rejected", "throttled_seconds")
+            )
+        return _default_scheduler
@@ -0,0 +1,283 @@
+"""処理済み財務データキャッシュモジュール"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from data.data_version import DATA_VERSION
+from utils.models import FinancialDataModel
+from utils.constants import CACHE_TTL_SECONDS, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES
+from utils.telemetry import get_registry
+
+# キャッシュエントリ（財務データ, データ量, 保存時刻, 元データの有効期限）
+_Entry = Tuple[FinancialDataModel, int, float, Optional[float]]
+
+
+class ResultCache:
+    """処理済み財務データのインメモリキャッシュクラス
+
+    (銘柄, 期間, データバージョン) をキーに FinancialDataModel を保持する。
+    件数またはメモリ使用量の上限を超えた場合は、最も長く参照されていない
+    エントリから破棄する（LRU）。
+    エントリは TTL を過ぎた場合のほか、元データ（財務諸表キャッシュ）の有効期限を過ぎた場合にも無効となる。
+    処理時に元データが変わっていた場合は、その銘柄の古い処理結果をすべて破棄する（invalidate）。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESULT_CACHE_MAX_BYTES,
+        ttl_seconds: float = CACHE_TTL_SECONDS
+    ):
+        """
+        初期化
+        Args:
+            max_entries (int): 保持するエントリ数の上限
+            max_bytes (int): 保持するデータ量の上限（バイト）
+            ttl_seconds (float): エントリの有効期間（秒）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str, str], _Entry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, ticker: str, period: str) -> Optional[FinancialDataModel]:
+        """
+        キャッシュから処理済み財務データを取得
+        Args:
+            ticker (str): 銘柄コード
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[FinancialDataModel]: キャッシュされた財務データ（ない場合はNone）
+        """
+        key = self._key(ticker, period)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._is_fresh(entry):
+                if entry is not None:
+                    self._remove(key)
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(
+        self,
+        ticker: str,
+        period: str,
+        model: FinancialDataModel,
+        expires_at: Optional[float] = None
+    ) -> None:
+        """
+        処理済み財務データをキャッシュに保存
+        Args:
+            ticker (str): 銘柄コード
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            model (FinancialDataModel): 処理済み財務データ
+            expires_at (Optional[float]): 元データの有効期限（UNIX時刻。Noneの場合はTTLのみ）
+        """
+        key = self._key(ticker, period)
+        size = self._estimate_size(model)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (model, size, time.monotonic(), expires_at)
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._stats["evictions"] += 1
+
+    def get_or_process(
+        self,
+        ticker: str,
+        period: str,
+        process: Callable[[], Optional[FinancialDataModel]],
+        expires_at: Optional[Callable[[], Optional[float]]] = None,
+        changed: Optional[Callable[[], bool]] = None
+    ) -> Optional[FinancialDataModel]:
+        """
+        キャッシュにあればそれを返し、なければ処理して保存する
+        Args:
+            ticker (str): 銘柄コード
+            period (str): "quarterly"（四半期）または"annual"（年次）
+            process (Callable[[], Optional[FinancialDataModel]]): キャッシュにない場合の処理
+            expires_at (Optional[Callable[[], Optional[float]]]): 処理後に呼び出し、元データの有効期限（UNIX時刻）を返す関数
+            changed (Optional[Callable[[], bool]]): 処理後に呼び出し、元データが変わっていたかを返す関数
+        Returns:
+            Optional[FinancialDataModel]: 処理済み財務データ
+        """
+        model = self.get(ticker, period)
+        if model is None:
+            model = process()
+            self._invalidate_if_changed(ticker, changed)
+            if model is not None:
+                self.set(ticker, period, model, expires_at() if expires_at is not None else None)
+        return model
+
+    def get_or_process_all(
+        self,
+        ticker: str,
+        period: str,
+        process_all: Callable[[Dict[str, FinancialDataModel]], Dict[str, Optional[FinancialDataModel]]],
+        expires_at: Optional[Callable[[], Optional[float]]] = None,
+        changed: Optional[Callable[[], bool]] = None
+    ) -> Optional[FinancialDataModel]:
+        """
+        キャッシュになければ全期間をまとめて処理し、すべての期間を保存する
+        有効期限切れの結果は前回の処理結果として処理に渡し、元データが変わった期のみ再計算させる
+        Args:
+            ticker (str): 銘柄コード
+            period (str): 取得したい期間
+            process_all (Callable[[Dict[str, FinancialDataModel]], Dict[str, Optional[FinancialDataModel]]]):
+                期間ごとの前回の処理結果を受け取り、期間ごとの処理結果を返す処理
+            expires_at (Optional[Callable[[], Optional[float]]]): 処理後に呼び出し、元データの有効期限（UNIX時刻）を返す関数
+            changed (Optional[Callable[[], bool]]): 処理後に呼び出し、元データが変わっていたかを返す関数
+        Returns:
+            Optional[FinancialDataModel]: 指定期間の処理済み財務データ
+        """
+        # 有効期限切れのエントリは get で破棄されるため、先に取り出しておく
+        previous = self._previous(ticker)
+        model = self.get(ticker, period)
+        if model is None:
+            models = process_all(previous)
+            self._invalidate_if_changed(ticker, changed)
+            deadline = expires_at() if expires_at is not None else None
+            for processed_period, processed_model in models.items():
+                if processed_model is not None:
+                    self.set(ticker, processed_period, processed_model, deadline)
+            model = models.get(period)
+        return model
+
+    def invalidate(self, ticker: str) -> None:
+        """
+        銘柄の処理結果をすべて削除（元データが変わった場合に呼び出す）
+        Args:
+            ticker (str): 銘柄コード
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == ticker.upper()]
+            for key in keys:
+                self._remove(key)
+            self._stats["invalidations"] += len(keys)
+
+    def _invalidate_if_changed(self, ticker: str, changed: Optional[Callable[[], bool]]) -> None:
+        """
+        元データが変わっていた場合、銘柄の古い処理結果をすべて削除
+        Args:
+            ticker (str): 銘柄コード
+            changed (Optional[Callable[[], bool]]): 元データが変わっていたかを返す関数
+        """
+        if changed is not None and changed():
+            self.invalidate(ticker)
+
+    def clear(self) -> None:
+        """
+        全エントリを削除
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        キャッシュ統計のスナップショット
+        Returns:
+            Dict[str, int]: ヒット数、ミス数、破棄数、無効化数、エントリ数、データ量
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+    def _previous(self, ticker: str) -> Dict[str, FinancialDataModel]:
+        """
+        銘柄の処理結果を有効期限によらず取得（差分計算の比較元として使う）
+        Args:
+            ticker (str): 銘柄コード
+        Returns:
+            Dict[str, FinancialDataModel]: 期間ごとの処理結果
+        """
+        with self._lock:
+            return {
+                period: model
+                for (key_ticker, period, version), (model, _, _, _) in self._entries.items()
+                if key_ticker == ticker.upper() and version == DATA_VERSION
+            }
+
+    def _remove(self, key: Tuple[str, str, str]) -> None:
+        """
+        エントリを削除（ロック取得済みで呼び出すこと）
+        Args:
+            key (Tuple[str, str, str]): キャッシュキー
+        """
+        _, size, _, _ = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _is_fresh(self, entry: _Entry) -> bool:
+        """
+        エントリが有効か判定
+        Args:
+            entry (_Entry): キャッシュエントリ
+        Returns:
+            bool: TTL・元データの有効期限のいずれも過ぎていない場合はTrue
+        """
+        _, _, stored_at, expires_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            return False
+        return expires_at is None or time.time() < expires_at
+
+    @staticmethod
+    def _key(ticker: str, period: str) -> Tuple[str, str, str]:
+        """
+        キャッシュキーを作成
+        Args:
+            ticker (str): 銘柄コード
+            period (str): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Tuple[str, str, str]: (銘柄, 期間, データバージョン)
+        """
+        return (ticker.upper(), period, DATA_VERSION)
+
+    @staticmethod
+    def _estimate_size(model: FinancialDataModel) -> int:
+        """
+        財務データのメモリ使用量を見積もる
+        Args:
+            model (FinancialDataModel): 財務データ
+        Returns:
+            int: 配列データの合計バイト数
+        """
+        return model.nbytes
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """
+    プロセス内で共有する処理済み財務データキャッシュを取得
+    Returns:
+        ResultCache: 全セッション共通のインスタンス
+    """
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+            get_registry().register_stats(
+                "result_cache", "処理済み財務データキャッシュの統計",
+                lambda: _result_cache.stats, counters=("hits", "misses", "evictions", "invalidations")
+            )
+        return _result_cache
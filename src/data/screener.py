@@ -0,0 +1,261 @@
+"""複数銘柄のスクリーニングモジュール"""
+import operator
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+import numpy as np
+import pandas as pd
+from utils.models import FinancialDataModel
+
+# パネルに格納する指標（FinancialDataModelの属性名）
+PANEL_METRICS = [
+    "revenue", "operating_income", "net_income", "operating_cash_flow", "shares",
+    "eps", "bps", "operating_margin", "operating_cash_flow_per_share", "roic",
+    "dps", "payout_ratio", "operating_cash_flow_margin",
+]
+
+# 成長率を算出する指標
+GROWTH_METRICS = ["revenue", "operating_income", "eps"]
+
+# 絞り込み条件で使える比較演算子
+OPERATORS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class FinancialPanel:
+    """複数銘柄の財務データパネルクラス
+
+    銘柄 × 期 × 指標 の3次元配列（float64、連続領域）で保持する。
+    決算期は銘柄ごとに異なるため、期の軸は最新期を末尾にそろえた相対位置とし、
+    履歴が短い銘柄の古い期はNaNで埋める。
+    """
+
+    def __init__(
+        self,
+        tickers: List[str],
+        metrics: List[str],
+        values: np.ndarray,
+        dates: np.ndarray
+    ):
+        """
+        初期化
+        Args:
+            tickers (List[str]): 銘柄コード（第1軸）
+            metrics (List[str]): 指標名（第3軸）
+            values (np.ndarray): 値（銘柄 × 期 × 指標）
+            dates (np.ndarray): 各銘柄・各期の決算日（銘柄 × 期、datetime64）
+        """
+        self.tickers = tickers
+        self.metrics = metrics
+        self.values = values
+        self.dates = dates
+        self._ticker_index = {ticker: i for i, ticker in enumerate(tickers)}
+        self._metric_index = {metric: i for i, metric in enumerate(metrics)}
+
+    @classmethod
+    def from_models(
+        cls,
+        models: Mapping[str, FinancialDataModel],
+        metrics: Optional[List[str]] = None,
+        periods: Optional[int] = None
+    ) -> "FinancialPanel":
+        """
+        銘柄ごとの財務データモデルからパネルを作成
+        Args:
+            models (Mapping[str, FinancialDataModel]): 銘柄コードと財務データモデルの辞書
+            metrics (Optional[List[str]]): 格納する指標（省略時は PANEL_METRICS）
+            periods (Optional[int]): 格納する期数（省略時は最も長い銘柄に合わせる）
+        Returns:
+            FinancialPanel: 財務データパネル
+        """
+        metrics = metrics or PANEL_METRICS
+        tickers = list(models.keys())
+        if periods is None:
+            periods = max((len(model.dates) for model in models.values()), default=0)
+
+        values = np.full((len(tickers), periods, len(metrics)), np.nan)
+        dates = np.full((len(tickers), periods), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+        for i, ticker in enumerate(tickers):
+            model = models[ticker]
+            length = min(len(model.dates), periods)
+            if length == 0:
+                continue
+            dates[i, periods - length:] = model.dates[-length:].to_numpy()
+            for j, metric in enumerate(metrics):
+                series = model.column(metric)
+                if series is not None:
+                    values[i, periods - length:, j] = series[-length:]
+
+        return cls(tickers, list(metrics), values, dates)
+
+    def metric(self, name: str) -> np.ndarray:
+        """
+        指標の時系列（銘柄 × 期）を取得
+        Args:
+            name (str): 指標名
+        Returns:
+            np.ndarray: 指標の値（コピーではなくビュー）
+        """
+        return self.values[:, :, self._metric_index[name]]
+
+    def latest(self, name: str) -> np.ndarray:
+        """
+        指標の最新期の値を取得
+        Args:
+            name (str): 指標名
+        Returns:
+            np.ndarray: 銘柄ごとの最新値
+        """
+        return self.values[:, -1, self._metric_index[name]]
+
+    def growth(self, name: str, lag: int) -> np.ndarray:
+        """
+        指標の最新期の成長率（%）を計算
+        Args:
+            name (str): 指標名
+            lag (int): 比較する期の間隔（四半期データの前年同期比なら4）
+        Returns:
+            np.ndarray: 銘柄ごとの成長率（比較元が0以下または欠損の場合はNaN）
+        """
+        series = self.metric(name)
+        if lag >= series.shape[1]:
+            return np.full(len(self.tickers), np.nan)
+        current = series[:, -1]
+        previous = series[:, -1 - lag]
+        result = np.full(len(self.tickers), np.nan)
+        valid = np.isfinite(previous) & (previous > 0)
+        np.divide(current - previous, previous, out=result, where=valid)
+        return result * 100
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        縦持ち（銘柄・決算日ごとに1行）のデータフレームに変換
+        Returns:
+            pd.DataFrame: 銘柄、決算日、各指標の列を持つデータフレーム
+        """
+        n_tickers, n_periods, n_metrics = self.values.shape
+        frame = pd.DataFrame(self.values.reshape(n_tickers * n_periods, n_metrics), columns=self.metrics)
+        frame.insert(0, "date", self.dates.reshape(-1))
+        frame.insert(0, "ticker", np.repeat(self.tickers, n_periods))
+        return frame[frame["date"].notna()].reset_index(drop=True)
+
+
+class Screener:
+    """銘柄スクリーニングクラス
+
+    パネルから銘柄 × 指標の最新値の表（成長率を含む）を一度だけ作成し、
+    絞り込み・並べ替え・上位抽出をすべて配列演算で行う。
+    条件を追加するたびに新しいインスタンスを返すため、途中の条件を再利用できる。
+    """
+
+    def __init__(
+        self,
+        panel: FinancialPanel,
+        growth_lag: int = 4,
+        _snapshot: Optional[pd.DataFrame] = None,
+        _mask: Optional[np.ndarray] = None,
+        _order: Optional[Sequence[tuple]] = None
+    ):
+        """
+        初期化
+        Args:
+            panel (FinancialPanel): 財務データパネル
+            growth_lag (int): 成長率の比較間隔（四半期データは4、年次データは1）
+        """
+        self.panel = panel
+        self.growth_lag = growth_lag
+        self._snapshot = _snapshot if _snapshot is not None else self._build_snapshot()
+        self._mask = _mask if _mask is not None else np.ones(len(panel.tickers), dtype=bool)
+        self._order = list(_order or [])
+
+    def where(self, column: str, op: str, value: float) -> "Screener":
+        """
+        条件で絞り込む（欠損値の銘柄は除外される）
+        Args:
+            column (str): 列名（指標名、または "<指標名>_growth"）
+            op (str): 比較演算子（">", ">=", "<", "<=", "==", "!="）
+            value (float): 比較する値
+        Returns:
+            Screener: 条件を追加したスクリーナー
+        """
+        if op not in OPERATORS:
+            raise ValueError(f"未対応の演算子です: {op}")
+        values = self._snapshot[column].to_numpy()
+        with np.errstate(invalid="ignore"):
+            mask = self._mask & OPERATORS[op](values, value) & ~np.isnan(values)
+        return self._copy(mask=mask)
+
+    def sort_by(self, column: str, descending: bool = True) -> "Screener":
+        """
+        並べ替え条件を追加（先に指定した条件を優先）
+        Args:
+            column (str): 列名
+            descending (bool): 降順の場合はTrue
+        Returns:
+            Screener: 並べ替え条件を追加したスクリーナー
+        """
+        return self._copy(order=self._order + [(column, descending)])
+
+    def top(self, n: int) -> pd.DataFrame:
+        """
+        条件に合う上位n銘柄を取得
+        Args:
+            n (int): 取得する銘柄数
+        Returns:
+            pd.DataFrame: 銘柄コードをインデックスとする最新値の表
+        """
+        return self.result().head(n)
+
+    def result(self) -> pd.DataFrame:
+        """
+        条件に合う全銘柄を取得
+        Returns:
+            pd.DataFrame: 銘柄コードをインデックスとする最新値の表
+        """
+        indices = np.flatnonzero(self._mask)
+        if self._order:
+            # np.lexsortは最後のキーを最優先するため逆順に並べる（欠損値は末尾）
+            keys = []
+            for column, descending in reversed(self._order):
+                values = self._snapshot[column].to_numpy()[indices]
+                keys.append(np.where(np.isnan(values), np.inf, -values if descending else values))
+            indices = indices[np.lexsort(keys)]
+        return self._snapshot.iloc[indices]
+
+    def _build_snapshot(self) -> pd.DataFrame:
+        """
+        銘柄 × 指標の最新値の表を作成
+        Returns:
+            pd.DataFrame: 最新値と成長率の表
+        """
+        columns = {metric: self.panel.latest(metric) for metric in self.panel.metrics}
+        for metric in GROWTH_METRICS:
+            if metric in self.panel.metrics:
+                columns[f"{metric}_growth"] = self.panel.growth(metric, self.growth_lag)
+        return pd.DataFrame(columns, index=pd.Index(self.panel.tickers, name="ticker"))
+
+    def _copy(
+        self,
+        mask: Optional[np.ndarray] = None,
+        order: Optional[List[tuple]] = None
+    ) -> "Screener":
+        """
+        条件を引き継いだ新しいスクリーナーを作成
+        Args:
+            mask (Optional[np.ndarray]): 絞り込み結果
+            order (Optional[List[tuple]]): 並べ替え条件
+        Returns:
+            Screener: 新しいスクリーナー
+        """
+        return Screener(
+            self.panel,
+            self.growth_lag,
+            _snapshot=self._snapshot,
+            _mask=self._mask if mask is None else mask,
+            _order=self._order if order is None else order
+        )
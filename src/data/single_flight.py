@@ -0,0 +1,158 @@
+"""同時リクエストの集約モジュール"""
+import threading
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from utils.telemetry import get_registry
+
+
+class SingleFlight:
+    """同時リクエストの集約クラス
+
+    同じキーの処理が実行中の場合は新たに実行せず、実行中の処理の結果（または例外）を共有する。
+    完了した処理は一覧から外すため、結果を保持するキャッシュとしては働かない。
+    集約の状況は呼び出し数・実行数・共有数として集計する。
+    """
+
+    def __init__(self):
+        """
+        初期化
+        """
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._metrics = {
+            "calls": 0,
+            "leaders": 0,
+            "shared": 0,
+        }
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        処理を実行する（同じキーの処理が実行中の場合はその完了を待つ）
+        Args:
+            key (Hashable): 処理を識別するキー
+            func (Callable[..., Any]): 実行する関数
+            *args: 関数の位置引数
+            **kwargs: 関数のキーワード引数
+        Returns:
+            Any: 関数の戻り値
+        Raises:
+            Exception: 関数が送出した例外（待機していた呼び出しにも送出される）
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, func, *args, **kwargs)
+        return future.result()
+
+    def submit(self, key: Hashable, executor: Executor, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        処理をスレッドプールで実行する（同じキーの処理が実行中の場合はその Future を返す）
+        Args:
+            key (Hashable): 処理を識別するキー
+            executor (Executor): 処理を実行するスレッドプール
+            func (Callable[..., Any]): 実行する関数
+            *args: 関数の位置引数
+            **kwargs: 関数のキーワード引数
+        Returns:
+            Future: 処理の結果（同じキーの呼び出しで共有される）
+        """
+        future, leader = self._join(key)
+        if leader:
+            executor.submit(self._run, key, future, func, *args, **kwargs)
+        return future
+
+    @property
+    def in_flight(self) -> int:
+        """
+        実行中の処理数
+        Returns:
+            int: 処理数
+        """
+        with self._lock:
+            return len(self._calls)
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        """
+        集約統計のスナップショット
+        Returns:
+            Dict[str, float]: 項目名と値の辞書（dedup_ratio は呼び出しのうち結果を共有した割合）
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["in_flight"] = len(self._calls)
+        metrics["dedup_ratio"] = metrics["shared"] / metrics["calls"] if metrics["calls"] else 0.0
+        return metrics
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        実行中の処理に合流する（実行中でなければ新たに登録する）
+        Args:
+            key (Hashable): 処理を識別するキー
+        Returns:
+            Tuple[Future, bool]: 処理の Future と、呼び出し側が実行を担当する場合はTrue
+        """
+        with self._lock:
+            self._metrics["calls"] += 1
+            future = self._calls.get(key)
+            if future is not None:
+                self._metrics["shared"] += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._metrics["leaders"] += 1
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, func: Callable[..., Any], *args, **kwargs) -> None:
+        """
+        処理を実行し、結果を Future に設定する
+        Args:
+            key (Hashable): 処理を識別するキー
+            future (Future): 結果を設定する Future
+            func (Callable[..., Any]): 実行する関数
+            *args: 関数の位置引数
+            **kwargs: 関数のキーワード引数
+        """
+        if not future.set_running_or_notify_cancel():
+            self._forget(key, future)
+            return
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            self._forget(key, future)
+            future.set_exception(e)
+        else:
+            # 結果を設定する前に一覧から外し、完了後の呼び出しは新たに実行させる
+            self._forget(key, future)
+            future.set_result(result)
+
+    def _forget(self, key: Hashable, future: Future) -> None:
+        """
+        完了した処理を実行中の一覧から外す
+        Args:
+            key (Hashable): 処理を識別するキー
+            future (Future): 完了した処理の Future
+        """
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+_default_single_flight: Optional[SingleFlight] = None
+_default_single_flight_lock = threading.Lock()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """
+    プロセス内で共有する既定の集約インスタンスを取得
+    Returns:
+        SingleFlight: 全セッション共通のインスタンス
+    """
+    global _default_single_flight
+    with _default_single_flight_lock:
+        if _default_single_flight is None:
+            _default_single_flight = SingleFlight()
+            get_registry().register_stats(
+                "single_flight", "同時リクエストの集約の統計",
+                lambda: _default_single_flight.metrics, counters=("calls", "leaders", "shared")
+            )
+        return _default_single_flight
@@ -0,0 +1,183 @@
+"""財務諸表キャッシュモジュール"""
+import os
+import pickle
+import tempfile
+import time
+from typing import Dict, Optional, Union
+import pandas as pd
+from utils.constants import CACHE_DIR, CACHE_TTL_SECONDS
+from utils.telemetry import log_event
+
+
+class StatementCache:
+    """財務諸表のディスクキャッシュクラス
+
+    銘柄・期間・財務諸表の種類ごとに1ファイル（pickle）として保存する。
+    エントリは TTL を過ぎた場合、または保存時点で予定されていた次回決算日を
+    過ぎた場合に無効となる。
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, ttl_seconds: float = CACHE_TTL_SECONDS):
+        """
+        初期化
+        Args:
+            cache_dir (str): キャッシュファイルの保存先ディレクトリ
+            ttl_seconds (float): キャッシュの有効期間（秒）
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+
+    def get(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str] = None
+    ) -> Optional[Union[pd.DataFrame, pd.Series]]:
+        """
+        キャッシュから財務諸表を取得
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[Union[pd.DataFrame, pd.Series]]: 有効なキャッシュがあればそのデータ
+        """
+        entry = self.get_entry(ticker, statement, period)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return entry["data"]
+
+    def get_entry(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        キャッシュエントリを有効期限によらず取得（差分更新の比較元として使う）
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            Optional[Dict]: data, fetched_at, next_earnings_date を持つエントリ（ない場合はNone）
+        """
+        path = self._path(ticker, statement, period)
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log_event("cache_read_failed", f"キャッシュの読み込みに失敗しました: {path}: {str(e)}", path=path)
+            return None
+
+    def set(
+        self,
+        ticker: str,
+        statement: str,
+        period: Optional[str],
+        data: Union[pd.DataFrame, pd.Series],
+        next_earnings_date: Optional[pd.Timestamp] = None
+    ) -> Dict:
+        """
+        財務諸表をキャッシュに保存
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+            data (Union[pd.DataFrame, pd.Series]): 保存するデータ
+            next_earnings_date (Optional[pd.Timestamp]): 次回決算日（不明な場合はNone）
+        Returns:
+            Dict: 保存したエントリ（保存に失敗した場合も返す）
+        """
+        entry = {
+            "data": data,
+            "fetched_at": time.time(),
+            "next_earnings_date": next_earnings_date,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 書き込み途中のファイルを読まないよう、一時ファイル経由で置き換える
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(ticker, statement, period))
+        except Exception as e:
+            log_event("cache_write_failed", f"キャッシュの保存に失敗しました: {ticker}: {str(e)}",
+                      ticker=ticker, statement=statement, period=period)
+        return entry
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """
+        キャッシュを削除
+        Args:
+            ticker (Optional[str]): 対象の銘柄コード（Noneの場合は全銘柄）
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        prefix = f"{ticker.upper()}_" if ticker else ""
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(prefix) and name.endswith(".pkl"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """
+        キャッシュエントリが有効か判定
+        Args:
+            entry (Dict): キャッシュエントリ
+        Returns:
+            bool: 有効な場合はTrue
+        """
+        return time.time() < self.expires_at(entry)
+
+    def expires_at(self, entry: Dict) -> float:
+        """
+        キャッシュエントリの有効期限
+        Args:
+            entry (Dict): キャッシュエントリ
+        Returns:
+            float: TTL と次回決算日のうち早い方（UNIX時刻）
+        """
+        expires_at = entry["fetched_at"] + self.ttl_seconds
+        # 保存後に決算日を迎えていれば新しい決算が出ている可能性がある
+        next_earnings_date = entry.get("next_earnings_date")
+        if next_earnings_date is not None:
+            expires_at = min(expires_at, pd.Timestamp(next_earnings_date).timestamp())
+        return expires_at
+
+    def _path(self, ticker: str, statement: str, period: Optional[str]) -> str:
+        """
+        キャッシュファイルのパスを作成
+        Args:
+            ticker (str): 銘柄コード
+            statement (str): 財務諸表の種類
+            period (Optional[str]): "quarterly"（四半期）または"annual"（年次）
+        Returns:
+            str: キャッシュファイルのパス
+        """
+        parts = [ticker.upper(), statement] if period is None else [ticker.upper(), period, statement]
+        return os.path.join(self.cache_dir, "_".join(parts) + ".pkl")
+
+
+def is_unchanged(
+    cached: Union[pd.DataFrame, pd.Series],
+    fetched: Union[pd.DataFrame, pd.Series]
+) -> bool:
+    """
+    取得した財務諸表がキャッシュ済みの財務諸表と同じか判定
+    期（列または添字の日付）と値がすべて一致する場合は、新しい期の追加も過去の期の修正もない
+    Args:
+        cached (Union[pd.DataFrame, pd.Series]): キャッシュ済みの財務諸表
+        fetched (Union[pd.DataFrame, pd.Series]): 取得した財務諸表
+    Returns:
+        bool: 新しい期・修正された期・なくなった期がない場合はTrue
+    """
+    if isinstance(fetched, pd.Series):
+        if not isinstance(cached, pd.Series) or set(cached.index) != set(fetched.index):
+            return False
+        return cached.reindex(fetched.index).equals(fetched)
+
+    if not isinstance(cached, pd.DataFrame) or set(cached.columns) != set(fetched.columns):
+        return False
+    return cached.reindex(index=fetched.index, columns=fetched.columns).equals(fetched)
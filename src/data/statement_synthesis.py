@@ -0,0 +1,103 @@
+"""四半期財務諸表から年次財務諸表を算出するモジュール"""
+from typing import List, Optional
+import pandas as pd
+from utils.models import StatementBundle
+from utils.constants import YF_TAX_RATE, YF_DILUTED_SHARES
+
+# 1年分とみなす四半期数と、その期間の最大日数（最初と最後の四半期末の差）
+QUARTERS_PER_YEAR = 4
+MAX_YEAR_SPAN_DAYS = 300
+
+# 合計ではなく平均で集計する損益計算書の項目
+AVERAGED_INCOME_ROWS = [YF_TAX_RATE, YF_DILUTED_SHARES]
+
+
+def synthesize_annual_bundle(quarterly: StatementBundle) -> StatementBundle:
+    """
+    四半期の財務諸表一式から年次の財務諸表一式を算出
+    直近の四半期から4四半期ずつ区切って集計するため、最新の年度は直近12か月（TTM）となる
+    Args:
+        quarterly (StatementBundle): 四半期の財務諸表一式
+    Returns:
+        StatementBundle: 年次の財務諸表一式（算出できない項目はNone）
+    """
+    income = _sum_quarters(quarterly.income, AVERAGED_INCOME_ROWS)
+    cash_flow = _sum_quarters(quarterly.cash_flow)
+    balance = _year_end_quarters(quarterly.balance)
+
+    shares = None
+    if income is not None and YF_DILUTED_SHARES in income.index:
+        shares = income.loc[YF_DILUTED_SHARES]
+
+    return StatementBundle(
+        income=income,
+        balance=balance,
+        cash_flow=cash_flow,
+        shares=shares,
+        dividends=quarterly.dividends
+    )
+
+
+def _year_groups(frame: pd.DataFrame) -> List[List]:
+    """
+    四半期の列を新しい順に4つずつ区切る
+    Args:
+        frame (pd.DataFrame): 四半期の財務諸表（列が決算日）
+    Returns:
+        List[List]: 1年分ずつの列名リスト（先頭が年度末）
+    """
+    columns = sorted(frame.columns, key=pd.Timestamp, reverse=True)
+    groups = []
+    for start in range(0, len(columns) - QUARTERS_PER_YEAR + 1, QUARTERS_PER_YEAR):
+        group = columns[start:start + QUARTERS_PER_YEAR]
+        # 四半期が欠けている区間は1年分として扱わない
+        if (pd.Timestamp(group[0]) - pd.Timestamp(group[-1])).days > MAX_YEAR_SPAN_DAYS:
+            break
+        groups.append(group)
+    return groups
+
+
+def _sum_quarters(
+    frame: Optional[pd.DataFrame],
+    averaged_rows: Optional[List[str]] = None
+) -> Optional[pd.DataFrame]:
+    """
+    フロー項目を4四半期分合計して年次化
+    Args:
+        frame (Optional[pd.DataFrame]): 四半期の財務諸表
+        averaged_rows (Optional[List[str]]): 合計ではなく平均する項目
+    Returns:
+        Optional[pd.DataFrame]: 年次の財務諸表（算出できない場合はNone）
+    """
+    if frame is None:
+        return None
+    groups = _year_groups(frame)
+    if not groups:
+        return None
+
+    years = {}
+    for group in groups:
+        quarters = frame[group]
+        # 4四半期すべて揃っている項目のみ値を持たせる
+        year = quarters.sum(axis=1, min_count=QUARTERS_PER_YEAR)
+        for row in averaged_rows or []:
+            if row in quarters.index:
+                year[row] = quarters.loc[row].mean()
+        years[group[0]] = year
+    return pd.DataFrame(years)
+
+
+def _year_end_quarters(frame: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    ストック項目は年度末の四半期の値を採用して年次化
+    Args:
+        frame (Optional[pd.DataFrame]): 四半期の財務諸表
+    Returns:
+        Optional[pd.DataFrame]: 年次の財務諸表（算出できない場合はNone）
+    """
+    if frame is None:
+        return None
+    groups = _year_groups(frame)
+    if not groups:
+        return None
+    return frame[[group[0] for group in groups]]
@@ -3,14 +3,218 @@
 このモジュールは、yFinanceから取得したデータを確認するためのデバッグページを提供します。
 指定したティッカーシンボルで取得可能なデータを閲覧できます。
 """
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Optional, Tuple
 import streamlit as st
 import pandas as pd
 import yfinance as yf
 from data.data_fetcher import DataFetcher
+from data.data_processor import DataProcessor
+from data.single_flight import get_default_single_flight
+from data.result_cache import get_result_cache
+from data.statement_cache import StatementCache
 from utils.constants import (
-    PERIOD_QUARTERLY, PERIOD_ANNUAL,
+    PERIOD_QUARTERLY, DEBUG_MAX_WORKERS, DEBUG_RESULTS_TTL_SECONDS,
     APP_ICON
 )
+from utils.formatting import format_bytes
+from utils.telemetry import configure_logging
+
+# 確認するyfinanceの属性（セクション名, (属性名, 説明) のリスト）
+# 属性名が "()" で終わるものはメソッドとして呼び出す
+DEBUG_SECTIONS = [
+    ("財務諸表", [
+        ("balance_sheet", "貸借対照表"),
+        ("balancesheet", "貸借対照表"),
+        ("cash_flow", "キャッシュフロー計算書"),
+        ("cashflow", "キャッシュフロー計算書"),
+        ("financials", "損益計算書"),
+        ("income_stmt", "損益計算書"),
+        ("incomestmt", "損益計算書"),
+        ("ttm_cash_flow", "キャッシュフロー計算書（直近12か月）"),
+        ("ttm_cashflow", "キャッシュフロー計算書（直近12か月）"),
+        ("ttm_financials", "損益計算書（直近12か月）"),
+        ("ttm_income_stmt", "損益計算書（直近12か月）"),
+        ("ttm_incomestmt", "損益計算書（直近12か月）"),
+    ]),
+    ("決算・アナリスト予想", [
+        ("calendar", "決算日、配当日、その他イベントの日程情報"),
+        ("earnings", "決算データ"),
+        ("earnings_dates", "決算日"),
+        ("earnings_estimate", "アナリストによる決算見通し"),
+        ("earnings_history", "決算実績"),
+        ("eps_revisions", "EPSの変更履歴"),
+        ("eps_trend", "EPSの推移"),
+        ("growth_estimates", "売上や利益の成長率の見通し"),
+        ("revenue_estimate", "売上高に関する見通し"),
+        ("analyst_price_targets", "アナリストの推奨価格"),
+        ("recommendations", "アナリストの推奨"),
+        ("recommendations_summary", "推奨情報のサマリー"),
+        ("upgrades_downgrades", "アナリストによる格付けのアップ／ダウングレード"),
+    ]),
+    ("株式・配当", [
+        ("actions", "配当、株式分割、その他アクションの履歴データ"),
+        ("dividends", "配当データ"),
+        ("splits", "株式分割"),
+        ("capital_gains", "キャピタルゲイン"),
+        ("shares", "発行済株式数"),
+        ("get_shares()", "発行済株式数"),
+        ("get_shares_full()", "発行済株式数"),
+        ("options", "オプションの満期日"),
+    ]),
+    ("株主・インサイダー", [
+        ("major_holders", "主要株主"),
+        ("institutional_holders", "機関投資家の保有状況"),
+        ("mutualfund_holders", "投資信託による保有情報"),
+        ("insider_purchases", "インサイダー購入"),
+        ("insider_roster_holders", "インサイダーの保有情報"),
+        ("insider_transactions", "インサイダーの取引履歴"),
+    ]),
+    ("企業・市場情報", [
+        ("info", "企業情報"),
+        ("basic_info", "基本的な企業情報"),
+        ("fast_info", "基本市場情報"),
+        ("history_metadata", "株価時系列データ"),
+        ("isin", "国際証券識別番号"),
+        ("news", "関連ニュース記事"),
+        ("sec_filings", "SECへの報告書"),
+        ("sustainability", "ESG・サステナビリティに関する評価"),
+        ("funds_data", "ファンド関連"),
+    ]),
+]
+
+
+def fetch_attribute(stock: yf.Ticker, name: str) -> Tuple[Any, float, int, Optional[str]]:
+    """
+    yfinanceの属性を取得し、取得時間とデータサイズを計測
+    Args:
+        stock (yf.Ticker): yfinanceの銘柄オブジェクト
+        name (str): 属性名（"()" で終わる場合はメソッドとして呼び出す）
+    Returns:
+        Tuple[Any, float, int, Optional[str]]: 値、取得時間（秒）、データサイズ（バイト）、エラーメッセージ
+    """
+    started = time.perf_counter()
+    try:
+        value = getattr(stock, name[:-2])() if name.endswith("()") else getattr(stock, name)
+        error = None
+    except Exception as e:
+        value, error = None, str(e)
+    elapsed = time.perf_counter() - started
+    return value, elapsed, payload_size(value), error
+
+
+def payload_size(value: Any) -> int:
+    """
+    取得したデータのサイズを計算
+    Args:
+        value (Any): 取得したデータ
+    Returns:
+        int: バイト数（DataFrame・Seriesはメモリ使用量、それ以外はシリアライズ後のサイズ）
+    """
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+def render_attribute(
+    placeholder,
+    name: str,
+    description: str,
+    result: Tuple[Any, float, int, Optional[str]]
+) -> None:
+    """
+    取得結果をプレースホルダーに描画
+    Args:
+        placeholder: 描画先のプレースホルダー
+        name (str): 属性名
+        description (str): 属性の説明
+        result (Tuple[Any, float, int, Optional[str]]): fetch_attribute の戻り値
+    """
+    value, elapsed, size, error = result
+    with placeholder.container():
+        st.subheader(f"Ticker.{name}")
+        st.caption(f"{description}（取得時間: {elapsed * 1000:.0f}ms、サイズ: {format_bytes(size)}）")
+        if error is not None:
+            st.error(f"{name}の取得に失敗しました: {error}")
+            return
+        try:
+            st.dataframe(value)
+        except Exception:
+            # 表形式にできない値（文字列など）はそのまま表示する
+            st.write(value)
+
+
+def session_results(ticker: str, reload: bool = False) -> Dict[str, Tuple]:
+    """
+    セッション内に保持した取得結果を取得
+    保持するのは表示中の銘柄の結果のみで、銘柄を切り替えた場合・再取得を指示した場合・
+    DEBUG_RESULTS_TTL_SECONDS を過ぎた場合は破棄する
+    Args:
+        ticker (str): 銘柄コード
+        reload (bool): 保持している結果を破棄して再取得する場合はTrue
+    Returns:
+        Dict[str, Tuple]: 属性名と fetch_attribute の戻り値の辞書
+    """
+    state = st.session_state.get("debug_results")
+    expired = state is None or time.monotonic() - state["created_at"] > DEBUG_RESULTS_TTL_SECONDS
+    if reload or expired or state["ticker"] != ticker.upper():
+        state = {"ticker": ticker.upper(), "created_at": time.monotonic(), "results": {}}
+        st.session_state["debug_results"] = state
+    return state["results"]
+
+
+def render_sections(ticker: str) -> None:
+    """
+    yfinanceの属性をセクションごとに描画
+    読み込むセクションの属性はワーカープールで並行して取得し、取得できたものから順に描画する
+    取得結果は表示中の銘柄の分のみセッション内に一定時間保持し、再描画時は再取得しない
+    Args:
+        ticker (str): 銘柄コード
+    """
+    reload = st.sidebar.button("再取得", help="保持している取得結果を破棄して取得し直します")
+    results = session_results(ticker, reload)
+    load_all = st.sidebar.checkbox("すべてのセクションを読み込む", value=False)
+
+    pending = {}
+    for title, attributes in DEBUG_SECTIONS:
+        with st.expander(f"{title}（{len(attributes)}項目）", expanded=load_all):
+            if not (load_all or st.checkbox("このセクションを読み込む", key=f"debug_load_{title}")):
+                continue
+            for name, description in attributes:
+                placeholder = st.empty()
+                if name in results:
+                    render_attribute(placeholder, name, description, results[name])
+                else:
+                    placeholder.info(f"Ticker.{name}を取得中...")
+                    pending[name] = (placeholder, description)
+
+    if not pending:
+        return
+
+    stock = yf.Ticker(ticker)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=DEBUG_MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_attribute, stock, name): name for name in pending}
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = future.result()
+            placeholder, description = pending[name]
+            render_attribute(placeholder, name, description, results[name])
+
+    elapsed = time.perf_counter() - started
+    total = sum(results[name][1] for name in pending)
+    st.sidebar.caption(
+        f"{len(pending)}項目を{elapsed:.1f}秒で取得しました（各項目の取得時間の合計: {total:.1f}秒）"
+    )
 
 
 def main():
@@ -21,6 +225,8 @@ def main():
         layout="wide"
     )
 
+    configure_logging()
+
     st.title("yFinanceデータ確認ツール")
     st.write("指定したティッカーシンボルのyFinanceデータを確認できます。")
 
@@ -31,342 +237,28 @@ def main():
 
     if ticker:
         try:
-            # ローディング表示
-            with st.spinner(f"'{ticker}'のデータを取得中..."):
-                # yfinanceからデータを取得
-                stock = yf.Ticker(ticker)
-                data_fetcher = DataFetcher(ticker)
-
-            try:
-                # 配当、株式分割、その他アクションの履歴データ
-                st.header("Ticker.actions")
-                st.dataframe(stock.actions)
-            except Exception as e:
-                st.error(f"actionsの取得に失敗しました: {str(e)}")
-
-            try:
-                # アナリストの推奨価格
-                st.header("Ticker.analyst_price_targets")
-                st.dataframe(stock.analyst_price_targets)
-            except Exception as e:
-                st.error(f"analyst_price_targetsの取得に失敗しました: {str(e)}")
-
-            try:
-                # 貸借対照表
-                st.header("Ticker.balance_sheet")
-                st.dataframe(stock.balance_sheet)
-            except Exception as e:
-                st.error(f"balance_sheetの取得に失敗しました: {str(e)}")
-
-            try:
-                # 貸借対照表
-                st.header("Ticker.balancesheet")
-                st.dataframe(stock.balancesheet)
-            except Exception as e:
-                st.error(f"balancesheetの取得に失敗しました: {str(e)}")
-
-            try:
-                # 基本的な企業情報
-                st.header("Ticker.basic_info")
-                st.dataframe(stock.basic_info)
-            except Exception as e:
-                st.error(f"basic_infoの取得に失敗しました: {str(e)}")
-
-            try:
-                # 決算日、配当日、その他イベントの日程情報
-                st.header("Ticker.calendar")
-                st.dataframe(stock.calendar)
-            except Exception as e:
-                st.error(f"calendarの取得に失敗しました: {str(e)}")
-
-            try:
-                # キャピタルゲイン
-                st.header("Ticker.capital_gains")
-                st.dataframe(stock.capital_gains)
-            except Exception as e:
-                st.error(f"capital_gainsの取得に失敗しました: {str(e)}")
-
-            try:
-                # キャッシュフロー計算書
-                st.header("Ticker.cash_flow")
-                st.dataframe(stock.cash_flow)
-            except Exception as e:
-                st.error(f"cash_flowの取得に失敗しました: {str(e)}")
-
-            try:
-                # キャッシュフロー計算書
-                st.header("Ticker.cashflow")
-                st.dataframe(stock.cashflow)
-            except Exception as e:
-                st.error(f"cashflowの取得に失敗しました: {str(e)}")
-
-            try:
-                # 配当データ
-                st.header("Ticker.dividends")
-                st.dataframe(stock.dividends)
-            except Exception as e:
-                st.error(f"dividendsの取得に失敗しました: {str(e)}")
-
-            try:
-                # 決算データ
-                st.header("Ticker.earnings")
-                st.dataframe(stock.earnings)
-            except Exception as e:
-                st.error(f"earningsの取得に失敗しました: {str(e)}")
-
-            try:
-                # 決算日
-                st.header("Ticker.earnings_dates")
-                st.dataframe(stock.earnings_dates)
-            except Exception as e:
-                st.error(f"earnings_datesの取得に失敗しました: {str(e)}")
-
-            try:
-                # アナリストによる決算見通し
-                st.header("Ticker.earnings_estimate")
-                st.dataframe(stock.earnings_estimate)
-            except Exception as e:
-                st.error(f"earnings_estimateの取得に失敗しました: {str(e)}")
-
-            try:
-                # 決算実績
-                st.header("Ticker.earnings_history")
-                st.dataframe(stock.earnings_history)
-            except Exception as e:
-                st.error(f"earnings_historyの取得に失敗しました: {str(e)}")
-
-            try:
-                # EPSの変更履歴
-                st.header("Ticker.eps_revisions")
-                st.dataframe(stock.eps_revisions)
-            except Exception as e:
-                st.error(f"eps_revisionsの取得に失敗しました: {str(e)}")
-
-            try:
-                # EPSの推移
-                st.header("Ticker.eps_trend")
-                st.dataframe(stock.eps_trend)
-            except Exception as e:
-                st.error(f"eps_trendの取得に失敗しました: {str(e)}")
-
-            try:
-                # 基本市場情報
-                st.header("Ticker.fast_info")
-                st.dataframe(stock.fast_info)
-            except Exception as e:
-                st.error(f"fast_infoの取得に失敗しました: {str(e)}")
-
-            try:
-                # 損益計算書
-                st.header("Ticker.financials")
-                st.dataframe(stock.financials)
-            except Exception as e:
-                st.error(f"financialsの取得に失敗しました: {str(e)}")
-
-            try:
-                # ファンド関連
-                st.header("Ticker.funds_data")
-                st.dataframe(stock.funds_data)
-            except Exception as e:
-                st.error(f"funds_dataの取得に失敗しました: {str(e)}")
-
-            try:
-                # 売上や利益の成長率の見通し
-                st.header("Ticker.growth_estimates")
-                st.dataframe(stock.growth_estimates)
-            except Exception as e:
-                st.error(f"growth_estimatesの取得に失敗しました: {str(e)}")
-
-            try:
-                # 株価時系列データ
-                st.header("Ticker.history_metadata")
-                st.dataframe(stock.history_metadata)
-            except Exception as e:
-                st.error(f"history_metadataの取得に失敗しました: {str(e)}")
-
-            try:
-                # 損益計算書
-                st.header("Ticker.income_stmt")
-                st.dataframe(stock.income_stmt)
-            except Exception as e:
-                st.error(f"income_stmtの取得に失敗しました: {str(e)}")
-
-            try:
-                # 損益計算書
-                st.header("Ticker.incomestmt")
-                st.dataframe(stock.incomestmt)
-            except Exception as e:
-                st.error(f"incomestmtの取得に失敗しました: {str(e)}")
-
             try:
-                # 企業情報
-                st.header("Ticker.info")
-                st.dataframe(stock.info)
-            except Exception as e:
-                st.error(f"infoの取得に失敗しました: {str(e)}")
-
-            try:
-                # インサイダー購入
-                st.header("Ticker.insider_purchases")
-                st.dataframe(stock.insider_purchases)
-            except Exception as e:
-                st.error(f"insider_purchasesの取得に失敗しました: {str(e)}")
-
-            try:
-                # インサイダーの保有情報
-                st.header("Ticker.insider_roster_holders")
-                st.dataframe(stock.insider_roster_holders)
-            except Exception as e:
-                st.error(f"insider_roster_holdersの取得に失敗しました: {str(e)}")
-
-            try:
-                # インサイダーの取引履歴
-                st.header("Ticker.insider_transactions")
-                st.dataframe(stock.insider_transactions)
-            except Exception as e:
-                st.error(f"insider_transactionsの取得に失敗しました: {str(e)}")
-
-            try:
-                # 機関投資家の保有状況
-                st.header("Ticker.institutional_holders")
-                st.dataframe(stock.institutional_holders)
-            except Exception as e:
-                st.error(f"institutional_holdersの取得に失敗しました: {str(e)}")
-
-            try:
-                # 国際証券識別番号
-                st.header("Ticker.isin")
-                st.dataframe(stock.isin)
-            except Exception as e:
-                st.error(f"isinの取得に失敗しました: {str(e)}")
-
-            try:
-                # 主要株主
-                st.header("Ticker.major_holders")
-                st.dataframe(stock.major_holders)
-            except Exception as e:
-                st.error(f"major_holdersの取得に失敗しました: {str(e)}")
-
-            try:
-                # 投資信託による保有情報
-                st.header("Ticker.mutualfund_holders")
-                st.dataframe(stock.mutualfund_holders)
-            except Exception as e:
-                st.error(f"mutualfund_holdersの取得に失敗しました: {str(e)}")
-
-            try:
-                # 関連ニュース記事
-                st.header("Ticker.news")
-                st.dataframe(stock.news)
-            except Exception as e:
-                st.error(f"newsの取得に失敗しました: {str(e)}")
-
-            try:
-                # オプションの満期日
-                st.header("Ticker.options")
-                st.dataframe(stock.options)
-            except Exception as e:
-                st.error(f"optionsの取得に失敗しました: {str(e)}")
-
-            try:
-                # アナリストの推奨
-                st.header("Ticker.recommendations")
-                st.dataframe(stock.recommendations)
-            except Exception as e:
-                st.error(f"recommendationsの取得に失敗しました: {str(e)}")
-
-            try:
-                # 推奨情報のサマリー
-                st.header("Ticker.recommendations_summary")
-                st.dataframe(stock.recommendations_summary)
-            except Exception as e:
-                st.error(f"recommendations_summaryの取得に失敗しました: {str(e)}")
-
-            try:
-                # 売上高に関する見通し
-                st.header("Ticker.revenue_estimate")
-                st.dataframe(stock.revenue_estimate)
-            except Exception as e:
-                st.error(f"revenue_estimateの取得に失敗しました: {str(e)}")
-
-            try:
-                # SECへの報告書
-                st.header("Ticker.sec_filings")
-                st.dataframe(stock.sec_filings)
-            except Exception as e:
-                st.error(f"sec_filingsの取得に失敗しました: {str(e)}")
-
-            try:
-                # 発行済株式数
-                st.header("Ticker.shares")
-                st.dataframe(stock.shares)
-            except Exception as e:
-                st.error(f"sharesの取得に失敗しました: {str(e)}")
-
-            try:
-                # 発行済株式数
-                st.header("Ticker.get_shares()")
-                st.dataframe(stock.get_shares())
-            except Exception as e:
-                st.error(f"get_sharesの取得に失敗しました: {str(e)}")
-
-            try:
-                # 発行済株式数
-                st.header("Ticker.get_shares_full()")
-                st.dataframe(stock.get_shares_full())
-            except Exception as e:
-                st.error(f"get_shares_fullの取得に失敗しました: {str(e)}")
-
-            try:
-                # 株式分割
-                st.header("Ticker.splits")
-                st.dataframe(stock.splits)
-            except Exception as e:
-                st.error(f"splitsの取得に失敗しました: {str(e)}")
-
-            try:
-                # ESG・サステナビリティに関する評価
-                st.header("Ticker.sustainability")
-                st.dataframe(stock.sustainability)
-            except Exception as e:
-                st.error(f"sustainabilityの取得に失敗しました: {str(e)}")
-
-            try:
-                st.header("Ticker.ttm_cash_flow")
-                st.dataframe(stock.ttm_cash_flow)
-            except Exception as e:
-                st.error(f"ttm_cash_flowの取得に失敗しました: {str(e)}")
-
-            try:
-                st.header("Ticker.ttm_cashflow")
-                st.dataframe(stock.ttm_cashflow)
-            except Exception as e:
-                st.error(f"ttm_cashflowの取得に失敗しました: {str(e)}")
-
-            try:
-                st.header("Ticker.ttm_financials")
-                st.dataframe(stock.ttm_financials)
-            except Exception as e:
-                st.error(f"ttm_financialsの取得に失敗しました: {str(e)}")
-
-            try:
-                st.header("Ticker.ttm_income_stmt")
-                st.dataframe(stock.ttm_income_stmt)
-            except Exception as e:
-                st.error(f"ttm_income_stmtの取得に失敗しました: {str(e)}")
-
-            try:
-                st.header("Ticker.ttm_incomestmt")
-                st.dataframe(stock.ttm_incomestmt)
-            except Exception as e:
-                st.error(f"ttm_incomestmtの取得に失敗しました: {str(e)}")
-
-            try:
-                # アナリストによる格付けのアップ／ダウングレード
-                st.header("Ticker.upgrades_downgrades")
-                st.dataframe(stock.upgrades_downgrades)
-            except Exception as e:
-                st.error(f"upgrades_downgradesの取得に失敗しました: {str(e)}")
+                # アプリと共有する処理済み財務データ
+                st.header("処理済み財務データ（四半期）")
+                with st.spinner(f"'{ticker}'のデータを取得中..."):
+                    # アプリと同じく財務諸表キャッシュの有効期限まで処理結果を再利用する
+                    data_fetcher = DataFetcher(ticker, cache=StatementCache())
+                    financial_data = get_result_cache().get_or_process(
+                        ticker, PERIOD_QUARTERLY,
+                        lambda: DataProcessor(data_fetcher).process_financial_data(PERIOD_QUARTERLY),
+                        expires_at=lambda: data_fetcher.statements_expire_at,
+                        changed=lambda: data_fetcher.statements_changed
+                    )
+                if financial_data is not None:
+                    st.dataframe(financial_data.to_frame())
+                st.caption(f"キャッシュ統計: {get_result_cache().stats}")
+                st.caption(f"同時取得の集約: {get_default_single_flight().metrics}")
+            except Exception as e:
+                st.error(f"処理済み財務データの取得に失敗しました: {str(e)}")
+
+            # yfinanceの属性（セクションごとに読み込む）
+            st.header("yfinanceの属性")
+            render_sections(ticker)
 
         except Exception as e:
             st.error(f"エラーが発生しました: {str(e)}")
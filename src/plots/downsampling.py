@@ -0,0 +1,109 @@
+"""グラフ表示用のデータ削減モジュール
+
+長期間の時系列をブラウザに送る前に、折れ線の点数を間引き、数値の桁数を丸める。
+間引きには Largest-Triangle-Three-Buckets（LTTB）法を用い、山や谷など見た目の形状を保つ。
+"""
+import numpy as np
+from utils.constants import RENDER_SIGNIFICANT_DIGITS
+
+
+def lttb_indices(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    LTTB法で残す点の位置を選ぶ
+    x座標は等間隔（配列の位置）とみなす。欠損値（NaN）で区切られた区間ごとに間引き、
+    区間の間には欠損値の点を1つ残すため、間引き前と同じく折れ線は途切れて描画される
+    Args:
+        y (np.ndarray): 値の配列
+        threshold (int): 残す点数の上限（3未満の場合は間引かない。区間が多い場合は区間ごとに
+            最低1点を残すため上限を超えることがある）
+    Returns:
+        np.ndarray: 残す点の位置（昇順）
+    """
+    y = np.asarray(y, dtype=float)
+    if threshold < 3 or len(y) <= threshold:
+        return np.arange(len(y))
+
+    # 欠損値でない点が連続する区間 [start, end)
+    finite = np.isfinite(y).astype(np.int8)
+    changes = np.flatnonzero(np.diff(np.concatenate(([0], finite, [0]))))
+    runs = list(zip(changes[0::2], changes[1::2]))
+    if not runs:
+        return np.empty(0, dtype=int)
+
+    # 区間の間に残す欠損値の点を除いた点数を、区間の長さに応じて割り当てる
+    budget = max(threshold - (len(runs) - 1), len(runs))
+    lengths = np.array([end - start for start, end in runs])
+    quotas = np.minimum(np.maximum(lengths * budget // lengths.sum(), 1), lengths)
+
+    selected = []
+    for i, ((start, end), quota) in enumerate(zip(runs, quotas)):
+        if i > 0:
+            selected.append(np.array([start - 1]))
+        selected.append(start + _lttb(y[start:end], int(quota)))
+    return np.concatenate(selected)
+
+
+def _lttb(values: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    欠損値を含まない区間をLTTB法で間引く
+    Args:
+        values (np.ndarray): 値の配列（欠損値なし）
+        threshold (int): 残す点数（1の場合は先頭、2の場合は両端のみ）
+    Returns:
+        np.ndarray: 残す点の位置（区間の先頭からの位置、昇順）
+    """
+    n = len(values)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1][:threshold])
+
+    x = np.arange(n, dtype=float)
+
+    # 先頭と末尾は必ず残し、残りを threshold - 2 個のバケットに分ける
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 次のバケットの平均（最後のバケットの次は末尾の点）
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_start:next_end].mean()
+        next_y = values[next_start:next_end].mean()
+
+        # 前に選んだ点・候補・次のバケットの平均で作る三角形の面積が最大の点を選ぶ
+        areas = np.abs(
+            (x[previous] - next_x) * (values[start:end] - values[previous])
+            - (x[previous] - x[start:end]) * (next_y - values[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def round_significant(values: np.ndarray, digits: int = RENDER_SIGNIFICANT_DIGITS) -> np.ndarray:
+    """
+    数値を有効桁数で丸める（JSONに書き出す桁数を減らすため）
+    Args:
+        values (np.ndarray): 値の配列
+        digits (int): 有効桁数
+    Returns:
+        np.ndarray: 丸めた値の配列（0・欠損値・無限大はそのまま）
+    """
+    values = np.asarray(values, dtype=float)
+    result = values.copy()
+    target = np.isfinite(values) & (values != 0)
+    if not target.any():
+        return result
+
+    # 10のべき乗で割る・掛けることで、丸めた値が最も短い10進表現になるようにする
+    exponents = digits - 1 - np.floor(np.log10(np.abs(values[target]))).astype(int)
+    scale = 10.0 ** np.abs(exponents)
+    scaled = np.where(exponents >= 0, values[target] * scale, values[target] / scale)
+    rounded = np.round(scaled)
+    result[target] = np.where(exponents >= 0, rounded / scale, rounded * scale)
+    return result
@@ -0,0 +1,121 @@
+"""チャートキャッシュモジュール"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+import plotly.graph_objects as go
+import plotly.io as pio
+from data.data_version import DATA_VERSION
+from utils.models import FinancialDataModel
+from utils.constants import FIGURE_CACHE_MAX_ENTRIES
+from utils.tracing import span
+
+
+def fingerprint(data: FinancialDataModel) -> str:
+    """
+    財務データの内容からハッシュ値を計算
+    内容が同じであれば、別のオブジェクト（別セッション）でも同じ値になる
+    Args:
+        data (FinancialDataModel): 財務データモデル
+    Returns:
+        str: ハッシュ値（16進数）
+    """
+    digest = hashlib.blake2b(DATA_VERSION.encode(), digest_size=16)
+    digest.update("\0".join(data.columns).encode())
+    digest.update(data.dates.asi8.tobytes())
+    # 全指標は1つの連続した配列のため、まとめてハッシュ化できる
+    digest.update(data.values.tobytes())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """シリアライズ済みチャートのキャッシュクラス
+
+    (財務データのハッシュ値, チャート種類) をキーにチャートのJSONを保持し、
+    上限を超えた場合は最も長く参照されていないエントリから破棄する（LRU）。
+    保持するのは変更できないJSON文字列のみで、チャートは取得のたびに復元するため、
+    あるセッションがグラフオブジェクトを変更しても他のセッションには影響しない。
+    """
+
+    def __init__(self, max_entries: int = FIGURE_CACHE_MAX_ENTRIES):
+        """
+        初期化
+        Args:
+            max_entries (int): 保持するエントリ数の上限
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_json(
+        self,
+        data: FinancialDataModel,
+        chart: str,
+        build: Callable[[FinancialDataModel], go.Figure]
+    ) -> str:
+        """
+        チャートのJSONを取得（キャッシュにない場合は作成して保存）
+        Args:
+            data (FinancialDataModel): 財務データモデル
+            chart (str): チャート種類
+            build (Callable[[FinancialDataModel], go.Figure]): チャート作成関数
+        Returns:
+            str: チャートのJSON
+        """
+        key = (fingerprint(data), chart)
+        with self._lock:
+            serialized = self._entries.get(key)
+            if serialized is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return serialized
+            self._stats["misses"] += 1
+
+        # チャート作成はロック外で行う（同時に作成された場合は後勝ち）
+        figure = build(data)
+        with span("FigureCache.serialize", chart=chart):
+            serialized = pio.to_json(figure, validate=False)
+        with self._lock:
+            self._entries[key] = serialized
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return serialized
+
+    def get_figure(
+        self,
+        data: FinancialDataModel,
+        chart: str,
+        build: Callable[[FinancialDataModel], go.Figure]
+    ) -> go.Figure:
+        """
+        チャートを取得
+        JSONは作成時に検証済みのため、復元時の検証は省略する
+        Args:
+            data (FinancialDataModel): 財務データモデル
+            chart (str): チャート種類
+            build (Callable[[FinancialDataModel], go.Figure]): チャート作成関数
+        Returns:
+            go.Figure: Plotlyのグラフオブジェクト
+        """
+        return go.Figure(json.loads(self.get_json(data, chart, build)), _validate=False)
+
+    def clear(self) -> None:
+        """
+        全エントリを削除
+        """
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        キャッシュ統計のスナップショット
+        Returns:
+            Dict[str, int]: ヒット数、ミス数、破棄数、エントリ数
+        """
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
@@ -1,42 +1,110 @@
 """チャート管理モジュール"""
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
 import plotly.graph_objects as go
 from utils.models import ChartConfig, FinancialDataModel
 from utils.formatting import format_dates
+from utils.constants import (
+    RENDER_MODE, RENDER_MODE_SVG, RENDER_MODE_WEBGL,
+    RENDER_WEBGL_THRESHOLD, RENDER_MAX_LINE_POINTS
+)
+from plots.downsampling import lttb_indices, round_significant
+from plots.figure_cache import FigureCache
+from utils.telemetry import get_registry
+from utils.tracing import span, traced
 
 
 class PlotManager:
     """チャート管理クラス"""
 
+    # 全セッションで共有するチャートキャッシュ
+    figure_cache: FigureCache = FigureCache()
+
+    @classmethod
+    def get_figure(cls, data: FinancialDataModel, chart: str) -> go.Figure:
+        """
+        チャートを取得（同じ内容の財務データで作成済みのチャートは再利用）
+        Args:
+            data (FinancialDataModel): 財務データモデル
+            chart (str): チャート作成メソッド名（例："create_roic_chart"）
+        Returns:
+            go.Figure: Plotlyのグラフオブジェクト（呼び出しごとに別のオブジェクト）
+        """
+        with span("PlotManager.get_figure", chart=chart):
+            return cls.figure_cache.get_figure(data, chart, getattr(cls, chart))
+
+    @staticmethod
+    def line_trace(
+        x: Sequence,
+        y: Sequence[float],
+        name: str,
+        render_mode: str = RENDER_MODE,
+        **kwargs
+    ) -> Union[go.Scatter, go.Scattergl]:
+        """
+        折れ線のトレースを作成
+        点数が上限を超える場合は形状を保つように間引き、多い場合は WebGL（Scattergl）で描画する
+        Args:
+            x (Sequence): 日付ラベル
+            y (Sequence[float]): 値（Noneの場合は空の系列）
+            name (str): 系列名
+            render_mode (str): 描画方式（"auto"、"svg"、"webgl"）
+            **kwargs: トレースのその他の設定（mode、yaxisなど）
+        Returns:
+            Union[go.Scatter, go.Scattergl]: Plotlyのトレース
+        """
+        values = np.asarray(y if y is not None else [], dtype=float)
+        if len(values) > RENDER_MAX_LINE_POINTS:
+            positions = lttb_indices(values, RENDER_MAX_LINE_POINTS)
+            x = [x[i] for i in positions]
+            values = values[positions]
+
+        use_webgl = render_mode == RENDER_MODE_WEBGL or (
+            render_mode != RENDER_MODE_SVG and len(values) > RENDER_WEBGL_THRESHOLD
+        )
+        trace = go.Scattergl if use_webgl else go.Scatter
+        return trace(x=list(x), y=round_significant(values), name=name, **kwargs)
+
     @staticmethod
+    def bar_trace(x: Sequence, y: Sequence[float], name: str, **kwargs) -> go.Bar:
+        """
+        棒グラフのトレースを作成（値は有効桁数で丸める）
+        Args:
+            x (Sequence): 日付ラベル
+            y (Sequence[float]): 値（Noneの場合は空の系列）
+            name (str): 系列名
+            **kwargs: トレースのその他の設定（yaxisなど）
+        Returns:
+            go.Bar: Plotlyのトレース
+        """
+        values = np.asarray(y if y is not None else [], dtype=float)
+        return go.Bar(x=list(x), y=round_significant(values), name=name, **kwargs)
+
+    @staticmethod
+    @traced()
     def create_financial_chart(
         dates: List,
-        config: ChartConfig
+        config: ChartConfig,
+        labels: Optional[List[str]] = None
     ) -> go.Figure:
         """
         財務データのチャートを作成
         Args:
             dates (List): 日付リスト
             config (ChartConfig): チャート設定
+            labels (Optional[List[str]], optional): フォーマット済みの日付ラベル. Defaults to None.
         Returns:
             go.Figure: Plotlyのグラフオブジェクト
         """
         fig = go.Figure()
 
-        # 日付のフォーマットを変更
-        formatted_dates = format_dates(dates)
+        # 日付のフォーマットを変更（フォーマット済みのラベルがあればそれを使う）
+        formatted_dates = labels if labels is not None else format_dates(dates)
 
         # 第1軸のデータを追加（棒グラフ）
         for name, values in config.primary_data.items():
             if values is not None:  # Noneチェックを追加
-                fig.add_trace(
-                    go.Bar(
-                        x=formatted_dates,
-                        y=values,
-                        name=name,
-                        yaxis="y"
-                    )
-                )
+                fig.add_trace(PlotManager.bar_trace(formatted_dates, values, name, yaxis="y"))
 
         # 第2軸のデータを追加（存在する場合）
         if config.secondary_data:
@@ -44,10 +112,10 @@ class PlotManager:
                 if values is not None:  # Noneチェックを追加
                     if "発行済株式数" in name:
                         fig.add_trace(
-                            go.Scatter(
-                                x=formatted_dates,
-                                y=values,
-                                name=name,
+                            PlotManager.line_trace(
+                                formatted_dates,
+                                values,
+                                name,
                                 mode="lines+markers",  # マーカーを追加して時間軸毎の変化を明確に
                                 yaxis="y2"
                             )
@@ -60,23 +128,17 @@ class PlotManager:
                         )
                     elif "配当性向" in name:
                         fig.add_trace(
-                            go.Scatter(
-                                x=formatted_dates,
-                                y=values,
-                                name=name,
+                            PlotManager.line_trace(
+                                formatted_dates,
+                                values,
+                                name,
                                 mode="lines+markers",  # マーカーを追加して時間軸毎の変化を明確に
                                 yaxis="y2"
                             )
                         )
                     else:
                         fig.add_trace(
-                            go.Scatter(
-                                x=formatted_dates,
-                                y=values,
-                                name=name,
-                                mode="lines",
-                                yaxis="y2"
-                            )
+                            PlotManager.line_trace(formatted_dates, values, name, mode="lines", yaxis="y2")
                         )
 
         # レイアウトの設定
@@ -103,6 +165,7 @@ class PlotManager:
         return fig
 
     @staticmethod
+    @traced()
     def create_performance_chart(data: FinancialDataModel) -> go.Figure:
         """
         業績確認チャートを作成
@@ -125,9 +188,10 @@ class PlotManager:
             }
         )
 
-        return PlotManager.create_financial_chart(data.dates, config)
+        return PlotManager.create_financial_chart(data.dates, config, data.date_labels)
 
     @staticmethod
+    @traced()
     def create_per_share_chart(data: FinancialDataModel) -> go.Figure:
         """
         1株当たりの価値チャートを作成
@@ -150,9 +214,10 @@ class PlotManager:
             }
         )
 
-        return PlotManager.create_financial_chart(data.dates, config)
+        return PlotManager.create_financial_chart(data.dates, config, data.date_labels)
 
     @staticmethod
+    @traced()
     def create_dividend_chart(data: FinancialDataModel) -> go.Figure:
         """
         配当チャートを作成
@@ -161,15 +226,6 @@ class PlotManager:
         Returns:
             go.Figure: Plotlyのグラフオブジェクト
         """
-        # 配当性向の計算（DPS / EPS * 100）
-        payout_ratio = []
-        if data.dps is not None and data.eps is not None:
-            for dps, eps in zip(data.dps, data.eps):
-                if eps != 0:
-                    payout_ratio.append((dps / eps) * 100)
-                else:
-                    payout_ratio.append(0)
-
         config = ChartConfig(
             title="配当",
             y1_title="金額",
@@ -178,12 +234,13 @@ class PlotManager:
             },
             y2_title="配当性向 (%)",
             secondary_data={
-                "配当性向": payout_ratio
+                "配当性向": data.payout_ratio
             }
         )
-        return PlotManager.create_financial_chart(data.dates, config)
+        return PlotManager.create_financial_chart(data.dates, config, data.date_labels)
 
     @staticmethod
+    @traced()
     def create_earning_power_chart(data: FinancialDataModel) -> go.Figure:
         """
         稼ぐ力チャートを作成
@@ -206,9 +263,10 @@ class PlotManager:
             }
         )
 
-        return PlotManager.create_financial_chart(data.dates, config)
+        return PlotManager.create_financial_chart(data.dates, config, data.date_labels)
 
     @staticmethod
+    @traced()
     def create_earning_power_profit_chart(data: FinancialDataModel) -> go.Figure:
         """
         稼ぐ力（利益）チャートを作成
@@ -218,20 +276,11 @@ class PlotManager:
             go.Figure: Plotlyのグラフオブジェクト
         """
         fig = go.Figure()
-        formatted_dates = format_dates(data.dates)
+        formatted_dates = data.date_labels
 
-        fig.add_trace(go.Bar(
-            x=formatted_dates,
-            y=data.operating_income,
-            name="営業利益"
-        ))
+        fig.add_trace(PlotManager.bar_trace(formatted_dates, data.operating_income, "営業利益"))
 
-        fig.add_trace(go.Scatter(
-            x=formatted_dates,
-            y=data.operating_cash_flow,
-            name="営業CF",
-            mode="lines+markers"
-        ))
+        fig.add_trace(PlotManager.line_trace(formatted_dates, data.operating_cash_flow, "営業CF", mode="lines+markers"))
 
         fig.update_layout(
             title="営業利益とCF",
@@ -244,6 +293,7 @@ class PlotManager:
         return fig
 
     @staticmethod
+    @traced()
     def create_earning_power_per_share_chart(data: FinancialDataModel) -> go.Figure:
         """
         稼ぐ力（1株当たり）チャートを作成
@@ -253,20 +303,11 @@ class PlotManager:
             go.Figure: Plotlyのグラフオブジェクト
         """
         fig = go.Figure()
-        formatted_dates = format_dates(data.dates)
+        formatted_dates = data.date_labels
 
-        fig.add_trace(go.Bar(
-            x=formatted_dates,
-            y=data.eps,
-            name="EPS"
-        ))
+        fig.add_trace(PlotManager.bar_trace(formatted_dates, data.eps, "EPS"))
 
-        fig.add_trace(go.Scatter(
-            x=formatted_dates,
-            y=data.operating_cash_flow_per_share,
-            name="営業CF/株",
-            mode="lines+markers"
-        ))
+        fig.add_trace(PlotManager.line_trace(formatted_dates, data.operating_cash_flow_per_share, "営業CF/株", mode="lines+markers"))
 
         fig.update_layout(
             title="1株当たり指標",
@@ -279,6 +320,7 @@ class PlotManager:
         return fig
 
     @staticmethod
+    @traced()
     def create_earning_power_margin_chart(data: FinancialDataModel) -> go.Figure:
         """
         稼ぐ力（マージン）チャートを作成
@@ -287,47 +329,23 @@ class PlotManager:
         Returns:
             go.Figure: Plotlyのグラフオブジェクト
         """
-        # FCFマージンの計算
-        fcf_margin = None
-        if data.operating_cash_flow is not None and data.revenue is not None:
-            fcf_margin = data.operating_cash_flow / data.revenue * 100
-
         fig = go.Figure()
 
-        # 日付のフォーマットを変更
-        formatted_dates = format_dates(data.dates)
+        # 日付ラベル（モデル作成時にフォーマット済み）
+        formatted_dates = data.date_labels
 
         # マージン指標を追加
-        fig.add_trace(
-            go.Scatter(
-                x=formatted_dates,
-                y=data.operating_margin,
-                name="営業利益率",
-                mode="lines"
-            )
-        )
+        fig.add_trace(PlotManager.line_trace(formatted_dates, data.operating_margin, "営業利益率", mode="lines"))
 
-        # 営業CFマージンを計算して追加
-        if data.operating_cash_flow is not None and data.revenue is not None:
-            cf_margin = data.operating_cash_flow / data.revenue * 100
+        # 営業CFマージンを追加（DataProcessorで計算済み）
+        if data.operating_cash_flow_margin is not None:
             fig.add_trace(
-                go.Scatter(
-                    x=formatted_dates,
-                    y=cf_margin,
-                    name="営業CFマージン",
-                    mode="lines"
-                )
+                PlotManager.line_trace(formatted_dates, data.operating_cash_flow_margin, "営業CFマージン", mode="lines")
             )
 
-        # FCFマージンを追加
-        if fcf_margin is not None:
+            # FCFマージンを追加（設備投資を取得していないため営業CFマージンと同じ値）
             fig.add_trace(
-                go.Scatter(
-                    x=formatted_dates,
-                    y=fcf_margin,
-                    name="FCFマージン",
-                    mode="lines"
-                )
+                PlotManager.line_trace(formatted_dates, data.operating_cash_flow_margin, "FCFマージン", mode="lines")
             )
 
         # 15%の参考線を追加
@@ -348,6 +366,7 @@ class PlotManager:
         return fig
 
     @staticmethod
+    @traced()
     def create_roic_chart(data: FinancialDataModel) -> go.Figure:
         """
         ROICチャートを作成
@@ -358,18 +377,11 @@ class PlotManager:
         """
         fig = go.Figure()
 
-        # 日付のフォーマットを変更
-        formatted_dates = format_dates(data.dates)
+        # 日付ラベル（モデル作成時にフォーマット済み）
+        formatted_dates = data.date_labels
 
         # ROICを追加
-        fig.add_trace(
-            go.Scatter(
-                x=formatted_dates,
-                y=data.roic,
-                name="ROIC",
-                mode="lines+markers"
-            )
-        )
+        fig.add_trace(PlotManager.line_trace(formatted_dates, data.roic, "ROIC", mode="lines+markers"))
 
         # 10%の参考線を追加
         fig.add_hline(y=10, line_dash="dash", line_color="gray", annotation_text="10%")
@@ -386,4 +398,11 @@ class PlotManager:
             legend={"orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "right", "x": 1}
         )
 
-        return fig
\ No newline at end of file
+        return fig
+
+
+# チャートキャッシュの統計を監視用メトリクスとして公開する
+get_registry().register_stats(
+    "figure_cache", "チャートキャッシュの統計",
+    lambda: PlotManager.figure_cache.stats, counters=("hits", "misses", "evictions")
+)
@@ -0,0 +1,158 @@
+"""財務データの事前計算ジョブ
+
+指定した銘柄の財務データ（四半期・年次）を処理し、アプリが読み込むストアに保存する。
+
+使用例:
+    python src/precompute.py --tickers AAPL MSFT GOOG
+    python src/precompute.py --tickers-file universe.txt --merge
+"""
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+from data.columnar_store import ColumnarStore
+from data.data_fetcher import DataFetcher
+from data.data_processor import DataProcessor
+from data.statement_cache import StatementCache
+from utils.models import FinancialDataModel
+from utils.telemetry import configure_logging, get_registry, log_event, write_metrics_textfile
+from utils.constants import (
+    BATCH_MAX_WORKERS, STORE_PATH, PERIOD_QUARTERLY, PERIOD_ANNUAL, METRICS_TEXTFILE_PATH
+)
+
+PERIODS = (PERIOD_QUARTERLY, PERIOD_ANNUAL)
+
+# ジョブの実行結果（textfile 形式で書き出し、定期実行の成否を監視する）
+LAST_RUN_TICKERS = get_registry().gauge("precompute_tickers", "前回の事前計算の銘柄数", ("result",))
+LAST_RUN_SECONDS = get_registry().gauge("precompute_duration_seconds", "前回の事前計算の所要時間")
+LAST_SUCCESS_TIME = get_registry().gauge(
+    "precompute_last_success_timestamp_seconds", "前回ストアを保存した時刻（UNIX時間）"
+)
+
+
+def read_universe(tickers: Optional[List[str]], tickers_file: Optional[str]) -> List[str]:
+    """
+    処理対象の銘柄一覧を作成
+    Args:
+        tickers (Optional[List[str]]): コマンドラインで指定された銘柄コード
+        tickers_file (Optional[str]): 銘柄コードを1行に1つ記載したファイル（#以降はコメント）
+    Returns:
+        List[str]: 重複を除いた銘柄コード（大文字）
+    """
+    universe = list(tickers or [])
+    if tickers_file:
+        with open(tickers_file, encoding="utf-8") as f:
+            for line in f:
+                ticker = line.split("#", 1)[0].strip()
+                if ticker:
+                    universe.append(ticker)
+    return list(dict.fromkeys(ticker.upper() for ticker in universe))
+
+
+def precompute(
+    tickers: Iterable[str],
+    max_workers: int = BATCH_MAX_WORKERS,
+    cache: Optional[StatementCache] = None,
+    store: Optional[ColumnarStore] = None
+) -> Dict[Tuple[str, str], FinancialDataModel]:
+    """
+    複数銘柄の財務データを全期間分処理
+    Args:
+        tickers (Iterable[str]): 銘柄コードの一覧
+        max_workers (int): 同時に処理する銘柄数の上限
+        cache (Optional[StatementCache]): 財務諸表キャッシュ
+        store (Optional[ColumnarStore]): 前回の結果を持つストア（元データが変わった期のみ再計算する）
+    Returns:
+        Dict[Tuple[str, str], FinancialDataModel]: (銘柄コード, 期間) と処理済み財務データの辞書
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for ticker in tickers:
+            previous = {
+                period: store.load(ticker, period) for period in PERIODS
+            } if store is not None else None
+            futures[executor.submit(_process_ticker, ticker, cache, previous)] = ticker
+        for future in as_completed(futures):
+            ticker = futures[future]
+            for period, model in future.result().items():
+                if model is not None:
+                    results[(ticker, period)] = model
+    return results
+
+
+def _process_ticker(
+    ticker: str,
+    cache: Optional[StatementCache],
+    previous: Optional[Dict[str, Optional[FinancialDataModel]]] = None
+) -> Dict[str, Optional[FinancialDataModel]]:
+    """
+    1銘柄の財務データを全期間分処理（例外は他の銘柄に波及させない）
+    Args:
+        ticker (str): 銘柄コード
+        cache (Optional[StatementCache]): 財務諸表キャッシュ
+        previous (Optional[Dict[str, Optional[FinancialDataModel]]]): 期間ごとの前回の処理結果
+    Returns:
+        Dict[str, Optional[FinancialDataModel]]: 期間ごとの処理結果（失敗時は空）
+    """
+    try:
+        return DataProcessor(DataFetcher(ticker, cache=cache)).process_all_periods(previous)
+    except Exception as e:
+        log_event("ticker_failed", f"{ticker}の処理に失敗しました: {str(e)}", level=logging.ERROR, ticker=ticker)
+        return {}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    事前計算ジョブを実行
+    Args:
+        argv (Optional[List[str]]): コマンドライン引数
+    Returns:
+        int: 終了コード（1銘柄も処理できなかった場合は1）
+    """
+    parser = argparse.ArgumentParser(description="財務データを事前計算してストアに保存します")
+    parser.add_argument("--tickers", nargs="*", help="処理する銘柄コード")
+    parser.add_argument("--tickers-file", help="銘柄コードを1行に1つ記載したファイル")
+    parser.add_argument("--output", default=STORE_PATH, help="保存先（.arrow または .parquet）")
+    parser.add_argument("--max-workers", type=int, default=BATCH_MAX_WORKERS, help="同時に処理する銘柄数")
+    parser.add_argument("--merge", action="store_true", help="処理できなかった銘柄は既存ストアの結果を残す")
+    parser.add_argument(
+        "--metrics-file", default=METRICS_TEXTFILE_PATH,
+        help="実行結果のメトリクスの出力先（node_exporter の textfile 形式）"
+    )
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    universe = read_universe(args.tickers, args.tickers_file)
+    if not universe:
+        parser.error("--tickers または --tickers-file で銘柄を指定してください")
+
+    started = time.monotonic()
+    store = ColumnarStore(args.output)
+    results = precompute(universe, args.max_workers, StatementCache(), store)
+    succeeded = {ticker for ticker, _ in results}
+    elapsed = time.monotonic() - started
+    print(f"{len(universe)}銘柄中{len(succeeded)}銘柄を{elapsed:.1f}秒で処理しました")
+    LAST_RUN_TICKERS.set(len(succeeded), result="succeeded")
+    LAST_RUN_TICKERS.set(len(universe) - len(succeeded), result="failed")
+    LAST_RUN_SECONDS.set(elapsed)
+    if not results:
+        write_metrics_textfile(args.metrics_file)
+        return 1
+
+    if args.merge:
+        for ticker, period in store.keys():
+            if ticker not in succeeded:
+                results[(ticker, period)] = store.load(ticker, period)
+
+    store.save(results)
+    print(f"{len(results)}件を保存しました: {args.output}")
+    LAST_SUCCESS_TIME.set(time.time())
+    write_metrics_textfile(args.metrics_file)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
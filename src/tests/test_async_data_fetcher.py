@@ -0,0 +1,180 @@
+"""AsyncDataFetcherのテスト"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+import pandas as pd
+from data.async_data_fetcher import AsyncDataFetcher
+from data.data_fetcher import DataFetcher
+from data.data_processor import DataProcessor
+from data.single_flight import get_default_single_flight
+from utils.models import FinancialDataModel
+from utils.constants import (
+    PERIOD_QUARTERLY, YF_REVENUE, YF_OPERATING_INCOME, YF_NET_INCOME, YF_OPERATING_CASH_FLOW,
+    YF_STOCKHOLDER_EQUITY, YF_TOTAL_DEBT, YF_TAX_RATE, YF_DILUTED_SHARES
+)
+
+
+class TestAsyncDataFetcher:
+    """AsyncDataFetcherのテストクラス"""
+
+    def _mock_fetcher(self, delay=0.0):
+        """呼び出し回数を数えるDataFetcherのモック"""
+        income = pd.DataFrame(
+            {'2023-12-31': [100.0, 10.0], '2023-09-30': [90.0, 10.0]},
+            index=['Total Revenue', YF_DILUTED_SHARES]
+        )
+        calls = []
+
+        def get_income_statement(period):
+            calls.append(period)
+            time.sleep(delay)
+            return income
+
+        mock = MagicMock(spec=DataFetcher)
+        mock.ticker = 'AAPL'
+        mock.backend = MagicMock()
+        mock.backend.name = 'yfinance'
+        mock.get_income_statement.side_effect = get_income_statement
+        mock.get_balance_sheet.return_value = pd.DataFrame()
+        mock.get_cash_flow.return_value = pd.DataFrame()
+        mock.get_dividends.return_value = pd.Series(dtype=float)
+        return mock, calls
+
+    def test_get_income_statement(self):
+        """損益計算書の取得のテスト"""
+        mock, _ = self._mock_fetcher()
+        fetcher = AsyncDataFetcher('AAPL', fetcher=mock)
+
+        income = asyncio.run(fetcher.get_income_statement(PERIOD_QUARTERLY))
+        shares = asyncio.run(fetcher.get_shares_outstanding(PERIOD_QUARTERLY))
+
+        assert income.loc['Total Revenue'].tolist() == [100.0, 90.0]
+        assert shares.tolist() == [10.0, 10.0]
+        assert get_default_single_flight().in_flight == 0
+
+    def test_coalesce_concurrent_requests(self):
+        """同じ銘柄を同時に要求した場合に取得が1回になることのテスト"""
+        mock, calls = self._mock_fetcher(delay=0.2)
+        fetchers = [AsyncDataFetcher('AAPL', fetcher=mock), AsyncDataFetcher('aapl', fetcher=mock)]
+
+        async def run():
+            return await asyncio.gather(*(
+                fetcher.get_income_statement(PERIOD_QUARTERLY) for fetcher in fetchers
+            ))
+
+        first, second = asyncio.run(run())
+
+        assert calls == [PERIOD_QUARTERLY]
+        assert first is second
+        assert get_default_single_flight().in_flight == 0
+
+    def test_coalesce_across_event_loops(self):
+        """別スレッドのイベントループからの要求も取得を共有することのテスト"""
+        mock, calls = self._mock_fetcher(delay=0.2)
+        results = []
+
+        def session():
+            fetcher = AsyncDataFetcher('AAPL', fetcher=mock)
+            results.append(asyncio.run(fetcher.get_income_statement(PERIOD_QUARTERLY)))
+
+        threads = [threading.Thread(target=session) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert len(results) == 3
+
+    def test_cancelled_waiter_does_not_cancel_fetch(self):
+        """待機側がタイムアウトしても共有中の取得は継続することのテスト"""
+        mock, calls = self._mock_fetcher(delay=0.2)
+        fetcher = AsyncDataFetcher('AAPL', fetcher=mock)
+
+        async def run():
+            impatient = asyncio.wait_for(fetcher.get_income_statement(PERIOD_QUARTERLY), timeout=0.01)
+            patient = fetcher.get_income_statement(PERIOD_QUARTERLY)
+            return await asyncio.gather(impatient, patient, return_exceptions=True)
+
+        impatient, patient = asyncio.run(run())
+
+        assert isinstance(impatient, asyncio.TimeoutError)
+        assert isinstance(patient, pd.DataFrame)
+        assert len(calls) == 1
+
+    def test_process_financial_data_async(self):
+        """DataProcessorの非同期処理のテスト"""
+        dates = ['2023-12-31', '2023-09-30']
+        mock = MagicMock(spec=DataFetcher)
+        mock.ticker = 'MSFT'
+        mock.backend = MagicMock()
+        mock.backend.name = 'yfinance'
+        mock.get_income_statement.return_value = pd.DataFrame(
+            {date: [100.0, 20.0, 15.0, 0.2, 10.0] for date in dates},
+            index=[YF_REVENUE, YF_OPERATING_INCOME, YF_NET_INCOME, YF_TAX_RATE, YF_DILUTED_SHARES]
+        )
+        mock.get_balance_sheet.return_value = pd.DataFrame(
+            {date: [50.0, 150.0] for date in dates}, index=[YF_TOTAL_DEBT, YF_STOCKHOLDER_EQUITY]
+        )
+        mock.get_cash_flow.return_value = pd.DataFrame(
+            {date: [25.0] for date in dates}, index=[YF_OPERATING_CASH_FLOW]
+        )
+        mock.get_dividends.return_value = pd.Series(dtype=float)
+
+        model = asyncio.run(DataProcessor(mock).process_financial_data_async(PERIOD_QUARTERLY))
+
+        assert isinstance(model, FinancialDataModel)
+        assert len(model.dates) == 2
+        assert model.eps.tolist() == [1.5, 1.5]
+        assert model.operating_margin.tolist() == [20.0, 20.0]
+        mock.get_dividends.assert_called_once_with()
+
+    def test_backends_not_shared(self):
+        """取得元が異なる場合は同時に要求しても取得を共有しないことのテスト"""
+        yfinance_mock, yfinance_calls = self._mock_fetcher(delay=0.2)
+        fixture_mock, fixture_calls = self._mock_fetcher(delay=0.2)
+        fixture_mock.backend.name = 'fixture'
+
+        async def run():
+            return await asyncio.gather(
+                AsyncDataFetcher('AAPL', fetcher=yfinance_mock).get_income_statement(PERIOD_QUARTERLY),
+                AsyncDataFetcher('AAPL', fetcher=fixture_mock).get_income_statement(PERIOD_QUARTERLY),
+            )
+
+        asyncio.run(run())
+        assert len(yfinance_calls) == 1
+        assert len(fixture_calls) == 1
+
+    def test_ticker_required(self):
+        """銘柄コードのない取得クラスでは処理せずNoneを返すことのテスト"""
+        mock, calls = self._mock_fetcher()
+        mock.ticker = None
+
+        with pytest.raises(ValueError):
+            AsyncDataFetcher(None, fetcher=mock)
+        assert asyncio.run(DataProcessor(mock).process_financial_data_async(PERIOD_QUARTERLY)) is None
+        assert calls == []
+
+    def test_process_financial_data_async_failure(self):
+        """取得に失敗した場合にNoneを返すことのテスト"""
+        mock, _ = self._mock_fetcher()
+        mock.get_income_statement.side_effect = RuntimeError('upstream error')
+
+        assert asyncio.run(DataProcessor(mock).process_financial_data_async(PERIOD_QUARTERLY)) is None
+
+    def test_fetch_statements_async_timeout(self):
+        """タイムアウトした諸表がNoneになることのテスト"""
+        mock, _ = self._mock_fetcher()
+        release = threading.Event()
+        mock.get_cash_flow.side_effect = lambda period: release.wait(5)
+        processor = DataProcessor(mock)
+
+        try:
+            bundle = asyncio.run(processor.fetch_statements_async(PERIOD_QUARTERLY, timeout=0.1))
+        finally:
+            release.set()
+
+        assert bundle.cash_flow is None
+        assert bundle.income is not None
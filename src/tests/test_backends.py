@@ -0,0 +1,135 @@
+"""データ取得元（バックエンド）のテスト"""
+import pytest
+from unittest.mock import MagicMock, patch
+import pandas as pd
+from data.backends import (
+    DataBackend, FixtureBackend, RecordingBackend, YFinanceBackend, create_backend, record_fixtures
+)
+from data.data_fetcher import DataFetcher
+from data.data_processor import DataProcessor
+from data.request_scheduler import RequestScheduler
+from utils.constants import (
+    PERIOD_QUARTERLY, PERIOD_ANNUAL,
+    STATEMENT_INCOME, STATEMENT_BALANCE, STATEMENT_CASH_FLOW, STATEMENT_DIVIDENDS
+)
+
+
+class StaticBackend(DataBackend):
+    """固定の財務諸表を返すバックエンド"""
+
+    name = "static"
+
+    def __init__(self):
+        dates = pd.to_datetime(['2023-12-31', '2023-09-30', '2023-06-30', '2023-03-31'])
+        self.statements = {
+            STATEMENT_INCOME: pd.DataFrame(
+                [[100000.0, 90000.0, 85000.0, 80000.0],
+                 [20000.0, 18000.0, 17000.0, 16000.0],
+                 [15000.0, 13000.0, 12000.0, 11000.0],
+                 [0.2, 0.2, 0.2, 0.2],
+                 [1e6, 1e6, 1e6, 1e6]],
+                index=['Total Revenue', 'Operating Income', 'Net Income',
+                       'Tax Rate For Calcs', 'Diluted Average Shares'],
+                columns=dates
+            ),
+            STATEMENT_BALANCE: pd.DataFrame(
+                [[200000.0, 190000.0, 180000.0, 170000.0], [50000.0, 50000.0, 50000.0, 50000.0]],
+                index=['Stockholders Equity', 'Total Debt'],
+                columns=dates
+            ),
+            STATEMENT_CASH_FLOW: pd.DataFrame(
+                [[25000.0, 23000.0, 22000.0, 21000.0]], index=['Operating Cash Flow'], columns=dates
+            ),
+            STATEMENT_DIVIDENDS: pd.Series(
+                [0.25, 0.25, 0.25, 0.25],
+                index=pd.to_datetime(['2023-02-15', '2023-05-15', '2023-08-15', '2023-11-15']).tz_localize('America/New_York')
+            ),
+        }
+        self.calls = []
+
+    def get_statement(self, ticker, statement, period):
+        self.calls.append((ticker, statement, period))
+        return self.statements[statement]
+
+    def get_calendar(self, ticker):
+        return {'Earnings Date': [pd.Timestamp('2099-01-30').date()]}
+
+
+class TestBackends:
+    """バックエンドのテストクラス"""
+
+    @pytest.fixture
+    def scheduler(self):
+        """待機しないリクエスト制御"""
+        return RequestScheduler(rate_per_second=1e6, burst=1000, max_retries=0)
+
+    def test_fixture_round_trip(self, tmp_path):
+        """記録した財務諸表が同じ形式で読み込めることのテスト"""
+        source = StaticBackend()
+        fixtures = FixtureBackend(str(tmp_path))
+        recorder = RecordingBackend(source, fixtures)
+
+        for statement in (STATEMENT_INCOME, STATEMENT_BALANCE, STATEMENT_CASH_FLOW):
+            recorder.get_statement('aapl', statement, PERIOD_QUARTERLY)
+        recorder.get_statement('aapl', STATEMENT_DIVIDENDS, None)
+        recorder.get_calendar('aapl')
+
+        replay = FixtureBackend(str(tmp_path))
+        income = replay.get_statement('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY)
+        pd.testing.assert_frame_equal(income, source.statements[STATEMENT_INCOME], check_freq=False)
+        dividends = replay.get_statement('AAPL', STATEMENT_DIVIDENDS, None)
+        pd.testing.assert_series_equal(dividends, source.statements[STATEMENT_DIVIDENDS], check_freq=False)
+        assert replay.get_calendar('AAPL') == {'Earnings Date': ['2099-01-30']}
+
+        # 読み込んだ諸表はメモリに保持する
+        assert replay.get_statement('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY) is income
+
+    def test_fixture_missing(self, tmp_path):
+        """記録がない場合は空のデータを返すことのテスト"""
+        fixtures = FixtureBackend(str(tmp_path))
+
+        assert fixtures.get_statement('AAPL', STATEMENT_INCOME, PERIOD_ANNUAL).empty
+        assert fixtures.get_statement('AAPL', STATEMENT_DIVIDENDS, None).empty
+        assert fixtures.get_calendar('AAPL') == {}
+
+    def test_data_fetcher_uses_backend(self, tmp_path, scheduler):
+        """DataFetcherが指定したバックエンドから取得し、処理できることのテスト"""
+        record_fixtures(['AAPL'], FixtureBackend(str(tmp_path)), source=StaticBackend())
+        fixtures = FixtureBackend(str(tmp_path))
+
+        fetcher = DataFetcher('AAPL', scheduler=scheduler, backend=fixtures)
+        financial_data = DataProcessor(fetcher).process_financial_data(PERIOD_QUARTERLY)
+
+        assert financial_data is not None
+        assert financial_data.revenue.tolist() == [80000.0, 85000.0, 90000.0, 100000.0]
+        assert fetcher.get_next_earnings_date() == pd.Timestamp('2099-01-30')
+        assert fetcher.upstream_call_count == 5
+
+    @patch('yfinance.Ticker')
+    def test_yfinance_backend(self, mock_yf_ticker):
+        """yfinanceの属性を期間に応じて参照することのテスト"""
+        mock_ticker = MagicMock()
+        mock_yf_ticker.return_value = mock_ticker
+        backend = YFinanceBackend()
+
+        assert backend.get_statement('AAPL', STATEMENT_INCOME, PERIOD_ANNUAL) is mock_ticker.income_stmt
+        assert backend.get_statement('AAPL', STATEMENT_CASH_FLOW, PERIOD_QUARTERLY) is mock_ticker.quarterly_cashflow
+        assert backend.get_calendar('AAPL') is None
+        # 同じ銘柄の yf.Ticker は使い回す
+        mock_yf_ticker.assert_called_once_with('AAPL')
+
+    def test_incomplete_backend(self):
+        """取得処理を実装しないバックエンドは作成できないことのテスト"""
+        class IncompleteBackend(DataBackend):
+            def get_statement(self, ticker, statement, period):
+                return pd.DataFrame()
+
+        with pytest.raises(TypeError):
+            IncompleteBackend()
+
+    def test_create_backend(self):
+        """名前からのバックエンド作成のテスト"""
+        assert isinstance(create_backend('yfinance'), YFinanceBackend)
+        assert create_backend('fixture') is create_backend('fixture')
+        with pytest.raises(ValueError):
+            create_backend('unknown')
@@ -0,0 +1,82 @@
+"""ColumnarStoreのテスト"""
+import pytest
+import numpy as np
+import pyarrow as pa
+from datetime import datetime
+from unittest.mock import patch
+from data.columnar_store import ColumnarStore
+from utils.models import FinancialDataModel
+from utils.constants import PERIOD_QUARTERLY, PERIOD_ANNUAL
+
+
+class TestColumnarStore:
+    """ColumnarStoreのテストクラス"""
+
+    @pytest.fixture
+    def models(self):
+        """保存する財務データ"""
+        quarterly = FinancialDataModel({
+            "dates": [datetime(2023, 9, 30), datetime(2023, 12, 31)],
+            "revenue": [90000.0, 100000.0],
+            "eps": [0.013, 0.015],
+            "dps": [0.01, 0.01]
+        })
+        annual = FinancialDataModel({
+            "dates": [datetime(2023, 12, 31)],
+            "revenue": [380000.0],
+            "roic": [12.0]
+        })
+        return {('AAPL', PERIOD_QUARTERLY): quarterly, ('MSFT', PERIOD_ANNUAL): annual}
+
+    @pytest.mark.parametrize("filename", ["store.arrow", "store.parquet"])
+    def test_round_trip(self, tmp_path, models, filename):
+        """保存と読み込みのテスト"""
+        ColumnarStore(str(tmp_path / filename)).save(models)
+        store = ColumnarStore(str(tmp_path / filename))
+
+        assert sorted(store.keys()) == [('AAPL', PERIOD_QUARTERLY), ('MSFT', PERIOD_ANNUAL)]
+        for (ticker, period), model in models.items():
+            loaded = store.load(ticker.lower(), period)
+            assert loaded.columns == model.columns
+            assert list(loaded.dates) == list(model.dates)
+            assert np.array_equal(loaded.values, model.values, equal_nan=True)
+
+        # 元データになかった任意の指標はNoneのまま
+        assert store.load('MSFT', PERIOD_ANNUAL).dps is None
+        assert store.load('AAPL', PERIOD_ANNUAL) is None
+        assert ('AAPL', PERIOD_QUARTERLY) in store
+        assert store.created_at is not None
+
+    def test_memory_mapped(self, tmp_path, models):
+        """Arrow形式がメモリマップで読み込まれることのテスト"""
+        path = str(tmp_path / "store.arrow")
+        ColumnarStore(path).save(models)
+
+        allocated = pa.total_allocated_bytes()
+        store = ColumnarStore(path)
+        store.load('AAPL', PERIOD_QUARTERLY)
+        assert pa.total_allocated_bytes() == allocated
+
+    def test_reopen_after_replace(self, tmp_path, models):
+        """ファイルが置き換えられた場合に開き直すことのテスト"""
+        path = str(tmp_path / "store.arrow")
+        store = ColumnarStore(path)
+        store.save({('AAPL', PERIOD_QUARTERLY): models[('AAPL', PERIOD_QUARTERLY)]})
+        assert store.keys() == [('AAPL', PERIOD_QUARTERLY)]
+
+        ColumnarStore(path).save(models)
+        assert len(store.keys()) == 2
+
+    def test_missing_file(self, tmp_path):
+        """ストアがない場合のテスト"""
+        store = ColumnarStore(str(tmp_path / "missing.arrow"))
+        assert store.load('AAPL', PERIOD_QUARTERLY) is None
+        assert store.keys() == []
+
+    def test_version_mismatch(self, tmp_path, models):
+        """データバージョンが異なるストアを使わないことのテスト"""
+        path = str(tmp_path / "store.arrow")
+        ColumnarStore(path).save(models)
+
+        with patch('data.columnar_store.DATA_VERSION', 'other'):
+            assert ColumnarStore(path).load('AAPL', PERIOD_QUARTERLY) is None
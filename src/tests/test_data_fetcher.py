@@ -1,10 +1,15 @@
 """DataFetcherのテスト"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, PropertyMock
 import pandas as pd
 import numpy as np
-from data.data_fetcher import DataFetcher
-from utils.constants import PERIOD_QUARTERLY, PERIOD_ANNUAL
+from data.data_fetcher import DataFetcher, UPSTREAM_ERRORS, UPSTREAM_LATENCY, UPSTREAM_REQUESTS
+from data.request_scheduler import RequestScheduler
+from data.single_flight import SingleFlight
+from utils.constants import PERIOD_QUARTERLY, PERIOD_ANNUAL, STATEMENT_INCOME
 
 class TestDataFetcher:
     """DataFetcherのテストクラス"""
@@ -116,3 +121,71 @@ class TestDataFetcher:
         assert dividends is not None
         assert len(dividends) == 4
         assert dividends.iloc[0] == 1.0
+
+    @patch('yfinance.Ticker')
+    def test_statements_fetched_once(self, mock_yf_ticker, mock_ticker):
+        """同じ財務諸表を二度取得しないことのテスト"""
+        income = mock_ticker.quarterly_income_stmt.copy()
+        income.loc['Diluted Average Shares'] = 1000000
+        income.loc['Tax Rate For Calcs'] = 0.2
+        income_property = PropertyMock(return_value=income)
+        type(mock_ticker).quarterly_income_stmt = income_property
+        mock_yf_ticker.return_value = mock_ticker
+
+        fetcher = DataFetcher('AAPL')
+        assert fetcher.get_income_statement(PERIOD_QUARTERLY) is not None
+        assert fetcher.get_shares_outstanding(PERIOD_QUARTERLY) is not None
+        assert fetcher.get_tax_rate(PERIOD_QUARTERLY) is not None
+
+        assert income_property.call_count == 1
+        assert fetcher.upstream_call_count == 1
+
+    @patch('yfinance.Ticker')
+    def test_concurrent_fetchers_share_request(self, mock_yf_ticker, mock_ticker):
+        """別インスタンスからの同時取得が1回の取得を共有することのテスト"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_income():
+            started.set()
+            release.wait(5)
+            return mock_ticker.income_stmt
+
+        type(mock_ticker).quarterly_income_stmt = PropertyMock(side_effect=slow_income)
+        mock_yf_ticker.return_value = mock_ticker
+        single_flight = SingleFlight()
+        fetchers = [DataFetcher('AAPL', single_flight=single_flight) for _ in range(3)]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(fetchers[0].get_income_statement, PERIOD_QUARTERLY)
+            started.wait(5)
+            followers = [executor.submit(f.get_income_statement, PERIOD_QUARTERLY) for f in fetchers[1:]]
+            # 後続の呼び出しが実行中の取得に合流するまで待つ
+            while single_flight.metrics["shared"] < 2:
+                time.sleep(0.01)
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert all(result is results[0] for result in results)
+        assert [f.upstream_call_count for f in fetchers] == [1, 0, 0]
+        assert single_flight.metrics["dedup_ratio"] == pytest.approx(2 / 3)
+
+    @patch('yfinance.Ticker')
+    def test_upstream_metrics(self, mock_yf_ticker, mock_ticker):
+        """上流への呼び出し回数・失敗回数・時間が記録されることのテスト"""
+        type(mock_ticker).income_stmt = PropertyMock(side_effect=RuntimeError("接続エラー"))
+        mock_yf_ticker.return_value = mock_ticker
+        quarterly = {"backend": "yfinance", "statement": STATEMENT_INCOME, "period": PERIOD_QUARTERLY}
+        annual = {**quarterly, "period": PERIOD_ANNUAL}
+        requests = UPSTREAM_REQUESTS.get(**quarterly)
+        errors = UPSTREAM_ERRORS.get(**annual)
+        observed = UPSTREAM_LATENCY.count(backend="yfinance", statement=STATEMENT_INCOME)
+
+        scheduler = RequestScheduler(rate_per_second=1e6, burst=1000, max_retries=0)
+        fetcher = DataFetcher('AAPL', scheduler=scheduler, single_flight=SingleFlight())
+        assert fetcher.get_income_statement(PERIOD_QUARTERLY) is not None
+        assert fetcher.get_income_statement(PERIOD_ANNUAL) is None
+
+        assert UPSTREAM_REQUESTS.get(**quarterly) == requests + 1
+        assert UPSTREAM_ERRORS.get(**annual) == errors + 1
+        assert UPSTREAM_LATENCY.count(backend="yfinance", statement=STATEMENT_INCOME) == observed + 2
@@ -1,9 +1,11 @@
 """DataProcessorのテスト"""
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 import pandas as pd
 import numpy as np
 from data.data_processor import DataProcessor
+from utils.models import FinancialDataModel
 from data.data_fetcher import DataFetcher
 from utils.constants import PERIOD_QUARTERLY, PERIOD_ANNUAL
 
@@ -122,27 +124,145 @@ class TestDataProcessor:
         assert normalized['revenue'][0] == 100000
         assert normalized['operating_income'][0] == 20000
 
-    def test_process_dividends(self, mock_data_fetcher):
-        """配当データ処理のテスト"""
+    def test_dividends_per_period(self, mock_data_fetcher):
+        """配当データの期間ごとの集計のテスト"""
         processor = DataProcessor(mock_data_fetcher)
-
-        # テスト用の正規化データ
-        normalized_data = {
-            'dates': pd.DatetimeIndex(['2023-12-31', '2023-09-30', '2023-06-30', '2023-03-31']),
-            'revenue': [100000, 90000, 85000, 80000],
-            'operating_income': [20000, 18000, 17000, 16000],
-            'net_income': [15000, 13000, 12000, 11000],
-            'operating_cash_flow': [25000, 23000, 22000, 21000],
-            'shares': [1000000, 1000000, 1000000, 1000000],
-            'eps': [0.015, 0.013, 0.012, 0.011],
-            'bps': [0.2, 0.19, 0.18, 0.17],
-            'operating_margin': [20.0, 20.0, 20.0, 20.0],
-            'operating_cash_flow_per_share': [0.025, 0.023, 0.022, 0.021]
-        }
+        dates = pd.DatetimeIndex(['2023-12-31', '2023-09-30', '2023-06-30', '2023-03-31'])
 
         # 配当データ処理の実行
-        result = processor._process_dividends(normalized_data, PERIOD_QUARTERLY)
+        dps = processor._dividends_per_period(mock_data_fetcher.get_dividends(), dates, PERIOD_QUARTERLY)
 
         # 結果の検証
-        assert 'dps' in result
-        assert len(result['dps']) == 4
+        assert len(dps) == 4
+        assert dps.tolist() == [1.0, 1.0, 1.0, 1.0]
+        # 配当がない場合はNone
+        assert processor._dividends_per_period(None, dates, PERIOD_QUARTERLY) is None
+
+    def test_fetch_statements(self, mock_data_fetcher):
+        """財務諸表一式の並列取得のテスト"""
+        processor = DataProcessor(mock_data_fetcher)
+
+        bundle = processor.fetch_statements(PERIOD_QUARTERLY)
+
+        assert bundle.is_complete()
+        assert bundle.dividends is not None
+        mock_data_fetcher.get_income_statement.assert_called_once_with(PERIOD_QUARTERLY)
+        mock_data_fetcher.get_dividends.assert_called_once_with()
+
+    def test_fetch_statements_timeout(self, mock_data_fetcher):
+        """タイムアウトした諸表がNoneになることのテスト"""
+        release = threading.Event()
+        mock_data_fetcher.ticker = 'AAPL'
+        mock_data_fetcher.get_cash_flow.side_effect = lambda period: release.wait(5)
+        processor = DataProcessor(mock_data_fetcher)
+
+        try:
+            bundle = processor.fetch_statements(PERIOD_QUARTERLY, timeout=0.1)
+        finally:
+            release.set()
+
+        assert bundle.cash_flow is None
+        assert bundle.income is not None
+        assert not bundle.is_complete()
+
+    def test_process_financial_data_failure(self, mock_data_fetcher):
+        """取得に失敗した場合に例外を出さずNoneを返すことのテスト"""
+        mock_data_fetcher.get_income_statement.side_effect = RuntimeError('upstream error')
+        processor = DataProcessor(mock_data_fetcher)
+
+        assert processor.ticker is None
+        assert processor.process_financial_data(PERIOD_QUARTERLY) is None
+
+    @patch('data.data_processor.DataFetcher')
+    def test_process_many(self, mock_fetcher_class):
+        """複数銘柄の一括処理のテスト"""
+        def process(self, period):
+            if self.data_fetcher.ticker == 'FAIL':
+                raise RuntimeError('upstream error')
+            return self.data_fetcher.ticker
+
+        mock_fetcher_class.side_effect = lambda ticker, cache=None: MagicMock(ticker=ticker)
+        with patch.object(DataProcessor, 'process_financial_data', process):
+            results = dict(DataProcessor.process_many(['AAPL', 'FAIL', 'MSFT', 'AAPL'], max_workers=2))
+
+        # 重複は除かれ、失敗した銘柄はNoneとなる
+        assert results == {'AAPL': 'AAPL', 'FAIL': None, 'MSFT': 'MSFT'}
+
+    def test_process_all_periods(self, mock_data_fetcher):
+        """四半期・年次の一括処理のテスト"""
+        mock_data_fetcher.ticker = 'AAPL'
+        mock_data_fetcher.get_income_statement.side_effect = (
+            lambda period: None if period == PERIOD_ANNUAL else MagicMock()
+        )
+        processor = DataProcessor(mock_data_fetcher)
+
+        with patch('data.data_processor.synthesize_annual_bundle') as mock_synthesize, \
+                patch.object(DataProcessor, '_build_model', side_effect=lambda bundle, period, previous=None: period):
+            results = processor.process_all_periods()
+
+        # 年次が不完全な場合は四半期から算出し、配当は1回だけ取得する
+        assert results == {PERIOD_QUARTERLY: PERIOD_QUARTERLY, PERIOD_ANNUAL: PERIOD_ANNUAL}
+        mock_synthesize.assert_called_once()
+        mock_data_fetcher.get_dividends.assert_called_once_with()
+
+    def test_compute_metrics(self, mock_data_fetcher):
+        """派生指標の一括計算と0・欠損の扱いのテスト"""
+        processor = DataProcessor(mock_data_fetcher)
+        df = pd.DataFrame({
+            '売上高': [100.0, 0.0, 200.0],
+            '営業利益': [20.0, 10.0, np.nan],
+            '純利益': [15.0, 5.0, 30.0],
+            '営業キャッシュフロー': [25.0, 5.0, 40.0],
+            '発行済株式数': [10.0, 10.0, 0.0],
+            '実効税率': [0.2, 0.2, 0.2],
+            '有利子負債': [50.0, -100.0, 50.0],
+            '株主資本': [150.0, 100.0, 150.0],
+        })
+
+        result = processor._compute_metrics(df)
+
+        assert result['EPS'].tolist()[:2] == [1.5, 0.5]
+        assert result['営業利益率'][0] == 20.0
+        assert result['ROIC'][0] == pytest.approx(8.0)
+        assert result['BPS'][0] == 15.0
+        # 分母が0の場合はNaN
+        assert np.isnan(result['営業利益率'][1])
+        assert np.isnan(result['ROIC'][1])
+        assert np.isnan(result['EPS'][2])
+        # 欠損を含む場合はNaN
+        assert np.isnan(result['ROIC'][2])
+
+    def test_compute_metrics_incremental(self, mock_data_fetcher):
+        """元データが変わった期のみ派生指標が再計算されることのテスト"""
+        processor = DataProcessor(mock_data_fetcher)
+        dates = pd.to_datetime(['2023-12-31', '2023-09-30', '2023-06-30'])
+
+        def base_frame(revenue):
+            return pd.DataFrame({
+                '売上高': revenue,
+                '営業利益': [20.0, 18.0, 16.0],
+                '純利益': [15.0, 13.0, 11.0],
+                '営業キャッシュフロー': [25.0, 23.0, 21.0],
+                '発行済株式数': [10.0, 10.0, 10.0],
+                '実効税率': [0.2, 0.2, 0.2],
+                '有利子負債': [50.0, 50.0, 50.0],
+                '株主資本': [150.0, 150.0, 150.0],
+            }, index=dates)
+
+        previous = FinancialDataModel(processor._normalize_data(
+            processor._compute_metrics(base_frame([100.0, 90.0, 80.0]))
+        ))
+
+        # 最新期の売上高が修正された場合
+        with patch.object(DataProcessor, '_compute_metrics', autospec=True,
+                          side_effect=DataProcessor._compute_metrics) as mock_compute:
+            result = processor._compute_metrics_incremental(base_frame([200.0, 90.0, 80.0]), previous)
+
+        assert len(mock_compute.call_args.args[1]) == 1
+        assert result['営業利益率'].tolist() == [10.0, 20.0, 20.0]
+        assert result['ROIC'].tolist() == pytest.approx([8.0, 7.2, 6.4])
+
+        # 元データが変わらない場合は再計算しない
+        with patch.object(DataProcessor, '_compute_metrics', autospec=True) as mock_compute:
+            processor._compute_metrics_incremental(base_frame([100.0, 90.0, 80.0]), previous)
+        mock_compute.assert_not_called()
@@ -0,0 +1,33 @@
+"""処理済みデータのバージョンのテスト"""
+from unittest.mock import patch
+from data.data_version import DATA_VERSION, compute_data_version
+from data.metrics import DEFAULT_REGISTRY, Metric, MetricRegistry
+
+
+class TestDataVersion:
+    """compute_data_versionのテストクラス"""
+
+    @staticmethod
+    def copy_registry() -> MetricRegistry:
+        """標準の派生指標を複製したレジストリ"""
+        registry = MetricRegistry()
+        for metric in DEFAULT_REGISTRY.metrics:
+            registry.register(metric)
+        return registry
+
+    def test_stable(self):
+        """指標の定義が同じであれば同じバージョンになることのテスト"""
+        assert compute_data_version() == DATA_VERSION
+        assert compute_data_version(self.copy_registry()) == DATA_VERSION
+
+    def test_changes_with_metrics(self):
+        """派生指標の入力が変わるとバージョンが変わることのテスト"""
+        registry = self.copy_registry()
+        metric = registry.metrics[0]
+        registry.register(Metric(metric.name, list(reversed(metric.inputs)), metric.formula, metric.field))
+        assert compute_data_version(registry) != DATA_VERSION
+
+    def test_changes_with_processing_version(self):
+        """処理ロジックのバージョンを更新するとバージョンが変わることのテスト"""
+        with patch('data.data_version.DATA_PROCESSING_VERSION', 'next'):
+            assert compute_data_version().startswith('next-')
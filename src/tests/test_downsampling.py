@@ -0,0 +1,50 @@
+"""グラフ表示用のデータ削減のテスト"""
+import json
+import numpy as np
+from plots.downsampling import lttb_indices, round_significant
+
+
+class TestDownsampling:
+    """データ削減のテストクラス"""
+
+    def test_lttb_keeps_shape(self):
+        """間引き後も端点と極値が残ることのテスト"""
+        y = np.sin(np.linspace(0, 4 * np.pi, 5000))
+        y[1234] = 5.0
+
+        indices = lttb_indices(y, 100)
+
+        assert len(indices) == 100
+        assert indices[0] == 0 and indices[-1] == len(y) - 1
+        assert np.all(np.diff(indices) > 0)
+        assert 1234 in indices
+        assert y[indices].min() < -0.99 and y[indices].max() > 0.99
+
+    def test_lttb_short(self):
+        """点数が上限以下の場合は欠損値も含めてすべて残すことのテスト"""
+        y = np.array([1.0, np.nan, 3.0, 4.0])
+        assert lttb_indices(y, 10).tolist() == [0, 1, 2, 3]
+
+    def test_lttb_keeps_gap(self):
+        """欠損値で途切れた区間は間引き後も途切れたままであることのテスト"""
+        y = np.arange(1000, dtype=float)
+        y[100:200] = np.nan
+        indices = lttb_indices(y, 50)
+
+        assert len(indices) <= 50
+        assert np.all(np.diff(indices) > 0)
+        # 区間の間に欠損値の点が1つだけ残り、両側の区間の端点も残る
+        missing = indices[np.isnan(y[indices])]
+        assert missing.tolist() == [199]
+        assert {0, 99, 200, 999} <= set(indices.tolist())
+
+    def test_round_significant(self):
+        """有効桁数で丸め、JSONで短い表現になることのテスト"""
+        values = np.array([123456789.123, 0.000123456789, -98765.4321, 1 / 3, 0.0, np.nan])
+
+        rounded = round_significant(values, 4)
+
+        assert json.dumps(rounded[:5].tolist()) == "[123500000.0, 0.0001235, -98770.0, 0.3333, 0.0]"
+        assert np.isnan(rounded[5])
+        # 元の配列は変更しない
+        assert values[0] == 123456789.123
@@ -0,0 +1,86 @@
+"""FigureCacheのテスト"""
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+import plotly.graph_objects as go
+from plots.figure_cache import FigureCache, fingerprint
+from plots.plot_manager import PlotManager
+from utils.models import FinancialDataModel
+
+
+class TestFigureCache:
+    """FigureCacheのテストクラス"""
+
+    @pytest.fixture
+    def sample_data(self):
+        """サンプル財務データ辞書"""
+        return {
+            "dates": [datetime(2023, 9, 30), datetime(2023, 12, 31)],
+            "revenue": [90000.0, 100000.0],
+            "operating_income": [18000.0, 20000.0],
+            "net_income": [13000.0, 15000.0],
+            "operating_cash_flow": [23000.0, 25000.0],
+            "shares": [1000000.0, 1000000.0],
+            "eps": [0.013, 0.015],
+            "bps": [0.19, 0.2],
+            "operating_margin": [20.0, 20.0],
+            "operating_cash_flow_per_share": [0.023, 0.025],
+            "roic": [10.0, 11.0]
+        }
+
+    def test_fingerprint(self, sample_data):
+        """内容が同じ場合のみハッシュ値が一致することのテスト"""
+        first = fingerprint(FinancialDataModel(sample_data))
+        assert first == fingerprint(FinancialDataModel(dict(sample_data)))
+
+        changed = dict(sample_data, roic=[10.0, 12.0])
+        assert first != fingerprint(FinancialDataModel(changed))
+
+    def test_reuse_across_models(self, sample_data):
+        """同じ内容の別オブジェクトでもキャッシュが使われることのテスト"""
+        cache = FigureCache()
+        build = MagicMock(side_effect=PlotManager.create_roic_chart)
+
+        first = cache.get_figure(FinancialDataModel(sample_data), "roic", build)
+        second = cache.get_figure(FinancialDataModel(sample_data), "roic", build)
+
+        assert build.call_count == 1
+        assert isinstance(second, go.Figure)
+        assert second is not first
+        assert second.to_dict() == first.to_dict()
+        assert cache.stats["hits"] == 1
+
+    def test_figures_not_shared(self, sample_data):
+        """取得したチャートを変更してもキャッシュや他の取得結果は変わらないことのテスト"""
+        cache = FigureCache()
+        model = FinancialDataModel(sample_data)
+        first = cache.get_figure(model, "roic", PlotManager.create_roic_chart)
+
+        first.update_layout(title_text="変更")
+        second = cache.get_figure(model, "roic", PlotManager.create_roic_chart)
+
+        assert second is not first
+        assert list(second.data[0].y) == list(first.data[0].y)
+        assert second.layout.title.text != "変更"
+
+    def test_lru_eviction(self, sample_data):
+        """上限を超えた場合に最も古いエントリが破棄されることのテスト"""
+        cache = FigureCache(max_entries=2)
+        model = FinancialDataModel(sample_data)
+        build = MagicMock(side_effect=PlotManager.create_roic_chart)
+
+        for chart in ["a", "b", "a", "c"]:
+            cache.get_figure(model, chart, build)
+        cache.get_figure(model, "b", build)
+
+        assert build.call_count == 4
+        assert cache.stats["evictions"] == 2
+        assert cache.stats["entries"] == 2
+
+    def test_plot_manager_get_figure(self, sample_data):
+        """PlotManager経由でチャートを取得できることのテスト"""
+        PlotManager.figure_cache.clear()
+        model = FinancialDataModel(sample_data)
+        fig = PlotManager.get_figure(model, "create_roic_chart")
+        assert fig.layout.title.text == "投下資本利益率（ROIC）"
+        assert list(fig.data[0].y) == [10.0, 11.0]
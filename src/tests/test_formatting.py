@@ -0,0 +1,28 @@
+"""フォーマットユーティリティのテスト"""
+from datetime import datetime
+import pandas as pd
+from utils.formatting import format_bytes, format_dates
+from utils.models import FinancialDataModel
+
+
+class TestFormatting:
+    """フォーマットユーティリティのテストクラス"""
+
+    def test_format_dates(self):
+        """日付リストを一括でフォーマットできることのテスト"""
+        dates = [datetime(2023, 3, 31), pd.Timestamp('2023-06-30'), '2023-09-30']
+        assert format_dates(dates) == ['2023/03', '2023/06', '2023/09']
+        assert format_dates(pd.DatetimeIndex(['2024-12-31'])) == ['2024/12']
+        assert format_dates([]) == []
+
+    def test_format_bytes(self):
+        """データサイズのフォーマットのテスト"""
+        assert format_bytes(512) == '512B'
+        assert format_bytes(2048) == '2.0KB'
+        assert format_bytes(3 * 1024 * 1024) == '3.0MB'
+
+    def test_model_date_labels(self):
+        """財務データモデル作成時に日付ラベルが作成されることのテスト"""
+        model = FinancialDataModel({"dates": [datetime(2023, 12, 31), datetime(2024, 3, 31)]})
+        assert model.date_labels == ['2023/12', '2024/03']
+        assert 'date_labels' not in model.to_dict()
@@ -0,0 +1,70 @@
+"""MetricRegistryのテスト"""
+import pytest
+import numpy as np
+import pandas as pd
+from data.metrics import Metric, MetricRegistry, DEFAULT_REGISTRY, payout_ratio, safe_divide
+
+
+class TestMetricRegistry:
+    """MetricRegistryのテストクラス"""
+
+    def test_resolve_order(self):
+        """依存関係に従って計算順序が決まることのテスト"""
+        registry = MetricRegistry()
+        registry.register(Metric('C', ['B'], lambda b: b + 1))
+        registry.register(Metric('B', ['A'], lambda a: a * 2))
+
+        order = [metric.name for metric in registry.resolve_order(['A'])]
+        assert order == ['B', 'C']
+
+    def test_missing_input_skipped(self):
+        """入力が揃わない指標と、それに依存する指標が除外されることのテスト"""
+        registry = MetricRegistry()
+        registry.register(Metric('B', ['A', 'X'], lambda a, x: a + x))
+        registry.register(Metric('C', ['B'], lambda b: b))
+        registry.register(Metric('D', ['A'], lambda a: a))
+
+        assert [metric.name for metric in registry.resolve_order(['A'])] == ['D']
+
+    def test_cycle_detected(self):
+        """循環する依存関係がエラーになることのテスト"""
+        registry = MetricRegistry()
+        registry.register(Metric('B', ['C'], lambda c: c))
+        registry.register(Metric('C', ['B'], lambda b: b))
+
+        with pytest.raises(ValueError):
+            registry.resolve_order(['A'])
+
+    def test_default_registry(self):
+        """標準指標の計算のテスト"""
+        df = pd.DataFrame({
+            '売上高': [100.0, 200.0],
+            '営業利益': [20.0, 30.0],
+            '純利益': [10.0, 0.0],
+            '営業キャッシュフロー': [25.0, 50.0],
+            '発行済株式数': [10.0, 10.0],
+            '実効税率': [0.2, 0.2],
+            '有利子負債': [50.0, 50.0],
+            '株主資本': [150.0, 150.0],
+            'DPS': [0.5, 0.5],
+        })
+
+        result = DEFAULT_REGISTRY.compute(df)
+
+        assert result['営業CFマージン'].tolist() == [25.0, 25.0]
+        assert result['配当性向'][0] == pytest.approx(50.0)
+        # EPSが0の期の配当性向は0
+        assert result['配当性向'][1] == 0.0
+        assert result['ROIC'][0] == pytest.approx(8.0)
+
+    def test_safe_divide(self):
+        """0・欠損での割り算がNaNになることのテスト"""
+        result = safe_divide(np.array([1.0, 1.0, 1.0]), np.array([2.0, 0.0, np.nan]))
+        assert result[0] == 0.5
+        assert np.isnan(result[1:]).all()
+
+    def test_payout_ratio(self):
+        """EPSが0の期は0、欠損の期はNaNになることのテスト"""
+        result = payout_ratio(np.array([1.0, 1.0, 1.0]), np.array([2.0, 0.0, np.nan]))
+        assert result[:2].tolist() == [50.0, 0.0]
+        assert np.isnan(result[2])
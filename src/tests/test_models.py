@@ -0,0 +1,69 @@
+"""FinancialDataModelのテスト"""
+import pickle
+import pytest
+import numpy as np
+from datetime import datetime
+from utils.models import FinancialDataModel
+
+
+class TestFinancialDataModel:
+    """FinancialDataModelのテストクラス"""
+
+    @pytest.fixture
+    def sample_model(self):
+        """サンプル財務データモデル"""
+        return FinancialDataModel({
+            "dates": [datetime(2023, 9, 30), datetime(2023, 12, 31)],
+            "revenue": [90000, 100000],
+            "operating_income": [18000.0, 20000.0],
+            "eps": [0.013, 0.015],
+            "dps": [0.01, 0.01],
+            "custom_metric": [1.0, 2.0]
+        })
+
+    def test_columns(self, sample_model):
+        """列の取得のテスト"""
+        assert sample_model.revenue.dtype == np.float64
+        assert sample_model.revenue.tolist() == [90000.0, 100000.0]
+        # 入力にない必須の指標はNaN、任意の指標はNone
+        assert np.isnan(sample_model.roic).all()
+        assert sample_model.payout_ratio is None
+        assert sample_model.dps.tolist() == [0.01, 0.01]
+        assert list(sample_model.extra_metrics) == ["custom_metric"]
+
+    def test_single_block(self, sample_model):
+        """全指標が1つの配列のビューであることのテスト"""
+        block = sample_model.values
+        assert block.flags.c_contiguous
+        assert np.shares_memory(sample_model.eps, block)
+        assert np.shares_memory(sample_model.to_dict()["revenue"], block)
+        assert sample_model.nbytes == block.nbytes + sample_model.dates.nbytes
+
+    def test_immutable(self, sample_model):
+        """変更できないことのテスト"""
+        with pytest.raises(AttributeError):
+            sample_model.revenue = [1.0, 2.0]
+        with pytest.raises(ValueError):
+            sample_model.revenue[0] = 1.0
+
+    def test_to_frame_writable(self, sample_model):
+        """データフレームは変更でき、変更してもモデルに影響しないことのテスト"""
+        frame = sample_model.to_frame()
+        frame.loc[frame.index[0], "revenue"] = 1.0
+        frame["revenue"] *= 2
+
+        assert frame["revenue"].tolist()[0] == 2.0
+        assert sample_model.revenue.tolist() == [90000.0, 100000.0]
+        assert not np.shares_memory(frame.to_numpy(), sample_model.values)
+
+    def test_length_mismatch(self):
+        """要素数が日付の数と一致しない場合のテスト"""
+        with pytest.raises(ValueError):
+            FinancialDataModel({"dates": [datetime(2023, 12, 31)], "revenue": [1.0, 2.0]})
+
+    def test_pickle(self, sample_model):
+        """シリアライズして復元できることのテスト"""
+        restored = pickle.loads(pickle.dumps(sample_model))
+        assert restored.columns == sample_model.columns
+        assert np.array_equal(restored.values, sample_model.values, equal_nan=True)
+        assert restored.date_labels == ['2023/09', '2023/12']
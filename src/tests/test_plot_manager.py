@@ -6,6 +6,7 @@ import numpy as np
 from datetime import datetime
 import plotly.graph_objects as go
 from plots.plot_manager import PlotManager
+from utils.constants import RENDER_MAX_LINE_POINTS, RENDER_MODE_SVG
 from utils.models import ChartConfig, FinancialDataModel
 
 
@@ -105,3 +106,29 @@ class TestPlotManager:
         assert fig.layout.title.text == "稼ぐ力"
         assert fig.layout.yaxis.title.text == "金額"
         assert fig.layout.yaxis2.title.text == "1株当たり金額"
+
+    def test_line_trace_long_history(self):
+        """点数の多い折れ線が間引かれ、WebGLで描画されることのテスト"""
+        dates = [f"{1900 + i // 12}/{i % 12 + 1:02d}" for i in range(5000)]
+        values = np.sin(np.linspace(0, 20, 5000)) * 1e6 / 3
+
+        trace = PlotManager.line_trace(dates, values, "長期系列", mode="lines")
+
+        assert isinstance(trace, go.Scattergl)
+        assert len(trace.y) == RENDER_MAX_LINE_POINTS
+        assert trace.x[0] == dates[0] and trace.x[-1] == dates[-1]
+        # 値は有効桁数（6桁）で丸めて送る
+        assert all(float(f"{v:.6g}") == v for v in trace.y)
+        assert values[1] != float(f"{values[1]:.6g}")
+
+        # SVGを指定した場合は間引きのみ行う
+        svg = PlotManager.line_trace(dates, values, "長期系列", render_mode=RENDER_MODE_SVG)
+        assert type(svg) is go.Scatter
+        assert len(svg.y) == RENDER_MAX_LINE_POINTS
+
+    def test_short_history_unchanged(self, sample_financial_data):
+        """点数が少ない場合はSVGのまま全点を描画することのテスト"""
+        fig = PlotManager.create_roic_chart(sample_financial_data)
+
+        assert type(fig.data[0]) is go.Scatter
+        assert len(fig.data[0].y) == len(sample_financial_data.dates)
@@ -0,0 +1,53 @@
+"""事前計算ジョブのテスト"""
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+import precompute
+from data.columnar_store import ColumnarStore
+from utils.models import FinancialDataModel
+from utils.constants import PERIOD_QUARTERLY, PERIOD_ANNUAL
+
+
+def make_model(revenue):
+    """テスト用の財務データモデルを作成"""
+    return FinancialDataModel({"dates": [datetime(2023, 12, 31)], "revenue": [revenue]})
+
+
+class TestPrecompute:
+    """事前計算ジョブのテストクラス"""
+
+    def test_read_universe(self, tmp_path):
+        """銘柄一覧の読み込みのテスト"""
+        path = tmp_path / "universe.txt"
+        path.write_text("# 米国株\nmsft\nGOOG  # コメント\n\naapl\n", encoding="utf-8")
+        assert precompute.read_universe(["AAPL"], str(path)) == ["AAPL", "MSFT", "GOOG"]
+
+    def test_precompute(self):
+        """失敗した銘柄を除いて全期間が処理されることのテスト"""
+        results = {
+            "AAPL": {PERIOD_QUARTERLY: make_model(1.0), PERIOD_ANNUAL: make_model(4.0)},
+            "MSFT": {PERIOD_QUARTERLY: None, PERIOD_ANNUAL: None},
+        }
+        with patch('precompute._process_ticker', side_effect=lambda ticker, cache, previous: results[ticker]):
+            models = precompute.precompute(["AAPL", "MSFT"], max_workers=2)
+
+        assert sorted(models) == [("AAPL", PERIOD_ANNUAL), ("AAPL", PERIOD_QUARTERLY)]
+
+    def test_main_merge(self, tmp_path):
+        """--mergeで処理できなかった銘柄の既存結果が残ることのテスト"""
+        output = str(tmp_path / "store.arrow")
+        ColumnarStore(output).save({("MSFT", PERIOD_QUARTERLY): make_model(2.0)})
+
+        with patch('precompute.precompute', return_value={("AAPL", PERIOD_QUARTERLY): make_model(1.0)}):
+            assert precompute.main(["--tickers", "AAPL", "MSFT", "--output", output, "--merge"]) == 0
+
+        store = ColumnarStore(output)
+        assert store.load("AAPL", PERIOD_QUARTERLY).revenue.tolist() == [1.0]
+        assert store.load("MSFT", PERIOD_QUARTERLY).revenue.tolist() == [2.0]
+
+    def test_main_no_results(self, tmp_path):
+        """1銘柄も処理できなかった場合はストアを更新しないことのテスト"""
+        output = tmp_path / "store.arrow"
+        with patch('precompute.precompute', return_value={}):
+            assert precompute.main(["--tickers", "AAPL", "--output", str(output)]) == 1
+        assert not output.exists()
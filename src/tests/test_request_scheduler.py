@@ -0,0 +1,107 @@
+"""RequestSchedulerのテスト"""
+import pytest
+from unittest.mock import MagicMock
+import requests
+from data.request_scheduler import (
+    RequestScheduler, CircuitOpenError, is_transient_error,
+    CIRCUIT_CLOSED, CIRCUIT_OPEN
+)
+
+
+class TestRequestScheduler:
+    """RequestSchedulerのテストクラス"""
+
+    @pytest.fixture
+    def scheduler(self):
+        """待機時間を短くしたRequestScheduler"""
+        return RequestScheduler(
+            rate_per_second=1000,
+            burst=10,
+            max_retries=2,
+            backoff_base=0.001,
+            backoff_max=0.002,
+            failure_threshold=3,
+            reset_timeout=60
+        )
+
+    def test_call_success(self, scheduler):
+        """正常な呼び出しのテスト"""
+        func = MagicMock(return_value=42)
+
+        assert scheduler.call(func, 'a', key='b') == 42
+        func.assert_called_once_with('a', key='b')
+        assert scheduler.metrics['successes'] == 1
+        assert scheduler.metrics['retries'] == 0
+
+    def test_retry_then_success(self, scheduler):
+        """失敗後の再試行のテスト"""
+        func = MagicMock(side_effect=[ConnectionError('throttled'), 'ok'])
+
+        assert scheduler.call(func) == 'ok'
+        assert func.call_count == 2
+        assert scheduler.metrics['retries'] == 1
+        assert scheduler.circuit_state == CIRCUIT_CLOSED
+
+    def test_retry_exhausted(self, scheduler):
+        """再試行回数を超えた場合に例外が送出されることのテスト"""
+        func = MagicMock(side_effect=ConnectionError('throttled'))
+
+        with pytest.raises(ConnectionError):
+            scheduler.call(func)
+        assert func.call_count == 3
+
+    def test_circuit_breaker(self, scheduler):
+        """連続失敗でサーキットが開き、呼び出しが拒否されることのテスト"""
+        func = MagicMock(side_effect=ConnectionError('down'))
+
+        with pytest.raises(ConnectionError):
+            scheduler.call(func)
+        assert scheduler.circuit_state == CIRCUIT_OPEN
+
+        with pytest.raises(CircuitOpenError):
+            scheduler.call(func)
+        assert func.call_count == 3
+        assert scheduler.metrics['rejected'] == 1
+
+    def test_circuit_recovers(self, scheduler):
+        """一定時間経過後に試行が再開されることのテスト"""
+        with pytest.raises(ConnectionError):
+            scheduler.call(MagicMock(side_effect=ConnectionError('down')))
+
+        scheduler.reset_timeout = 0
+        assert scheduler.call(MagicMock(return_value='ok')) == 'ok'
+        assert scheduler.circuit_state == CIRCUIT_CLOSED
+
+    def test_non_retryable_error(self, scheduler):
+        """一時的でないエラーは再試行せず、サーキットも開かないことのテスト"""
+        func = MagicMock(side_effect=KeyError('INVALID'))
+
+        for _ in range(5):
+            with pytest.raises(KeyError):
+                scheduler.call(func)
+        assert func.call_count == 5
+        assert scheduler.metrics['retries'] == 0
+        assert scheduler.metrics['failures'] == 0
+        assert scheduler.metrics['errors'] == 5
+        assert scheduler.circuit_state == CIRCUIT_CLOSED
+
+    def test_is_transient_error(self):
+        """一時的なエラーの判定のテスト"""
+        def http_error(status):
+            response = requests.Response()
+            response.status_code = status
+            return requests.exceptions.HTTPError(response=response)
+
+        assert is_transient_error(ConnectionError('reset'))
+        assert is_transient_error(requests.exceptions.Timeout())
+        assert is_transient_error(http_error(429))
+        assert is_transient_error(http_error(503))
+        assert not is_transient_error(http_error(404))
+        assert not is_transient_error(ValueError('invalid symbol'))
+
+    def test_rate_limit(self):
+        """トークン不足時に待機することのテスト"""
+        scheduler = RequestScheduler(rate_per_second=100, burst=1)
+        for _ in range(3):
+            scheduler.call(MagicMock())
+        assert scheduler.metrics['throttled_seconds'] > 0
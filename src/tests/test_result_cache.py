@@ -0,0 +1,128 @@
+"""ResultCacheのテスト"""
+import time
+import pytest
+from unittest.mock import MagicMock
+from datetime import datetime
+from data.result_cache import ResultCache
+from utils.models import FinancialDataModel
+from utils.constants import PERIOD_QUARTERLY, PERIOD_ANNUAL
+
+
+class TestResultCache:
+    """ResultCacheのテストクラス"""
+
+    @pytest.fixture
+    def sample_model(self):
+        """サンプル財務データモデル"""
+        return FinancialDataModel({
+            "dates": [datetime(2023, 9, 30), datetime(2023, 12, 31)],
+            "revenue": [90000.0, 100000.0],
+            "operating_income": [18000.0, 20000.0],
+            "net_income": [13000.0, 15000.0],
+            "operating_cash_flow": [23000.0, 25000.0],
+            "shares": [1000000.0, 1000000.0],
+            "eps": [0.013, 0.015],
+            "bps": [0.19, 0.2],
+            "operating_margin": [20.0, 20.0],
+            "operating_cash_flow_per_share": [0.023, 0.025],
+            "roic": [10.0, 11.0]
+        })
+
+    def test_get_and_set(self, sample_model):
+        """保存と取得のテスト"""
+        cache = ResultCache()
+        assert cache.get('AAPL', PERIOD_QUARTERLY) is None
+
+        cache.set('AAPL', PERIOD_QUARTERLY, sample_model)
+        assert cache.get('aapl', PERIOD_QUARTERLY) is sample_model
+        assert cache.get('AAPL', PERIOD_ANNUAL) is None
+        assert cache.stats['hits'] == 1
+        assert cache.stats['misses'] == 2
+
+    def test_get_or_process(self, sample_model):
+        """未保存時のみ処理が実行されることのテスト"""
+        cache = ResultCache()
+        process = MagicMock(return_value=sample_model)
+
+        assert cache.get_or_process('AAPL', PERIOD_QUARTERLY, process) is sample_model
+        assert cache.get_or_process('AAPL', PERIOD_QUARTERLY, process) is sample_model
+        assert process.call_count == 1
+
+    def test_get_or_process_all_passes_previous(self, sample_model):
+        """有効期限切れの結果が前回の処理結果として渡されることのテスト"""
+        cache = ResultCache(ttl_seconds=-1)
+        cache.set('AAPL', PERIOD_QUARTERLY, sample_model)
+        process_all = MagicMock(return_value={PERIOD_QUARTERLY: sample_model, PERIOD_ANNUAL: None})
+
+        assert cache.get_or_process_all('aapl', PERIOD_QUARTERLY, process_all) is sample_model
+        process_all.assert_called_once_with({PERIOD_QUARTERLY: sample_model})
+
+    def test_failed_result_not_cached(self):
+        """処理に失敗した結果は保存されないことのテスト"""
+        cache = ResultCache()
+        process = MagicMock(return_value=None)
+
+        cache.get_or_process('AAPL', PERIOD_QUARTERLY, process)
+        cache.get_or_process('AAPL', PERIOD_QUARTERLY, process)
+        assert process.call_count == 2
+
+    def test_lru_eviction(self, sample_model):
+        """件数上限を超えた場合に最も古いエントリが破棄されることのテスト"""
+        cache = ResultCache(max_entries=2)
+        cache.set('AAPL', PERIOD_QUARTERLY, sample_model)
+        cache.set('MSFT', PERIOD_QUARTERLY, sample_model)
+        cache.get('AAPL', PERIOD_QUARTERLY)
+        cache.set('GOOG', PERIOD_QUARTERLY, sample_model)
+
+        assert cache.get('MSFT', PERIOD_QUARTERLY) is None
+        assert cache.get('AAPL', PERIOD_QUARTERLY) is not None
+        assert cache.stats['evictions'] == 1
+
+    def test_memory_ceiling(self, sample_model):
+        """データ量上限を超えた場合に破棄されることのテスト"""
+        size = ResultCache._estimate_size(sample_model)
+        cache = ResultCache(max_bytes=size * 2)
+        for ticker in ['AAPL', 'MSFT', 'GOOG']:
+            cache.set(ticker, PERIOD_QUARTERLY, sample_model)
+
+        assert cache.stats['entries'] == 2
+        assert cache.stats['bytes'] <= size * 2
+
+    def test_source_expiry(self, sample_model):
+        """元データの有効期限を過ぎた結果はTTL内でも無効になることのテスト"""
+        cache = ResultCache()
+        cache.set('AAPL', PERIOD_QUARTERLY, sample_model, expires_at=time.time() - 1)
+        assert cache.get('AAPL', PERIOD_QUARTERLY) is None
+
+        process_all = MagicMock(return_value={PERIOD_QUARTERLY: sample_model})
+        cache.get_or_process_all('AAPL', PERIOD_QUARTERLY, process_all,
+                                 expires_at=lambda: time.time() + 60)
+        assert cache.get('AAPL', PERIOD_QUARTERLY) is sample_model
+
+    def test_invalidate(self, sample_model):
+        """銘柄の全期間の結果が削除されることのテスト"""
+        cache = ResultCache()
+        cache.set('AAPL', PERIOD_QUARTERLY, sample_model)
+        cache.set('AAPL', PERIOD_ANNUAL, sample_model)
+        cache.set('MSFT', PERIOD_QUARTERLY, sample_model)
+
+        cache.invalidate('aapl')
+        assert cache.get('AAPL', PERIOD_QUARTERLY) is None
+        assert cache.get('AAPL', PERIOD_ANNUAL) is None
+        assert cache.get('MSFT', PERIOD_QUARTERLY) is sample_model
+        assert cache.stats['invalidations'] == 2
+
+    def test_changed_source_invalidates(self, sample_model):
+        """元データが変わっていた場合のみ古い処理結果が破棄されることのテスト"""
+        cache = ResultCache(ttl_seconds=-1)
+        cache.set('AAPL', PERIOD_ANNUAL, sample_model)
+        process_all = MagicMock(return_value={PERIOD_QUARTERLY: sample_model, PERIOD_ANNUAL: None})
+
+        cache.get_or_process_all('AAPL', PERIOD_QUARTERLY, process_all, changed=lambda: False)
+        assert cache.stats['invalidations'] == 0
+        assert PERIOD_ANNUAL in cache._previous('AAPL')
+
+        # 今回処理できなかった期間の古い結果も残さない
+        cache.get_or_process_all('AAPL', PERIOD_QUARTERLY, process_all, changed=lambda: True)
+        assert cache.stats['invalidations'] == 1
+        assert list(cache._previous('AAPL')) == [PERIOD_QUARTERLY]
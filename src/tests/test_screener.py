@@ -0,0 +1,78 @@
+"""FinancialPanel・Screenerのテスト"""
+import pytest
+import numpy as np
+import pandas as pd
+from data.screener import FinancialPanel, Screener
+from utils.models import FinancialDataModel
+
+
+def make_model(dates, roic, eps):
+    """テスト用の財務データモデルを作成"""
+    n = len(dates)
+    return FinancialDataModel({
+        "dates": pd.DatetimeIndex(dates),
+        "revenue": np.arange(1, n + 1) * 100.0,
+        "operating_income": np.full(n, 10.0),
+        "net_income": np.full(n, 5.0),
+        "operating_cash_flow": np.full(n, 8.0),
+        "shares": np.full(n, 10.0),
+        "eps": np.asarray(eps, dtype=float),
+        "bps": np.full(n, 1.0),
+        "operating_margin": np.full(n, 10.0),
+        "operating_cash_flow_per_share": np.full(n, 0.8),
+        "roic": np.asarray(roic, dtype=float),
+    })
+
+
+class TestScreener:
+    """FinancialPanel・Screenerのテストクラス"""
+
+    @pytest.fixture
+    def panel(self):
+        """3銘柄のパネル"""
+        quarters = pd.date_range('2023-03-31', periods=5, freq='QE')
+        return FinancialPanel.from_models({
+            'AAA': make_model(quarters, [5, 6, 7, 8, 9], [1, 1, 1, 1, 2]),
+            'BBB': make_model(quarters, [20, 20, 20, 20, 15], [1, 1, 1, 1, 1]),
+            # 決算期がずれ、履歴も短い銘柄
+            'CCC': make_model(['2023-08-31', '2023-11-30', '2024-02-29'], [12, 12, 12], [1, 1, 1]),
+        })
+
+    def test_panel_alignment(self, panel):
+        """最新期を末尾にそろえて格納されることのテスト"""
+        assert panel.values.shape == (3, 5, len(panel.metrics))
+        assert panel.latest('roic').tolist() == [9.0, 15.0, 12.0]
+        assert np.isnan(panel.metric('roic')[2, 0])
+        assert pd.Timestamp(panel.dates[2, -1]) == pd.Timestamp('2024-02-29')
+
+    def test_growth(self, panel):
+        """前年同期比の成長率のテスト"""
+        growth = panel.growth('eps', 4)
+        assert growth[0] == pytest.approx(100.0)
+        assert growth[1] == pytest.approx(0.0)
+        # 比較する期がない銘柄はNaN
+        assert np.isnan(growth[2])
+
+    def test_filter_and_sort(self, panel):
+        """絞り込み・並べ替え・上位抽出のテスト"""
+        screener = Screener(panel)
+        result = screener.where('roic', '>', 8).sort_by('roic').top(2)
+        assert result.index.tolist() == ['BBB', 'CCC']
+
+        ascending = screener.sort_by('roic', descending=False).result()
+        assert ascending.index.tolist() == ['AAA', 'CCC', 'BBB']
+
+        # 成長率がNaNの銘柄は条件に合わない
+        growth = screener.where('eps_growth', '>=', 0).result()
+        assert growth.index.tolist() == ['AAA', 'BBB']
+
+    def test_invalid_operator(self, panel):
+        """未対応の演算子がエラーになることのテスト"""
+        with pytest.raises(ValueError):
+            Screener(panel).where('roic', '=~', 1)
+
+    def test_to_frame(self, panel):
+        """縦持ちデータフレームへの変換のテスト"""
+        frame = panel.to_frame()
+        assert len(frame) == 13
+        assert set(frame['ticker']) == {'AAA', 'BBB', 'CCC'}
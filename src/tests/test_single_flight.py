@@ -0,0 +1,99 @@
+"""SingleFlightのテスト"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from data.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """SingleFlightのテストクラス"""
+
+    def test_do_runs_function(self):
+        """処理の実行と統計のテスト"""
+        single_flight = SingleFlight()
+
+        assert single_flight.do('AAPL', lambda x: x * 2, 21) == 42
+        assert single_flight.do('AAPL', lambda x: x * 2, 1) == 2
+
+        # 完了した処理は共有しない
+        metrics = single_flight.metrics
+        assert metrics["calls"] == 2
+        assert metrics["leaders"] == 2
+        assert metrics["dedup_ratio"] == 0.0
+        assert single_flight.in_flight == 0
+
+    def test_concurrent_calls_share_result(self):
+        """同じキーの同時呼び出しが結果を共有することのテスト"""
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(single_flight.do, 'AAPL', fetch) for _ in range(4)]
+            while single_flight.metrics["calls"] < 4:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert single_flight.metrics["shared"] == 3
+        assert single_flight.metrics["dedup_ratio"] == pytest.approx(0.75)
+
+    def test_different_keys_run_separately(self):
+        """異なるキーは集約しないことのテスト"""
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(single_flight.do, key, lambda k=key: release.wait(5) and k)
+                for key in ('AAPL', 'MSFT')
+            ]
+            while single_flight.in_flight < 2:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert results == ['AAPL', 'MSFT']
+        assert single_flight.metrics["leaders"] == 2
+
+    def test_exception_is_shared(self):
+        """例外が待機中の呼び出しにも送出されることのテスト"""
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise RuntimeError('upstream error')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(single_flight.do, 'AAPL', fail) for _ in range(2)]
+            while single_flight.metrics["calls"] < 2:
+                time.sleep(0.01)
+            release.set()
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result()
+
+        assert single_flight.in_flight == 0
+
+    def test_submit(self):
+        """スレッドプールでの実行と Future の共有のテスト"""
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = single_flight.submit('AAPL', executor, lambda: release.wait(5) and 'done')
+            second = single_flight.submit('AAPL', executor, lambda: 'other')
+            release.set()
+
+            assert first is second
+            assert first.result(timeout=5) == 'done'
+        assert single_flight.in_flight == 0
@@ -0,0 +1,162 @@
+"""StatementCacheのテスト"""
+import pytest
+from unittest.mock import patch, MagicMock, PropertyMock
+import pandas as pd
+from data.data_fetcher import DataFetcher
+from data.statement_cache import StatementCache, is_unchanged
+from utils.constants import PERIOD_QUARTERLY, PERIOD_ANNUAL, STATEMENT_INCOME
+
+
+class TestStatementCache:
+    """StatementCacheのテストクラス"""
+
+    @pytest.fixture
+    def income_data(self):
+        """損益計算書のサンプル"""
+        return pd.DataFrame({
+            '2023-12-31': [100000, 20000],
+            '2023-09-30': [90000, 18000]
+        }, index=['Total Revenue', 'Operating Income'])
+
+    def test_set_and_get(self, tmp_path, income_data):
+        """保存と取得のテスト"""
+        cache = StatementCache(cache_dir=str(tmp_path))
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data)
+
+        cached = cache.get('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY)
+        assert cached is not None
+        pd.testing.assert_frame_equal(cached, income_data)
+
+        # 期間が異なるエントリは別扱い
+        assert cache.get('AAPL', STATEMENT_INCOME, PERIOD_ANNUAL) is None
+
+    def test_ttl_expired(self, tmp_path, income_data):
+        """TTL経過後は無効になることのテスト"""
+        cache = StatementCache(cache_dir=str(tmp_path), ttl_seconds=-1)
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data)
+        assert cache.get('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY) is None
+
+    def test_earnings_date_passed(self, tmp_path, income_data):
+        """決算日を過ぎたエントリが無効になることのテスト"""
+        cache = StatementCache(cache_dir=str(tmp_path))
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data,
+                  next_earnings_date=pd.Timestamp('2000-01-01'))
+        assert cache.get('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY) is None
+
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data,
+                  next_earnings_date=pd.Timestamp.now() + pd.Timedelta(days=30))
+        assert cache.get('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY) is not None
+
+    def test_invalidate(self, tmp_path, income_data):
+        """キャッシュ削除のテスト"""
+        cache = StatementCache(cache_dir=str(tmp_path))
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data)
+        cache.set('MSFT', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data)
+
+        cache.invalidate('AAPL')
+        assert cache.get('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY) is None
+        assert cache.get('MSFT', STATEMENT_INCOME, PERIOD_QUARTERLY) is not None
+
+    @patch('yfinance.Ticker')
+    def test_data_fetcher_uses_cache(self, mock_yf_ticker, tmp_path, income_data):
+        """DataFetcherがキャッシュを利用することのテスト"""
+        mock_ticker = MagicMock()
+        income_property = PropertyMock(return_value=income_data)
+        type(mock_ticker).quarterly_income_stmt = income_property
+        mock_ticker.calendar = {}
+        mock_yf_ticker.return_value = mock_ticker
+
+        cache = StatementCache(cache_dir=str(tmp_path))
+        first = DataFetcher('AAPL', cache=cache).get_income_statement(PERIOD_QUARTERLY)
+        second = DataFetcher('AAPL', cache=cache).get_income_statement(PERIOD_QUARTERLY)
+
+        assert first is not None
+        assert second is not None
+        assert income_property.call_count == 1
+
+    def test_is_unchanged(self, income_data):
+        """取得した期の日付・値がキャッシュと一致するかの判定のテスト"""
+        assert is_unchanged(income_data, income_data.copy())
+        # 取得範囲から外れた期がある場合も変わったとみなす
+        assert not is_unchanged(income_data, income_data[['2023-12-31']])
+        # 修正された期
+        restated = income_data[['2023-12-31']].copy()
+        restated.loc['Total Revenue'] = 105000
+        assert not is_unchanged(income_data, restated)
+        # 新しい期
+        fetched = pd.DataFrame({'2024-03-31': [110000, 22000]}, index=['Total Revenue', 'Operating Income'])
+        assert not is_unchanged(income_data, fetched)
+
+        # 配当データ
+        dividends = pd.Series([0.24, 0.25], index=pd.to_datetime(['2023-08-11', '2023-11-10']))
+        assert is_unchanged(dividends, dividends.copy())
+        assert not is_unchanged(dividends.iloc[:1], dividends)
+
+    @patch('yfinance.Ticker')
+    def test_data_fetcher_revalidates(self, mock_yf_ticker, tmp_path, income_data):
+        """取得した財務諸表がキャッシュと同じ場合は再検証済みとして変わっていないとみなすことのテスト"""
+        next_earnings_date = pd.Timestamp.now().normalize() + pd.Timedelta(days=30)
+        mock_ticker = MagicMock()
+        mock_ticker.quarterly_income_stmt = income_data.copy()
+        mock_ticker.calendar = {'Earnings Date': [next_earnings_date.date()]}
+        mock_yf_ticker.return_value = mock_ticker
+
+        # 有効期限切れのエントリ
+        cache = StatementCache(cache_dir=str(tmp_path), ttl_seconds=-1)
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data, next_earnings_date)
+
+        fetcher = DataFetcher('AAPL', cache=cache)
+        income = fetcher.get_income_statement(PERIOD_QUARTERLY)
+        assert list(income.columns) == ['2023-12-31', '2023-09-30']
+        # 元データは変わっておらず、有効期限は保存したエントリの期限となる
+        assert not fetcher.statements_changed
+        assert fetcher.statements_expire_at is not None
+        assert fetcher.statements_expire_at <= next_earnings_date.timestamp()
+
+    @patch('yfinance.Ticker')
+    def test_data_fetcher_detects_restatement(self, mock_yf_ticker, tmp_path, income_data):
+        """次回決算日が変わらなくても修正された期は取得した値で置き換えることのテスト"""
+        next_earnings_date = pd.Timestamp.now().normalize() + pd.Timedelta(days=30)
+        restated = income_data.copy()
+        restated.loc['Total Revenue', '2023-12-31'] = 105000
+        mock_ticker = MagicMock()
+        mock_ticker.quarterly_income_stmt = restated
+        mock_ticker.calendar = {'Earnings Date': [next_earnings_date.date()]}
+        mock_yf_ticker.return_value = mock_ticker
+
+        cache = StatementCache(cache_dir=str(tmp_path), ttl_seconds=-1)
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data, next_earnings_date)
+
+        fetcher = DataFetcher('AAPL', cache=cache)
+        income = fetcher.get_income_statement(PERIOD_QUARTERLY)
+        assert income.loc['Total Revenue'].tolist() == [105000, 90000]
+        assert fetcher.statements_changed
+
+        # キャッシュを使わない取得では照合しないため、変わったとはみなさない
+        uncached = DataFetcher('AAPL')
+        uncached.get_income_statement(PERIOD_QUARTERLY)
+        assert not uncached.statements_changed
+
+    @patch('yfinance.Ticker')
+    def test_data_fetcher_replaces(self, mock_yf_ticker, tmp_path, income_data):
+        """新しい決算の公表後は取得した財務諸表でキャッシュを置き換え、過去の期を残さないことのテスト"""
+        fetched = pd.DataFrame({
+            '2024-03-31': [110000, 22000],
+            '2023-12-31': [100000, 20000]
+        }, index=['Total Revenue', 'Operating Income'])
+        mock_ticker = MagicMock()
+        mock_ticker.quarterly_income_stmt = fetched
+        mock_ticker.calendar = {}
+        mock_yf_ticker.return_value = mock_ticker
+
+        cache = StatementCache(cache_dir=str(tmp_path))
+        cache.set('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY, income_data,
+                  next_earnings_date=pd.Timestamp('2000-01-01'))
+
+        fetcher = DataFetcher('AAPL', cache=cache)
+        income = fetcher.get_income_statement(PERIOD_QUARTERLY)
+
+        # キャッシュの有無によらず、初めて取得した場合と同じ期を表示する
+        assert list(income.columns) == ['2024-03-31', '2023-12-31']
+        assert list(cache.get('AAPL', STATEMENT_INCOME, PERIOD_QUARTERLY).columns) == list(income.columns)
+        assert fetcher.statements_changed
@@ -0,0 +1,47 @@
+"""四半期からの年次算出のテスト"""
+import pytest
+import pandas as pd
+from data.statement_synthesis import synthesize_annual_bundle
+from utils.models import StatementBundle
+
+
+class TestStatementSynthesis:
+    """synthesize_annual_bundleのテストクラス"""
+
+    @pytest.fixture
+    def quarterly_bundle(self):
+        """8四半期分の財務諸表一式"""
+        dates = pd.date_range('2022-03-31', periods=8, freq='QE')[::-1]
+        income = pd.DataFrame(
+            [[100.0] * 8, [20.0] * 8, [0.2] * 8, [1000.0] * 7 + [1200.0]],
+            index=['Total Revenue', 'Operating Income', 'Tax Rate For Calcs', 'Diluted Average Shares'],
+            columns=dates
+        )
+        balance = pd.DataFrame([list(range(8, 0, -1))], index=['Total Debt'], columns=dates)
+        cash_flow = pd.DataFrame([[30.0] * 8], index=['Operating Cash Flow'], columns=dates)
+        return StatementBundle(income=income, balance=balance, cash_flow=cash_flow)
+
+    def test_flow_items_summed(self, quarterly_bundle):
+        """フロー項目が4四半期分合計されることのテスト"""
+        annual = synthesize_annual_bundle(quarterly_bundle)
+
+        assert list(annual.income.columns) == [pd.Timestamp('2023-12-31'), pd.Timestamp('2022-12-31')]
+        assert annual.income.loc['Total Revenue'].tolist() == [400.0, 400.0]
+        assert annual.cash_flow.loc['Operating Cash Flow'].tolist() == [120.0, 120.0]
+
+    def test_averaged_and_stock_items(self, quarterly_bundle):
+        """比率・株式数は平均、ストック項目は年度末の値となることのテスト"""
+        annual = synthesize_annual_bundle(quarterly_bundle)
+
+        assert annual.income.loc['Tax Rate For Calcs'].tolist() == pytest.approx([0.2, 0.2])
+        assert annual.shares.tolist() == [1000.0, 1050.0]
+        assert annual.balance.loc['Total Debt'].tolist() == [8, 4]
+        assert annual.is_complete()
+
+    def test_insufficient_quarters(self, quarterly_bundle):
+        """4四半期に満たない場合は算出しないことのテスト"""
+        short = StatementBundle(income=quarterly_bundle.income.iloc[:, :3])
+        annual = synthesize_annual_bundle(short)
+
+        assert annual.income is None
+        assert annual.shares is None
@@ -0,0 +1,171 @@
+"""運用監視（メトリクス・イベントログ）のテスト"""
+import json
+import logging
+import socket
+import urllib.request
+import pytest
+from unittest.mock import patch
+from utils.telemetry import (
+    EVENTS, Registry, SessionTracker, configure_logging, get_registry, log_event,
+    start_metrics_server, stop_metrics_server
+)
+from utils.telemetry.events import _EventFormatter
+from utils.telemetry.metrics import _Metric
+
+
+class TestTelemetry:
+    """メトリクスのテストクラス"""
+
+    def test_counter_and_gauge(self):
+        """カウンター・ゲージの記録と出力のテスト"""
+        registry = Registry(namespace="test")
+        requests = registry.counter("requests_total", "呼び出し回数", ("statement",))
+        requests.inc(statement="income")
+        requests.inc(2, statement="income")
+        requests.inc(statement='cash"flow')
+        sessions = registry.gauge("sessions", "セッション数")
+        sessions.set(3)
+        sessions.dec()
+
+        assert registry.counter("requests_total", "呼び出し回数", ("statement",)) is requests
+        assert requests.get(statement="income") == 3
+        text = registry.render()
+        assert "# TYPE test_requests_total counter" in text
+        assert 'test_requests_total{statement="income"} 3' in text
+        assert 'test_requests_total{statement="cash\\"flow"} 1' in text
+        assert "test_sessions 2" in text
+
+    def test_invalid_usage(self):
+        """ラベルの不一致・カウンターの減算・定義の重複がエラーになることのテスト"""
+        registry = Registry(namespace="test")
+        requests = registry.counter("requests_total", "呼び出し回数", ("statement",))
+
+        with pytest.raises(ValueError):
+            requests.inc(period="quarterly")
+        with pytest.raises(ValueError):
+            requests.inc(-1, statement="income")
+        with pytest.raises(ValueError):
+            registry.gauge("requests_total", "呼び出し回数", ("statement",))
+
+    def test_metric_requires_samples(self):
+        """samples を実装しないメトリクスは生成できないことのテスト"""
+        class Incomplete(_Metric):
+            type = "gauge"
+
+        with pytest.raises(TypeError):
+            Incomplete("test_incomplete", "未実装")
+
+    def test_histogram(self):
+        """ヒストグラムが累積件数・合計・件数を出力することのテスト"""
+        registry = Registry(namespace="test")
+        latency = registry.histogram("latency_seconds", "処理時間", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, stage="fetch")
+        with latency.time(stage="build"):
+            pass
+
+        text = registry.render()
+        assert 'test_latency_seconds_bucket{stage="fetch",le="0.1"} 2' in text
+        assert 'test_latency_seconds_bucket{stage="fetch",le="1"} 3' in text
+        assert 'test_latency_seconds_bucket{stage="fetch",le="+Inf"} 4' in text
+        assert 'test_latency_seconds_sum{stage="fetch"} 3.65' in text
+        assert 'test_latency_seconds_count{stage="fetch"} 4' in text
+        assert latency.count(stage="build") == 1
+
+    def test_register_stats(self):
+        """既存の統計が出力時に読み取られることのテスト"""
+        registry = Registry(namespace="test")
+        stats = {"hits": 3, "misses": 1, "entries": 2}
+        registry.register_stats("cache", "キャッシュの統計", lambda: stats, counters=("hits", "misses"))
+        stats["hits"] = 5
+
+        text = registry.render()
+        assert "# TYPE test_cache_hits_total counter" in text
+        assert "test_cache_hits_total 5" in text
+        assert "# TYPE test_cache_entries gauge" in text
+        assert "test_cache_entries 2" in text
+
+    def test_write_textfile(self, tmp_path):
+        """メトリクスがファイルに書き出されることのテスト"""
+        registry = Registry(namespace="test")
+        registry.counter("runs_total", "実行回数").inc()
+        path = tmp_path / "metrics" / "app.prom"
+
+        registry.write_textfile(str(path))
+
+        assert "test_runs_total 1" in path.read_text(encoding="utf-8")
+        assert [p.name for p in path.parent.iterdir()] == ["app.prom"]
+
+    def test_metrics_server(self):
+        """HTTPでメトリクスを取得できることのテスト"""
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        server = start_metrics_server(port, "127.0.0.1")
+        try:
+            assert start_metrics_server(port, "127.0.0.1") is server
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            stop_metrics_server()
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert "# TYPE earnings_events_total counter" in body
+        assert "earnings_active_sessions" in body
+        assert start_metrics_server(0) is None
+
+    def test_session_tracker(self):
+        """一定時間内に描画したセッションのみ数えることのテスト"""
+        tracker = SessionTracker(active_seconds=60)
+        tracker.touch("a")
+        tracker.touch("b")
+        tracker.touch("a")
+        assert tracker.active_count() == 2
+
+        tracker.active_seconds = -1
+        assert tracker.active_count() == 0
+
+    def test_session_tracker_bounded(self):
+        """active_countを呼び出さなくても期限切れのセッションが破棄されることのテスト"""
+        tracker = SessionTracker(active_seconds=10)
+        with patch('utils.telemetry.sessions.time.monotonic', side_effect=range(1000)):
+            for i in range(100):
+                tracker.touch(f"session-{i}")
+
+        # 最後の描画から10秒以内のセッションのみ保持する
+        assert len(tracker._last_seen) <= 11
+
+    def test_log_event(self, caplog):
+        """イベントがログに記録され、件数が数えられることのテスト"""
+        before = EVENTS.get(event="test_event", level="warning")
+        with caplog.at_level(logging.WARNING, logger="earnings_insight"):
+            log_event("test_event", "取得に失敗しました", ticker="AAPL")
+
+        assert EVENTS.get(event="test_event", level="warning") == before + 1
+        assert 'earnings_events_total{event="test_event",level="warning"}' in get_registry().render()
+        record = caplog.records[-1]
+        assert record.getMessage() == "取得に失敗しました"
+        assert record.event == "test_event"
+        assert record.fields == {"ticker": "AAPL"}
+
+    def test_event_format(self):
+        """イベントが1行のJSONで出力されることのテスト"""
+        logger = logging.getLogger("earnings_insight")
+        saved = (list(logger.handlers), logger.level, logger.propagate)
+        try:
+            configure_logging()
+            configure_logging()
+            handlers = [h for h in logger.handlers if isinstance(h.formatter, _EventFormatter)]
+        finally:
+            logger.handlers, logger.level, logger.propagate = saved
+        assert len(handlers) == 1
+
+        record = logging.LogRecord("earnings_insight", logging.ERROR, __file__, 1, "失敗しました", None, None)
+        record.event = "fetch_failed"
+        record.fields = {"ticker": "AAPL", "period": "quarterly"}
+        event = json.loads(handlers[0].format(record))
+        assert event["event"] == "fetch_failed"
+        assert event["level"] == "ERROR"
+        assert event["ticker"] == "AAPL"
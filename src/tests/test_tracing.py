@@ -0,0 +1,82 @@
+"""処理時間の計測（トレース）のテスト"""
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.tracing import STATUS_ERROR, bind, current_trace, span, trace, traced
+
+
+@traced()
+def add(a, b):
+    """計測対象の関数"""
+    return a + b
+
+
+class TestTracing:
+    """トレースのテストクラス"""
+
+    def test_nested_spans(self):
+        """スパンの親子関係と所要時間のテスト"""
+        with trace("render", ticker="AAPL") as current:
+            with span("fetch", period="quarterly") as outer:
+                with span("parse") as inner:
+                    pass
+
+        names = [s.name for s in current.finished_spans()]
+        assert names == ["render", "fetch", "parse"]
+        assert outer.parent_id == current.root.span_id
+        assert inner.parent_id == outer.span_id
+        assert outer.attributes == {"period": "quarterly"}
+        assert outer.duration_ns >= inner.duration_ns > 0
+        assert current_trace() is None
+
+    def test_traced_decorator(self):
+        """デコレーターで関数全体が計測されることのテスト"""
+        with trace("render") as current:
+            assert add(1, 2) == 3
+
+        assert [s.name for s in current.spans if s.name != "render"] == ["add"]
+
+    def test_noop_outside_trace(self):
+        """トレースの外ではスパンを記録しないことのテスト"""
+        with span("fetch") as s:
+            pass
+
+        assert s is None
+        assert add(1, 2) == 3
+
+    def test_bind_thread_pool(self):
+        """スレッドプールのワーカーにトレースが引き継がれることのテスト"""
+        with trace("render") as current:
+            with span("fetch_all") as parent:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    results = list(executor.map(bind(add), range(8), range(8)))
+
+        assert results == [i * 2 for i in range(8)]
+        children = [s for s in current.spans if s.name == "add"]
+        assert len(children) == 8
+        assert all(s.parent_id == parent.span_id for s in children)
+
+    def test_error_status(self):
+        """例外が発生したスパンがエラーとして記録されることのテスト"""
+        with pytest.raises(ValueError):
+            with trace("render") as current:
+                with span("fetch"):
+                    raise ValueError("失敗")
+
+        assert all(s.status == STATUS_ERROR for s in current.spans)
+
+    def test_export_otlp(self, tmp_path):
+        """OTLP/JSON形式でファイルに追記されることのテスト"""
+        path = tmp_path / "traces" / "trace.jsonl"
+        for _ in range(2):
+            with trace("render", export_path=str(path), ticker="AAPL"):
+                with span("fetch", count=3):
+                    pass
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        spans = json.loads(lines[0])["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in spans] == ["render", "fetch"]
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert int(spans[0]["endTimeUnixNano"]) >= int(spans[1]["endTimeUnixNano"])
+        assert {"key": "count", "value": {"intValue": "3"}} in spans[1]["attributes"]
@@ -1,4 +1,5 @@
 """定数定義"""
+import os
 
 # 期間設定
 PERIOD_QUARTERLY = "quarterly"
@@ -16,6 +17,13 @@ KEY_OPERATING_MARGIN = "営業利益率"
 KEY_OPERATING_CASH_FLOW_PER_SHARE = "1株あたり営業CF"
 KEY_DPS = "DPS"
 KEY_ROIC = "ROIC"
+KEY_TAX_RATE = "実効税率"
+KEY_TOTAL_DEBT = "有利子負債"
+KEY_STOCKHOLDER_EQUITY = "株主資本"
+KEY_NOPAT = "NOPAT"
+KEY_INVESTED_CAPITAL = "投下資本"
+KEY_PAYOUT_RATIO = "配当性向"
+KEY_OPERATING_CASH_FLOW_MARGIN = "営業CFマージン"
 
 # 財務諸表キー（yfinance）
 YF_REVENUE = "Total Revenue"
@@ -27,6 +35,78 @@ YF_TOTAL_ASSETS = "Total Assets"
 YF_TOTAL_LIABILITIES = "Total Liabilities Net Minority Interest"
 YF_TOTAL_DEBT = "Total Debt"
 YF_TAX_RATE = "Tax Rate For Calcs"
+YF_DILUTED_SHARES = "Diluted Average Shares"
+YF_EARNINGS_DATE = "Earnings Date"
+
+# 財務諸表の種類
+STATEMENT_INCOME = "income"
+STATEMENT_BALANCE = "balance"
+STATEMENT_CASH_FLOW = "cash_flow"
+STATEMENT_DIVIDENDS = "dividends"
+
+# キャッシュ設定
+CACHE_DIR = os.environ.get(
+    "EARNINGS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "earnings-insight-app")
+)
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# 処理結果キャッシュ設定
+# 処理ロジック（正規化・計算式など）を変更した場合は DATA_PROCESSING_VERSION を更新する
+# （派生指標の追加・削除・入力の変更は data.data_version で自動的に反映される）
+DATA_PROCESSING_VERSION = "1"
+RESULT_CACHE_MAX_ENTRIES = 1024
+RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+FIGURE_CACHE_MAX_ENTRIES = 512
+
+# 事前計算ストア設定（precompute.py で作成し、アプリはここから優先して読み込む）
+STORE_PATH = os.environ.get(
+    "EARNINGS_STORE_PATH",
+    os.path.join(CACHE_DIR, "financial_data.arrow")
+)
+
+# データ取得元設定（"yfinance" または記録済みファイルを読む "fixture"）
+BACKEND_YFINANCE = "yfinance"
+BACKEND_FIXTURE = "fixture"
+DATA_BACKEND = os.environ.get("EARNINGS_DATA_BACKEND", BACKEND_YFINANCE)
+FIXTURE_DIR = os.environ.get(
+    "EARNINGS_FIXTURE_DIR",
+    os.path.join(CACHE_DIR, "fixtures")
+)
+
+# トレース設定（指定した場合は処理時間の内訳を OTLP/JSON 形式で追記する）
+TRACE_EXPORT_PATH = os.environ.get("EARNINGS_TRACE_FILE")
+TRACE_SERVICE_NAME = "earnings-insight-app"
+
+# 運用監視設定
+# EARNINGS_METRICS_PORT を指定した場合は Prometheus 形式のメトリクスを HTTP（/metrics）で公開する
+# EARNINGS_METRICS_FILE を指定した場合は同じ内容をファイル（node_exporter の textfile 形式）に書き出す
+METRICS_PORT = int(os.environ.get("EARNINGS_METRICS_PORT", "0"))
+METRICS_HOST = os.environ.get("EARNINGS_METRICS_HOST", "127.0.0.1")
+METRICS_TEXTFILE_PATH = os.environ.get("EARNINGS_METRICS_FILE")
+METRICS_NAMESPACE = "earnings"
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 最後の描画からこの秒数以内のセッションを利用中とみなす
+SESSION_ACTIVE_SECONDS = 300
+LOG_LEVEL = os.environ.get("EARNINGS_LOG_LEVEL", "INFO")
+LOGGER_NAME = "earnings_insight"
+
+# 取得設定
+FETCH_TIMEOUT_SECONDS = 30
+BATCH_MAX_WORKERS = 8
+ASYNC_FETCH_MAX_WORKERS = 32
+DEBUG_MAX_WORKERS = 8
+# デバッグページで取得結果を再利用する時間（秒）。表示中の銘柄の結果のみ保持する
+DEBUG_RESULTS_TTL_SECONDS = 10 * 60
+
+# リクエスト制御設定（yfinance呼び出し）
+REQUEST_RATE_PER_SECOND = 5.0
+REQUEST_BURST = 20
+REQUEST_MAX_RETRIES = 3
+REQUEST_BACKOFF_BASE_SECONDS = 0.5
+REQUEST_BACKOFF_MAX_SECONDS = 8.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 60.0
 
 # エラーメッセージ
 ERROR_DATA_FETCH = "財務データの取得に失敗しました。ティッカーシンボルを確認してください。"
@@ -35,6 +115,17 @@ ERROR_PROCESSING = "データ処理中にエラーが発生しました。"
 
 # 表示設定
 DATE_FORMAT = "%Y/%m"
+# グラフの描画方式（"auto": 点数に応じて切り替え、"svg": 常にSVG、"webgl": 常にWebGL）
+RENDER_MODE_AUTO = "auto"
+RENDER_MODE_SVG = "svg"
+RENDER_MODE_WEBGL = "webgl"
+RENDER_MODE = os.environ.get("EARNINGS_RENDER_MODE", RENDER_MODE_AUTO)
+# この点数を超える折れ線は WebGL（Scattergl）で描画する
+RENDER_WEBGL_THRESHOLD = 200
+# 折れ線の点数の上限（超える場合は形状を保つように間引く）
+RENDER_MAX_LINE_POINTS = 400
+# グラフに送る数値の有効桁数
+RENDER_SIGNIFICANT_DIGITS = 6
 APP_TITLE = "Earnings Insight App"
 APP_DESCRIPTION = "米国株式の財務情報分析アプリケーション"
 APP_ICON = "📈"
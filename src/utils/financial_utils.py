@@ -1,7 +1,9 @@
 """財務データ処理ユーティリティ"""
+import logging
 from typing import Dict, Optional
 import pandas as pd
 from models.financial_data import FinancialData
+from utils.telemetry import log_event
 
 def format_financial_value(value: float) -> str:
     """
@@ -74,5 +76,5 @@ def get_normalized_financial_data(ticker: str, period: str = "quarterly") -> Opt
         return normalized_data
 
     except Exception as e:
-        print(f"財務データの正規化に失敗しました: {str(e)}")
+        log_event("normalize_failed", f"財務データの正規化に失敗しました: {str(e)}", level=logging.ERROR)
         return None
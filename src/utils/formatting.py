@@ -23,13 +23,13 @@ def format_financial_value(value: float) -> str:
 
 def format_dates(dates: List[datetime]) -> List[str]:
     """
-    日付リストをフォーマット
+    日付リストをフォーマット（全要素を一括で変換）
     Args:
         dates (List[datetime]): 日付リスト
     Returns:
         List[str]: フォーマットされた日付リスト
     """
-    return [pd.to_datetime(date).strftime(DATE_FORMAT) for date in dates]
+    return pd.DatetimeIndex(dates).strftime(DATE_FORMAT).tolist()
 
 def format_percentage(value: float, decimal_places: int = 1) -> str:
     """
@@ -41,3 +41,18 @@ def format_percentage(value: float, decimal_places: int = 1) -> str:
         str: フォーマットされた文字列
     """
     return f"{value:.{decimal_places}f}%"
+
+def format_bytes(size: int) -> str:
+    """
+    データサイズをフォーマット
+    Args:
+        size (int): バイト数
+    Returns:
+        str: フォーマットされた文字列
+    """
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    elif size >= 1024:
+        return f"{size / 1024:.1f}KB"
+    else:
+        return f"{size}B"
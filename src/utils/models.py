@@ -1,67 +1,230 @@
 """財務データの型定義"""
 from typing import Dict, List, Optional, Union
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from utils.formatting import format_dates
+
+class _Column:
+    """FinancialDataModelの列（ブロックの行ビューを返す記述子）
+
+    必須・任意の区別は FinancialDataModel.FIELDS / OPTIONAL_FIELDS で定める。
+    """
+
+    def __init__(self, name: str):
+        """
+        初期化
+        Args:
+            name (str): 列名
+        """
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.column(self.name)
+
 
 class FinancialDataModel:
-    """財務データモデル"""
-    dates: List[datetime]
-    revenue: List[float]
-    operating_income: List[float]
-    net_income: List[float]
-    operating_cash_flow: List[float]
-    shares: List[int]
-    eps: List[float]
-    bps: List[float]
-    operating_margin: List[float]
-    operating_cash_flow_per_share: List[float]
-    roic: List[float]
-    dps: Optional[List[float]] = None
+    """財務データモデル
+
+    全指標を1つの2次元float64配列（指標 × 期、C連続）にまとめて保持する。
+    各指標の属性はこの配列の行ビュー（読み取り専用）を返し、インスタンスは作成後に変更できない。
+    必須の指標が入力にない場合はNaNで埋め、任意の指標（dps など）がない場合はNoneを返す。
+    """
+    __slots__ = ("_dates", "_date_labels", "_block", "_index")
+
+    # 必須の指標と任意の指標（属性として参照できる列）
+    FIELDS = (
+        "revenue", "operating_income", "net_income", "operating_cash_flow", "shares",
+        "eps", "bps", "operating_margin", "operating_cash_flow_per_share", "roic",
+    )
+    OPTIONAL_FIELDS = (
+        "dps", "payout_ratio", "operating_cash_flow_margin",
+        "tax_rate", "total_debt", "stockholder_equity",
+    )
+
+    revenue = _Column("revenue")
+    operating_income = _Column("operating_income")
+    net_income = _Column("net_income")
+    operating_cash_flow = _Column("operating_cash_flow")
+    shares = _Column("shares")
+    eps = _Column("eps")
+    bps = _Column("bps")
+    operating_margin = _Column("operating_margin")
+    operating_cash_flow_per_share = _Column("operating_cash_flow_per_share")
+    roic = _Column("roic")
+    dps = _Column("dps")
+    payout_ratio = _Column("payout_ratio")
+    operating_cash_flow_margin = _Column("operating_cash_flow_margin")
+    # 派生指標の計算に使った元データ（差分更新で変更の有無を判定するために保持）
+    tax_rate = _Column("tax_rate")
+    total_debt = _Column("total_debt")
+    stockholder_equity = _Column("stockholder_equity")
 
     def __init__(self, data: Dict[str, List]):
         """
         初期化
         Args:
-            data (Dict[str, List]): 財務データ辞書
-        """
-        self.dates = data.get("dates", [])
-        self.revenue = data.get("revenue", [])
-        self.operating_income = data.get("operating_income", [])
-        self.net_income = data.get("net_income", [])
-        self.operating_cash_flow = data.get("operating_cash_flow", [])
-        self.shares = data.get("shares", [])
-        self.eps = data.get("eps", [])
-        self.bps = data.get("bps", [])
-        self.operating_margin = data.get("operating_margin", [])
-        self.operating_cash_flow_per_share = data.get("operating_cash_flow_per_share", [])
-        self.roic = data.get("roic", [])
-        self.dps = data.get("dps", None)
-
-    def to_dict(self) -> Dict[str, List]:
-        """
-        辞書形式に変換
+            data (Dict[str, List]): 財務データ辞書（"dates" と指標名をキーとする）
+        Raises:
+            ValueError: 指標の要素数が日付の数と一致しない場合
+        """
+        dates = pd.DatetimeIndex(data.get("dates", []))
+        names = list(self.FIELDS) + [
+            key for key in data
+            if key != "dates" and key not in self.FIELDS and data[key] is not None
+        ]
+
+        block = np.full((len(names), len(dates)), np.nan)
+        for i, name in enumerate(names):
+            values = data.get(name)
+            if values is None:
+                continue
+            values = np.asarray(values, dtype="float64")
+            if values.shape != (len(dates),):
+                raise ValueError(f"{name}の要素数が日付の数と一致しません")
+            block[i] = values
+        block.flags.writeable = False
+
+        object.__setattr__(self, "_dates", dates)
+        # チャートの軸ラベル（描画のたびに変換しないよう作成時に一度だけ変換）
+        object.__setattr__(self, "_date_labels", format_dates(dates))
+        object.__setattr__(self, "_block", block)
+        object.__setattr__(self, "_index", {name: i for i, name in enumerate(names)})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FinancialDataModelは変更できません")
+
+    def __reduce__(self):
+        return (self.__class__, (self.to_dict(),))
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """
+        決算日（昇順）
+        Returns:
+            pd.DatetimeIndex: 決算日
+        """
+        return self._dates
+
+    @property
+    def date_labels(self) -> List[str]:
+        """
+        チャート用の日付ラベル
+        Returns:
+            List[str]: フォーマット済みの日付
+        """
+        return self._date_labels
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        保持している指標名（ブロックの行の順）
+        Returns:
+            List[str]: 指標名
+        """
+        return list(self._index)
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        全指標の2次元配列（指標 × 期、読み取り専用）
         Returns:
-            Dict[str, List]: 財務データ辞書
-        """
-        result = {
-            "dates": self.dates,
-            "revenue": self.revenue,
-            "operating_income": self.operating_income,
-            "net_income": self.net_income,
-            "operating_cash_flow": self.operating_cash_flow,
-            "shares": self.shares,
-            "eps": self.eps,
-            "bps": self.bps,
-            "operating_margin": self.operating_margin,
-            "operating_cash_flow_per_share": self.operating_cash_flow_per_share,
-            "roic": self.roic
-        }
-
-        if self.dps is not None:
-            result["dps"] = self.dps
+            np.ndarray: 指標の配列
+        """
+        return self._block
 
+    @property
+    def extra_metrics(self) -> Dict[str, np.ndarray]:
+        """
+        MetricRegistryに追加登録された指標（属性として定義されていないもの）
+        Returns:
+            Dict[str, np.ndarray]: 指標名と値の辞書
+        """
+        known = set(self.FIELDS) | set(self.OPTIONAL_FIELDS)
+        return {name: self._block[i] for name, i in self._index.items() if name not in known}
+
+    @property
+    def nbytes(self) -> int:
+        """
+        配列データのメモリ使用量
+        Returns:
+            int: 指標の配列と日付の合計バイト数
+        """
+        return self._block.nbytes + self._dates.nbytes
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        """
+        指標の値を取得
+        Args:
+            name (str): 指標名
+        Returns:
+            Optional[np.ndarray]: 指標の値（読み取り専用ビュー、存在しない場合はNone）
+        """
+        i = self._index.get(name)
+        return None if i is None else self._block[i]
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """
+        辞書形式に変換（値は配列のビューでコピーしない）
+        Returns:
+            Dict[str, np.ndarray]: 財務データ辞書
+        """
+        result = {"dates": self._dates}
+        for name, i in self._index.items():
+            result[name] = self._block[i]
         return result
 
+    def to_frame(self) -> pd.DataFrame:
+        """
+        データフレームに変換（ブロックは読み取り専用のため、変更できるようコピーする）
+        Returns:
+            pd.DataFrame: 決算日をインデックス、指標を列とするデータフレーム
+        """
+        return pd.DataFrame(self._block.T, index=self._dates, columns=self.columns, copy=True)
+
+class StatementBundle:
+    """財務諸表一式"""
+    income: Optional[pd.DataFrame]
+    balance: Optional[pd.DataFrame]
+    cash_flow: Optional[pd.DataFrame]
+    shares: Optional[pd.Series]
+    dividends: Optional[pd.Series]
+
+    def __init__(
+        self,
+        income: Optional[pd.DataFrame] = None,
+        balance: Optional[pd.DataFrame] = None,
+        cash_flow: Optional[pd.DataFrame] = None,
+        shares: Optional[pd.Series] = None,
+        dividends: Optional[pd.Series] = None
+    ):
+        """
+        初期化
+        Args:
+            income (Optional[pd.DataFrame], optional): 損益計算書. Defaults to None.
+            balance (Optional[pd.DataFrame], optional): 貸借対照表. Defaults to None.
+            cash_flow (Optional[pd.DataFrame], optional): キャッシュフロー計算書. Defaults to None.
+            shares (Optional[pd.Series], optional): 希薄化後発行済株式数. Defaults to None.
+            dividends (Optional[pd.Series], optional): 配当データ. Defaults to None.
+        """
+        self.income = income
+        self.balance = balance
+        self.cash_flow = cash_flow
+        self.shares = shares
+        self.dividends = dividends
+
+    def is_complete(self) -> bool:
+        """
+        財務データの処理に必要な諸表が揃っているか判定
+        Returns:
+            bool: 揃っている場合はTrue（配当データは任意）
+        """
+        return not any(
+            value is None for value in (self.income, self.balance, self.cash_flow, self.shares)
+        )
+
 class ChartConfig:
     """チャート設定"""
     title: str
@@ -0,0 +1,19 @@
+"""運用監視（メトリクス・イベントログ）パッケージ
+
+- metrics: カウンター・ゲージ・ヒストグラムと登録先（Registry）
+- exposition: Prometheus のテキスト形式への変換
+- exporter: HTTP（/metrics）での公開と textfile 形式での書き出し
+- events: イベントログ（log_event）とその件数
+- sessions: 利用中のセッション数
+
+使用例:
+    UPSTREAM_REQUESTS = get_registry().counter(
+        "upstream_requests_total", "上流への呼び出し回数", ("statement",)
+    )
+    UPSTREAM_REQUESTS.inc(statement="income")
+    log_event("fetch_failed", "損益計算書の取得に失敗しました", ticker="AAPL")
+"""
+from utils.telemetry.metrics import Counter, Gauge, Histogram, Registry, get_registry
+from utils.telemetry.events import EVENTS, configure_logging, log_event
+from utils.telemetry.sessions import SessionTracker, get_session_tracker
+from utils.telemetry.exporter import start_metrics_server, stop_metrics_server, write_metrics_textfile
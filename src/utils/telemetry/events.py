@@ -0,0 +1,62 @@
+"""イベントログモジュール
+
+エラーなどの出来事は print ではなく log_event で記録し、イベント名ごとに件数を数える。
+"""
+import json
+import logging
+from utils.constants import LOG_LEVEL, LOGGER_NAME
+from utils.telemetry.metrics import get_registry
+
+
+class _EventFormatter(logging.Formatter):
+    """イベントを1行1件の JSON で出力するフォーマッター"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+_logger = logging.getLogger(LOGGER_NAME)
+
+EVENTS = get_registry().counter("events_total", "記録したイベントの件数", ("event", "level"))
+
+
+def log_event(event: str, message: str, level: int = logging.WARNING, **fields) -> None:
+    """
+    出来事をログに記録し、イベント名ごとの件数を数える
+    Args:
+        event (str): イベント名（集計用の固定の名前）
+        message (str): メッセージ
+        level (int): ログレベル
+        **fields: 付加情報（銘柄コードなど）
+    """
+    # 例外処理の中から呼び出されるため、記録に失敗しても例外は出さない
+    try:
+        EVENTS.inc(event=event, level=logging.getLevelName(level).lower())
+        _logger.log(level, message, extra={"event": event, "fields": fields})
+    except Exception:
+        pass
+
+
+def configure_logging(level: str = LOG_LEVEL) -> None:
+    """
+    イベントログを標準エラー出力に JSON 形式で出力するよう設定（複数回呼び出しても1回のみ設定）
+    Args:
+        level (str): 出力するログレベル
+    """
+    if any(isinstance(h.formatter, _EventFormatter) for h in _logger.handlers):
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(_EventFormatter())
+    _logger.addHandler(handler)
+    _logger.setLevel(level)
+    _logger.propagate = False
@@ -0,0 +1,92 @@
+"""メトリクスの公開モジュール
+
+登録したメトリクスを HTTP（/metrics）で公開するか、node_exporter の textfile 形式でファイルに書き出す。
+"""
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from utils.constants import METRICS_HOST, METRICS_PORT, METRICS_TEXTFILE_PATH
+from utils.telemetry.events import log_event
+from utils.telemetry.exposition import CONTENT_TYPE
+from utils.telemetry.metrics import Registry, get_registry
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """メトリクスを返す HTTP ハンドラー"""
+
+    registry: Registry
+
+    def do_GET(self):
+        """GET /metrics にメトリクスを返す"""
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """アクセスログは出力しない"""
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST) -> Optional[ThreadingHTTPServer]:
+    """
+    メトリクスを公開する HTTP サーバーをバックグラウンドで起動（起動済みの場合はそれを返す）
+    Args:
+        port (int): ポート番号（0の場合は起動しない）
+        host (str): 待ち受けるアドレス
+    Returns:
+        Optional[ThreadingHTTPServer]: 起動したサーバー（起動しない場合や失敗した場合はNone）
+    """
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": get_registry()})
+        try:
+            _server = ThreadingHTTPServer((host, port), handler)
+        except OSError as e:
+            log_event("metrics_server_failed", f"メトリクスサーバーを起動できませんでした: {host}:{port}: {str(e)}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        log_event("metrics_server_started", f"メトリクスを公開しています: http://{host}:{port}/metrics",
+                  level=logging.INFO, host=host, port=port)
+        return _server
+
+
+def stop_metrics_server() -> None:
+    """
+    メトリクスを公開する HTTP サーバーを停止
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            return
+        _server.shutdown()
+        _server.server_close()
+        _server = None
+
+
+def write_metrics_textfile(path: Optional[str] = METRICS_TEXTFILE_PATH) -> None:
+    """
+    メトリクスをファイルに書き出す（出力先が未指定の場合は何もしない）
+    Args:
+        path (Optional[str]): 出力先のファイル
+    """
+    if not path:
+        return
+    try:
+        get_registry().write_textfile(path)
+    except Exception as e:
+        log_event("metrics_write_failed", f"メトリクスの書き出しに失敗しました: {path}: {str(e)}")
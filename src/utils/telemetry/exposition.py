@@ -0,0 +1,82 @@
+"""Prometheus のテキスト形式（バージョン 0.0.4）への変換モジュール"""
+from typing import List, Tuple
+
+# メトリクスの種類
+TYPE_COUNTER = "counter"
+TYPE_GAUGE = "gauge"
+TYPE_HISTOGRAM = "histogram"
+
+# Prometheus のテキスト形式（バージョン 0.0.4）
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render_text(families: List[Tuple[str, str, str, List]]) -> str:
+    """
+    メトリクスをテキスト形式に変換
+    Args:
+        families (List[Tuple[str, str, str, List]]): メトリクス名、種類、説明、サンプルの一覧
+    Returns:
+        str: テキスト形式のメトリクス
+    """
+    lines = []
+    for name, kind, help, samples in families:
+        lines.append(f"# HELP {name} {_escape_help(help)}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in samples:
+            lines.append(f"{sample_name}{_format_labels(labels)} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    ラベルをテキスト形式に変換
+    Args:
+        labels (Tuple[Tuple[str, str], ...]): ラベル名と値
+    Returns:
+        str: {name="value",...}（ラベルがない場合は空文字）
+    """
+    if not labels:
+        return ""
+    escaped = (f'{name}="{_escape_label_value(str(value))}"' for name, value in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    """
+    ラベルの値をテキスト形式用にエスケープ
+    Args:
+        value (str): ラベルの値
+    Returns:
+        str: エスケープした値
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _escape_help(help: str) -> str:
+    """
+    説明文をテキスト形式用にエスケープ
+    Args:
+        help (str): 説明
+    Returns:
+        str: エスケープした説明
+    """
+    return help.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """
+    値をテキスト形式に変換
+    Args:
+        value (float): 値
+    Returns:
+        str: 値の文字列（整数はそのまま、無限大は +Inf）
+    """
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
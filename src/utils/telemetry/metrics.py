@@ -0,0 +1,464 @@
+"""メトリクスの登録・集計モジュール
+
+カウンター・ゲージ・ヒストグラムと、既存の統計を読み取る収集器を登録先（Registry）にまとめる。
+テキスト形式への変換は exposition、公開（HTTP・ファイル）は exporter が行う。
+"""
+import bisect
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from utils.constants import METRICS_NAMESPACE, METRICS_LATENCY_BUCKETS, LOGGER_NAME
+from utils.telemetry.exposition import TYPE_COUNTER, TYPE_GAUGE, TYPE_HISTOGRAM, format_value, render_text
+
+# 統計の取得失敗の記録用（events は登録先に依存するため、ロガーへ直接記録する）
+_logger = logging.getLogger(LOGGER_NAME)
+
+
+class _Metric(ABC):
+    """メトリクスの基底クラス"""
+
+    type: str
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """
+        初期化
+        Args:
+            name (str): メトリクス名（名前空間を含む）
+            help (str): 説明
+            labelnames (Sequence[str]): ラベル名
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """
+        ラベルの値を登録順のタプルに変換
+        Args:
+            labels (Dict[str, str]): ラベル名と値
+        Returns:
+            Tuple[str, ...]: ラベルの値
+        Raises:
+            ValueError: ラベル名が登録したものと一致しない場合
+        """
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}のラベルが一致しません: {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        """
+        現在の値を取得
+        Returns:
+            List[Tuple[str, Tuple[Tuple[str, str], ...], float]]: サンプル名、ラベル、値の一覧
+        """
+
+
+class Counter(_Metric):
+    """単調に増加する値（呼び出し回数など）"""
+
+    type = TYPE_COUNTER
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """
+        値を加算
+        Args:
+            amount (float): 加算する量（0以上）
+            **labels: ラベルの値
+        Raises:
+            ValueError: 負の値を加算しようとした場合
+        """
+        if amount < 0:
+            raise ValueError("カウンターは減らせません")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        """
+        現在の値を取得
+        Args:
+            **labels: ラベルの値
+        Returns:
+            float: 値（未記録の場合は0）
+        """
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        return [(self.name, tuple(zip(self.labelnames, key)), value) for key, value in sorted(values.items())]
+
+
+class Gauge(_Metric):
+    """増減する値（利用中のセッション数など）
+
+    set_function で関数を登録した場合は、出力のたびに関数を呼び出して値を求める。
+    """
+
+    type = TYPE_GAUGE
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels) -> None:
+        """
+        値を設定
+        Args:
+            value (float): 値
+            **labels: ラベルの値
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """
+        値を加算
+        Args:
+            amount (float): 加算する量（負の場合は減算）
+            **labels: ラベルの値
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        """
+        値を減算
+        Args:
+            amount (float): 減算する量
+            **labels: ラベルの値
+        """
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """
+        出力時に値を求める関数を登録（ラベルなしのゲージのみ）
+        Args:
+            function (Callable[[], float]): 値を返す関数
+        """
+        if self.labelnames:
+            raise ValueError(f"{self.name}はラベル付きのため関数を登録できません")
+        self._function = function
+
+    def get(self, **labels) -> float:
+        """
+        現在の値を取得
+        Args:
+            **labels: ラベルの値
+        Returns:
+            float: 値（未記録の場合は0）
+        """
+        if self._function is not None:
+            return float(self._function())
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self):
+        if self._function is not None:
+            return [(self.name, (), self.get())]
+        with self._lock:
+            values = dict(self._values)
+        return [(self.name, tuple(zip(self.labelnames, key)), value) for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """値の分布（処理時間など）
+
+    値はバケット（上限値）ごとの件数と合計で保持する。
+    """
+
+    type = TYPE_HISTOGRAM
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = METRICS_LATENCY_BUCKETS
+    ):
+        """
+        初期化
+        Args:
+            name (str): メトリクス名
+            help (str): 説明
+            labelnames (Sequence[str]): ラベル名
+            buckets (Sequence[float]): バケットの上限値（昇順）
+        """
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # ラベルごとの [バケットごとの件数..., +Infの件数], 合計
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        値を記録
+        Args:
+            value (float): 値
+            **labels: ラベルの値
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """
+        処理時間（秒）を記録するコンテキストマネージャー
+        Args:
+            **labels: ラベルの値
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        """
+        記録した件数を取得
+        Args:
+            **labels: ラベルの値
+        Returns:
+            int: 件数
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts, _ = self._values.get(key) or ([0], 0.0)
+            return sum(counts)
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+        samples = []
+        for key, (counts, total) in sorted(values.items()):
+            labels = tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", labels + (("le", format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class _StatsCollector:
+    """統計の辞書をメトリクスとして出力する収集器"""
+
+    def __init__(
+        self,
+        prefix: str,
+        help: str,
+        stats: Callable[[], Dict[str, float]],
+        counters: Iterable[str]
+    ):
+        """
+        初期化
+        Args:
+            prefix (str): メトリクス名の接頭辞（名前空間を含む）
+            help (str): 説明
+            stats (Callable[[], Dict[str, float]]): 統計のスナップショットを返す関数
+            counters (Iterable[str]): 累計値（カウンター）として出力する項目
+        """
+        self.prefix = prefix
+        self.help = help
+        self.stats = stats
+        self.counters = set(counters)
+
+    def collect(self) -> List[Tuple[str, str, str, List]]:
+        """
+        現在の統計をメトリクスに変換
+        Returns:
+            List[Tuple[str, str, str, List]]: メトリクス名、種類、説明、サンプルの一覧
+        """
+        families = []
+        for key, value in sorted(self.stats().items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key in self.counters:
+                name, kind = f"{self.prefix}_{key}_total", TYPE_COUNTER
+            else:
+                name, kind = f"{self.prefix}_{key}", TYPE_GAUGE
+            families.append((name, kind, f"{self.help}（{key}）", [(name, (), value)]))
+        return families
+
+
+class Registry:
+    """メトリクスの登録先クラス"""
+
+    def __init__(self, namespace: str = METRICS_NAMESPACE):
+        """
+        初期化
+        Args:
+            namespace (str): メトリクス名の接頭辞
+        """
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, _StatsCollector] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """
+        カウンターを登録（登録済みの場合はそれを返す）
+        Args:
+            name (str): メトリクス名（名前空間を除く）
+            help (str): 説明
+            labelnames (Sequence[str]): ラベル名
+        Returns:
+            Counter: カウンター
+        """
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """
+        ゲージを登録（登録済みの場合はそれを返す）
+        Args:
+            name (str): メトリクス名（名前空間を除く）
+            help (str): 説明
+            labelnames (Sequence[str]): ラベル名
+        Returns:
+            Gauge: ゲージ
+        """
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = METRICS_LATENCY_BUCKETS
+    ) -> Histogram:
+        """
+        ヒストグラムを登録（登録済みの場合はそれを返す）
+        Args:
+            name (str): メトリクス名（名前空間を除く）
+            help (str): 説明
+            labelnames (Sequence[str]): ラベル名
+            buckets (Sequence[float]): バケットの上限値
+        Returns:
+            Histogram: ヒストグラム
+        """
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_stats(
+        self,
+        prefix: str,
+        help: str,
+        stats: Callable[[], Dict[str, float]],
+        counters: Iterable[str] = ()
+    ) -> None:
+        """
+        既存の統計（キャッシュのヒット数など）を出力時に読み取るよう登録
+        同じ接頭辞で再登録した場合は置き換える
+        Args:
+            prefix (str): メトリクス名の接頭辞（名前空間を除く）
+            help (str): 説明
+            stats (Callable[[], Dict[str, float]]): 統計のスナップショットを返す関数
+            counters (Iterable[str]): 累計値として出力する項目（それ以外はゲージ）
+        """
+        full_prefix = f"{self.namespace}_{prefix}"
+        with self._lock:
+            self._collectors[full_prefix] = _StatsCollector(full_prefix, help, stats, counters)
+
+    def collect(self) -> List[Tuple[str, str, str, List]]:
+        """
+        登録したメトリクスと統計の現在値を取得（取得に失敗した統計は除く）
+        Returns:
+            List[Tuple[str, str, str, List]]: メトリクス名、種類、説明、サンプルの一覧
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        families = [(m.name, m.type, m.help, m.samples()) for m in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector.collect())
+            except Exception as e:
+                _logger.warning(
+                    f"統計の取得に失敗しました: {collector.prefix}: {str(e)}",
+                    extra={"event": "metrics_collect_failed", "fields": {"prefix": collector.prefix}}
+                )
+        return families
+
+    def render(self) -> str:
+        """
+        登録したメトリクスを Prometheus のテキスト形式で出力
+        Returns:
+            str: テキスト形式のメトリクス
+        """
+        return render_text(self.collect())
+
+    def write_textfile(self, path: str) -> None:
+        """
+        メトリクスをファイルに書き出す（node_exporter の textfile collector 用）
+        読み取り途中のファイルを読まれないよう、一時ファイル経由で置き換える
+        Args:
+            path (str): 出力先のファイル（拡張子は .prom）
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def _register(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs):
+        """
+        メトリクスを登録（登録済みの場合はそれを返す）
+        Args:
+            cls: メトリクスのクラス
+            name (str): メトリクス名（名前空間を除く）
+            help (str): 説明
+            labelnames (Sequence[str]): ラベル名
+            **kwargs: クラス固有の引数
+        Returns:
+            _Metric: メトリクス
+        Raises:
+            ValueError: 同じ名前で種類またはラベルが異なるメトリクスが登録済みの場合
+        """
+        full_name = f"{self.namespace}_{name}"
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, help, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"{full_name}は異なる定義で登録済みです")
+            return metric
+
+
+_registry = Registry()
+
+
+def get_registry() -> Registry:
+    """
+    プロセス内で共有するメトリクスの登録先を取得
+    Returns:
+        Registry: 全セッション共通のインスタンス
+    """
+    return _registry
+
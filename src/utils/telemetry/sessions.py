@@ -0,0 +1,72 @@
+"""利用中のセッション数の集計モジュール"""
+import threading
+import time
+from typing import Dict
+from utils.constants import SESSION_ACTIVE_SECONDS
+from utils.telemetry.metrics import get_registry
+
+
+class SessionTracker:
+    """利用中のセッション数を数えるクラス
+
+    描画のたびに touch を呼び出し、一定時間以内に描画したセッションを利用中とみなす。
+    """
+
+    def __init__(self, active_seconds: float = SESSION_ACTIVE_SECONDS):
+        """
+        初期化
+        Args:
+            active_seconds (float): 利用中とみなす最後の描画からの秒数
+        """
+        self.active_seconds = active_seconds
+        self._last_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session_id: str) -> None:
+        """
+        セッションの描画を記録（期限切れのセッションはここで破棄する）
+        Args:
+            session_id (str): セッションID
+        """
+        now = time.monotonic()
+        with self._lock:
+            # 最後の描画順に並べ、先頭から期限切れのセッションを破棄する
+            self._last_seen.pop(session_id, None)
+            self._last_seen[session_id] = now
+            self._expire(now)
+
+    def active_count(self) -> int:
+        """
+        利用中のセッション数を取得（期限切れのセッションは破棄する）
+        Returns:
+            int: セッション数
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._last_seen)
+
+    def _expire(self, now: float) -> None:
+        """
+        期限切れのセッションを破棄（ロックを取得した状態で呼び出す）
+        Args:
+            now (float): 現在時刻（time.monotonic）
+        """
+        threshold = now - self.active_seconds
+        while self._last_seen:
+            oldest = next(iter(self._last_seen))
+            if self._last_seen[oldest] >= threshold:
+                break
+            del self._last_seen[oldest]
+
+
+_session_tracker = SessionTracker()
+get_registry().gauge("active_sessions", "利用中のセッション数").set_function(_session_tracker.active_count)
+
+
+def get_session_tracker() -> SessionTracker:
+    """
+    プロセス内で共有するセッション数の集計を取得
+    Returns:
+        SessionTracker: 全セッション共通のインスタンス
+    """
+    return _session_tracker
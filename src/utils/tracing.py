@@ -0,0 +1,303 @@
+"""処理時間の計測（トレース）モジュール
+
+処理をスパン（名前付きの区間）で囲み、ナノ秒精度で所要時間を記録する。
+スパンはトレース（1回の描画やジョブの実行）ごとに収集し、親子関係から処理の内訳を確認できる。
+トレースの外ではスパンは何も記録しないため、計測しない場合の負荷はごく小さい。
+
+使用例:
+    with trace("app.render") as current:
+        with span("DataFetcher.get_income_statement", period="quarterly"):
+            ...
+    current.spans  # 終了したスパンの一覧
+
+環境変数 EARNINGS_TRACE_FILE を指定すると、終了したトレースを OpenTelemetry の
+OTLP/JSON 形式（1行1トレース）でファイルに追記する。
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from utils.constants import TRACE_EXPORT_PATH, TRACE_SERVICE_NAME
+from utils.telemetry import log_event
+
+# 実行中のトレースとスパン（スレッド・非同期タスクごと）
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+# トレースファイルへの書き込み（1行ずつ追記する）
+_export_lock = threading.Lock()
+
+# スパンのステータス（OpenTelemetryのStatusCode）
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """スパン（計測区間）クラス"""
+
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "thread")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        """
+        初期化（生成時点を開始時刻とする）
+        Args:
+            name (str): スパン名
+            parent_id (Optional[str]): 親スパンのID
+            attributes (Dict[str, Any]): 属性
+        """
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = STATUS_UNSET
+        self.thread = threading.current_thread().name
+        self.end_ns: Optional[int] = None
+        self.start_ns = time.perf_counter_ns()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        属性を設定
+        Args:
+            key (str): 属性名
+            value (Any): 値
+        """
+        self.attributes[key] = value
+
+    @property
+    def duration_ns(self) -> int:
+        """
+        所要時間
+        Returns:
+            int: ナノ秒（実行中の場合は現時点までの時間）
+        """
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return end_ns - self.start_ns
+
+
+class Trace:
+    """トレース（スパンの集まり）クラス"""
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        """
+        初期化
+        Args:
+            name (str): ルートスパン名
+            attributes (Dict[str, Any]): ルートスパンの属性
+        """
+        self.trace_id = os.urandom(16).hex()
+        # perf_counter_ns の値をUNIX時刻に変換するための基準
+        self.epoch_ns = time.time_ns()
+        self.anchor_ns = time.perf_counter_ns()
+        self.root = Span(name, None, attributes)
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        """
+        終了したスパンを追加
+        Args:
+            span (Span): スパン
+        """
+        with self._lock:
+            self.spans.append(span)
+
+    def finished_spans(self) -> List[Span]:
+        """
+        終了したスパンを開始順に取得
+        Returns:
+            List[Span]: スパンの一覧
+        """
+        with self._lock:
+            return sorted(self.spans, key=lambda s: s.start_ns)
+
+    def unix_ns(self, perf_ns: int) -> int:
+        """
+        perf_counter_ns の値をUNIX時刻（ナノ秒）に変換
+        Args:
+            perf_ns (int): perf_counter_ns の値
+        Returns:
+            int: UNIX時刻（ナノ秒）
+        """
+        return self.epoch_ns + (perf_ns - self.anchor_ns)
+
+    def to_otlp(self) -> Dict:
+        """
+        OpenTelemetry の OTLP/JSON 形式に変換
+        Returns:
+            Dict: ExportTraceServiceRequest 相当の辞書
+        """
+        spans = []
+        for s in self.finished_spans():
+            attributes = [{"key": "thread.name", "value": {"stringValue": s.thread}}]
+            attributes += [{"key": key, "value": _otlp_value(value)} for key, value in s.attributes.items()]
+            spans.append({
+                "traceId": self.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(self.unix_ns(s.start_ns)),
+                "endTimeUnixNano": str(self.unix_ns(s.end_ns)),
+                "attributes": attributes,
+                "status": {"code": s.status},
+            })
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}
+                ]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }]
+        }
+
+
+@contextmanager
+def trace(name: str, export_path: Optional[str] = None, **attributes) -> Iterator[Trace]:
+    """
+    トレースを開始し、内部で実行されたスパンを収集する
+    Args:
+        name (str): ルートスパン名
+        export_path (Optional[str]): 終了時に追記するファイル（Noneの場合は EARNINGS_TRACE_FILE）
+        **attributes: ルートスパンの属性
+    Yields:
+        Trace: 収集中のトレース
+    """
+    current = Trace(name, attributes)
+    trace_token = _current_trace.set(current)
+    span_token = _current_span.set(current.root)
+    try:
+        yield current
+    except BaseException:
+        current.root.status = STATUS_ERROR
+        raise
+    finally:
+        current.root.end_ns = time.perf_counter_ns()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        current.add(current.root)
+
+        path = export_path or TRACE_EXPORT_PATH
+        if path:
+            export_trace(current, path)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    スパンで処理を囲む
+    トレースの外では、ファイルへの出力が有効な場合のみ新しいトレースを開始し、それ以外は何もしない
+    Args:
+        name (str): スパン名
+        **attributes: 属性
+    Yields:
+        Optional[Span]: 計測中のスパン（計測しない場合はNone）
+    """
+    current = _current_trace.get()
+    if current is None:
+        if not TRACE_EXPORT_PATH:
+            yield None
+            return
+        with trace(name, **attributes) as started:
+            yield started.root
+        return
+
+    parent = _current_span.get()
+    s = Span(name, parent.span_id if parent is not None else None, attributes)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException:
+        s.status = STATUS_ERROR
+        raise
+    finally:
+        s.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+        current.add(s)
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    関数全体をスパンで囲むデコレーター
+    Args:
+        name (Optional[str]): スパン名（省略時は関数の修飾名）
+    Returns:
+        Callable[[Callable], Callable]: デコレーター
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # 計測しない場合はスパンを作らずに呼び出す
+            if _current_trace.get() is None and not TRACE_EXPORT_PATH:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(func: Callable) -> Callable:
+    """
+    現在のトレース・スパンを引き継いで関数を実行するようにする
+    スレッドプールに渡す関数に使う（スレッドプールのワーカーは呼び出し元のコンテキストを引き継がないため）
+    Args:
+        func (Callable): 実行する関数
+    Returns:
+        Callable: 呼び出し元のコンテキストで実行する関数
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # 同じコンテキストには複数のスレッドから同時に入れないため、呼び出しごとに複製する
+        return context.copy().run(func, *args, **kwargs)
+    return wrapper
+
+
+def current_trace() -> Optional[Trace]:
+    """
+    実行中のトレースを取得
+    Returns:
+        Optional[Trace]: トレース（トレースの外ではNone）
+    """
+    return _current_trace.get()
+
+
+def export_trace(current: Trace, path: str) -> None:
+    """
+    トレースを OTLP/JSON 形式でファイルに追記
+    Args:
+        current (Trace): 終了したトレース
+        path (str): 出力先のファイル
+    """
+    try:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        line = json.dumps(current.to_otlp(), ensure_ascii=False)
+        with _export_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except Exception as e:
+        log_event("trace_export_failed", f"トレースの出力に失敗しました: {path}: {str(e)}", path=path)
+
+
+def _otlp_value(value: Any) -> Dict:
+    """
+    属性値を OTLP/JSON の AnyValue に変換
+    Args:
+        value (Any): 属性値
+    Returns:
+        Dict: AnyValue
+    """
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}